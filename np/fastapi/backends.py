@@ -0,0 +1,214 @@
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+from cache import LRUCache
+
+# 값이 token과 같을 때만 지우는 Redis 스크립트 (잠금을 가진 쪽만 풀도록)
+COMPARE_AND_DELETE_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+)
+
+
+class MemoryBackend:
+    """프로세스 안에서만 공유되는 기본 백엔드 (워커 1개일 때)"""
+
+    shared = False
+
+    def __init__(self, max_entries: int = 10000):
+        self._data = LRUCache(max_entries=max_entries)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self._data.get(key)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._data.set(key, value, ttl)
+
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        """키가 없을 때만 저장하고 True를 반환합니다. (워커 간 잠금용)"""
+        if self._data.peek(key) is not None:
+            return False
+        self._data.set(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._data.delete(key)
+
+    async def delete_if(self, key: str, value: Any) -> bool:
+        """저장된 값이 value와 같을 때만 지웁니다. (잠금 만료 후 다른 쪽이 얻은 잠금을 지우지 않도록)"""
+        if self._data.peek(key) != value:
+            return False
+        self._data.delete(key)
+        return True
+
+    async def close(self) -> None:
+        pass
+
+    def describe(self) -> str:
+        return "memory"
+
+
+class SQLiteBackend:
+    """
+    같은 호스트의 여러 워커가 하나의 SQLite 파일(WAL + mmap)을 공유합니다.
+    쓰기는 프로세스 간 파일 잠금으로 직렬화되고, 읽기는 mmap으로 페이지 캐시를 그대로 사용합니다.
+    """
+
+    shared = True
+
+    def __init__(self, path: str, mmap_size: int = 256 * 1024 * 1024, cleanup_every: int = 1000):
+        self.path = path
+        self.mmap_size = mmap_size
+        self.cleanup_every = cleanup_every
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # 다른 워커가 쓰는 중이면 잠금이 풀릴 때까지 최대 timeout초 대기
+            self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    # --- 동기 함수 (스레드에서 실행) ---
+
+    def _get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value FROM kv WHERE key = ? AND expires_at >= ?", (key, time.time())
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def _set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time() + ttl),
+            )
+            self._writes += 1
+            if self._writes % self.cleanup_every == 0:
+                conn.execute("DELETE FROM kv WHERE expires_at < ?", (time.time(),))
+
+    def _add(self, key: str, value: Any, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            # 없거나 만료된 경우에만 저장 (한 문장이라 워커 간에도 원자적)
+            cursor = self._connect().execute(
+                "INSERT INTO kv (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+                "WHERE kv.expires_at < ?",
+                (key, json.dumps(value, ensure_ascii=False), now + ttl, now),
+            )
+            return cursor.rowcount == 1
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    def _delete_if(self, key: str, value: Any) -> bool:
+        with self._lock:
+            cursor = self._connect().execute(
+                "DELETE FROM kv WHERE key = ? AND value = ?", (key, json.dumps(value, ensure_ascii=False))
+            )
+            return cursor.rowcount == 1
+
+    # --- 비동기 API ---
+
+    async def get(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        return await asyncio.to_thread(self._add, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    async def delete_if(self, key: str, value: Any) -> bool:
+        return await asyncio.to_thread(self._delete_if, key, value)
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def describe(self) -> str:
+        return f"sqlite:{self.path}"
+
+
+class RedisBackend:
+    """Redis(또는 RESP 호환 서버)를 공유 저장소로 사용합니다. 여러 호스트의 워커가 함께 쓸 수 있습니다."""
+
+    shared = True
+
+    def __init__(self, url: str, prefix: str = "actio:"):
+        # redis 패키지가 설치되어 있을 때만 사용 가능
+        import redis.asyncio as redis
+
+        self.url = url
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self._client.set(
+            self.prefix + key, json.dumps(value, ensure_ascii=False), px=max(1, int(ttl * 1000))
+        )
+
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        return bool(await self._client.set(
+            self.prefix + key, json.dumps(value, ensure_ascii=False), px=max(1, int(ttl * 1000)), nx=True
+        ))
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self.prefix + key)
+
+    async def delete_if(self, key: str, value: Any) -> bool:
+        deleted = await self._client.eval(
+            COMPARE_AND_DELETE_SCRIPT, 1, self.prefix + key, json.dumps(value, ensure_ascii=False)
+        )
+        return bool(deleted)
+
+    async def close(self) -> None:
+        close = getattr(self._client, "aclose", None) or self._client.close
+        await close()
+
+    def describe(self) -> str:
+        parsed = urlparse(self.url)
+        return f"redis:{parsed.hostname}:{parsed.port or 6379}"
+
+
+def create_backend(url: Optional[str]):
+    """
+    STATE_BACKEND_URL 형식
+        memory://                      프로세스 내부 (기본값)
+        sqlite:///state.db             같은 호스트의 워커끼리 공유 (sqlite:////절대/경로.db)
+        redis://localhost:6379/0       Redis 또는 mini_redis.py
+    """
+    if not url or url.startswith("memory:"):
+        return MemoryBackend()
+    parsed = urlparse(url)
+    if parsed.scheme == "sqlite":
+        # sqlite:///상대경로, sqlite:////절대경로
+        return SQLiteBackend(parsed.path[1:] or parsed.netloc)
+    if parsed.scheme in ("redis", "rediss"):
+        return RedisBackend(url)
+    raise ValueError(f"지원하지 않는 STATE_BACKEND_URL: {url}")
@@ -0,0 +1,113 @@
+import re
+import json
+from typing import List, Optional, Sequence
+
+from mapreduce import estimate_tokens
+
+# 모델이 JSON을 코드 블록(```json ... ```)으로 감싸는 경우
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+
+
+def _load_json(output: str):
+    text = _CODE_FENCE.sub("", output.strip())
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    # 앞뒤에 설명 문장이 붙은 경우 가장 바깥 JSON 객체/배열만 사용
+    for start_char, end_char in (("{", "}"), ("[", "]")):
+        start, end = text.find(start_char), text.rfind(end_char)
+        if start != -1 and end > start:
+            try:
+                return json.loads(text[start:end + 1])
+            except ValueError:
+                continue
+    raise ValueError("일괄 요약 응답이 JSON 형식이 아닙니다.")
+
+
+class BatchSummarizer:
+    """
+    짧은 글 여러 건을 한 번의 호출로 요약하기 위한 입력 구성과 결과 해석을 담당합니다.
+    입력은 {"articles": [{"id": 0, "text": ...}, ...]}, 출력은 {"summaries": [{"id": 0, "summary": ...}, ...]} 형식이며
+    결과는 id(입력 순서)로 원래 글에 다시 연결합니다. 호출 자체는 호출 측에서 수행합니다.
+    """
+
+    def __init__(
+        self,
+        max_input_tokens: int = 1500,
+        min_items: int = 2,
+        output_tokens_per_item: int = 500,
+        max_output_tokens: int = 4000,
+    ):
+        # max_input_tokens가 0이면 일괄 요약을 사용하지 않음
+        self.max_input_tokens = max_input_tokens
+        self.min_items = min_items
+        self.output_tokens_per_item = output_tokens_per_item
+        self.max_output_tokens = max_output_tokens
+        self.batches = 0
+        self.batched_items = 0
+        self.fallback_items = 0
+        self.parse_failures = 0
+
+    def should_batch(self, texts: Sequence[str]) -> bool:
+        """글이 min_items건 이상이고 입력/출력 합계가 한 번의 호출에 들어갈 때만 묶습니다."""
+        if self.max_input_tokens <= 0 or len(texts) < self.min_items:
+            return False
+        if len(texts) * self.output_tokens_per_item > self.max_output_tokens:
+            return False
+        return sum(estimate_tokens(text) for text in texts) <= self.max_input_tokens
+
+    def max_tokens(self, count: int) -> int:
+        return min(self.max_output_tokens, count * self.output_tokens_per_item)
+
+    def build_input(self, texts: Sequence[str]) -> str:
+        return json.dumps(
+            {"articles": [{"id": index, "text": text} for index, text in enumerate(texts)]},
+            ensure_ascii=False,
+        )
+
+    def parse(self, output: str, count: int) -> List[Optional[str]]:
+        """
+        id 순서대로 요약 목록을 반환합니다. 빠졌거나 비어 있는 항목은 None입니다.
+        읽을 수 있는 항목이 하나도 없으면 ValueError를 올립니다.
+        """
+        try:
+            data = _load_json(output)
+            items = data.get("summaries") if isinstance(data, dict) else data
+            if not isinstance(items, list):
+                raise ValueError("일괄 요약 응답에 summaries 목록이 없습니다.")
+            summaries: List[Optional[str]] = [None] * count
+            for position, item in enumerate(items):
+                if isinstance(item, dict):
+                    index, summary = item.get("id", position), item.get("summary")
+                else:
+                    index, summary = position, item
+                try:
+                    index = int(index)
+                except (TypeError, ValueError):
+                    continue
+                if 0 <= index < count and isinstance(summary, str) and summary.strip():
+                    summaries[index] = summary.strip()
+            if all(summary is None for summary in summaries):
+                raise ValueError("일괄 요약 응답에 사용할 수 있는 요약이 없습니다.")
+        except ValueError:
+            self.parse_failures += 1
+            self.failed(count)
+            raise
+        self.batches += 1
+        found = sum(1 for summary in summaries if summary is not None)
+        self.batched_items += found
+        self.fallback_items += count - found
+        return summaries
+
+    def failed(self, count: int) -> None:
+        """호출 실패 등으로 일괄 요약 결과를 쓰지 못한 글 수 (호출 측에서 글별로 다시 요약)"""
+        self.fallback_items += count
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "batched_items": self.batched_items,
+            "fallback_items": self.fallback_items,
+            "parse_failures": self.parse_failures,
+        }
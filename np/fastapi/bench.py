@@ -0,0 +1,362 @@
+"""
+로컬 mock 상류 서버로 test.py 처리량/지연 시간 측정
+
+mock_upstreams.py를 띄우고 네이버/유튜브/SupaData/ElevenLabs/OpenAI 주소를 그쪽으로 돌린 test:app을 새로 띄운 뒤,
+엔드포인트별로 정해진 동시 요청 수를 유지하며 요청을 보내 p50/p95/p99 지연, 초당 요청 수, 이벤트 루프 지연을 기록합니다.
+
+    python bench.py                                             # 기본 시나리오, 동시성 1,8,32
+    python bench.py --endpoints news,youtube --concurrency 1,16 --duration 15 --output bench.json
+    python bench.py --profile slow_openai.json --cache cold --compare baseline.json
+    python bench.py --app-env SUMMARY_CONCURRENCY=10 --app-env RATE_LIMIT_OPENAI_RPS=50
+
+--cache warm은 적은 수의 검색어를 반복(캐시 적중 경로), cold는 요청마다 새 검색어(전체 파이프라인)를 사용합니다.
+"""
+import os
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from measure_startup import free_port
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 명사 추출 후에도 서로 다른 검색어가 되도록 음절을 조합해 검색어를 만듦
+SYLLABLES = "가나다라마바사아자차카타파하"
+PERCENTILES = (50, 95, 99)
+
+
+def keyword_for(index: int) -> str:
+    syllables = []
+    index += len(SYLLABLES) ** 2  # 최소 3음절
+    while index:
+        index, rest = divmod(index, len(SYLLABLES))
+        syllables.append(SYLLABLES[rest])
+    return "".join(syllables) + " 소식"
+
+
+# 시나리오: (client, keyword) → 응답. 스트리밍 응답도 본문을 끝까지 읽은 시점까지 측정
+async def news(client: httpx.AsyncClient, keyword: str) -> httpx.Response:
+    return await client.get("/news/summaries", params={"q": keyword})
+
+
+async def news_stream(client: httpx.AsyncClient, keyword: str) -> httpx.Response:
+    return await client.get("/news/summaries/stream", params={"q": keyword})
+
+
+async def youtube(client: httpx.AsyncClient, keyword: str) -> httpx.Response:
+    return await client.get("/youtube-summaries", params={"keyword": keyword})
+
+
+async def originals(client: httpx.AsyncClient, keyword: str) -> httpx.Response:
+    texts = [f"{keyword}에 관한 기사 본문 {i}. " * 20 for i in range(3)]
+    return await client.post("/summarize-originals", json={"originals": texts})
+
+
+async def tts(client: httpx.AsyncClient, keyword: str) -> httpx.Response:
+    return await client.post("/tts/stream", json={"text": f"{keyword}에 관한 요약 문장입니다."})
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "news": news,
+    "news_stream": news_stream,
+    "youtube": youtube,
+    "originals": originals,
+    "tts": tts,
+}
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def ms(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value * 1000, 2)
+
+
+def parse_loop_lag(text: str) -> dict:
+    """/metrics의 actio_event_loop_lag_seconds 히스토그램 → {buckets: {le: count}, sum, count}"""
+    result = {"buckets": {}, "sum": 0.0, "count": 0}
+    for line in text.splitlines():
+        if not line.startswith("actio_event_loop_lag_seconds"):
+            continue
+        name, value = line.rsplit(" ", 1)
+        if name.startswith("actio_event_loop_lag_seconds_bucket"):
+            le = name.split('le="', 1)[1].split('"', 1)[0]
+            result["buckets"][le] = float(value)
+        elif name.startswith("actio_event_loop_lag_seconds_sum"):
+            result["sum"] = float(value)
+        elif name.startswith("actio_event_loop_lag_seconds_count"):
+            result["count"] = float(value)
+    return result
+
+
+def loop_lag_delta(before: dict, after: dict) -> dict:
+    count = after["count"] - before["count"]
+    if count <= 0:
+        return {"samples": 0, "mean_ms": None, "p99_ms": None}
+    p99 = None
+    for le, cumulative in sorted(after["buckets"].items(), key=lambda item: float(item[0])):
+        if cumulative - before["buckets"].get(le, 0) >= 0.99 * count:
+            p99 = float(le)
+            break
+    return {
+        "samples": int(count),
+        "mean_ms": ms((after["sum"] - before["sum"]) / count),
+        "p99_ms": ms(p99) if p99 not in (None, math.inf) else None,  # 히스토그램 구간 상한 기준
+    }
+
+
+class Server:
+    """uvicorn 서버 프로세스 (임시 디렉터리에서 실행되어 DB/음성 파일이 남지 않음)"""
+
+    def __init__(self, app: str, env: dict, cwd: str, ready_path: str, log_path: str):
+        self.app = app
+        self.env = env
+        self.cwd = cwd
+        self.ready_path = ready_path
+        self.log_path = log_path
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.proc: Optional[subprocess.Popen] = None
+
+    def start(self, timeout: float = 120) -> None:
+        self._log = open(self.log_path, "w", encoding="utf-8")
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", self.app, "--app-dir", APP_DIR,
+             "--host", "127.0.0.1", "--port", str(self.port), "--log-level", "warning"],
+            env=self.env, cwd=self.cwd, stdout=self._log, stderr=subprocess.STDOUT,
+        )
+        started = time.monotonic()
+        while time.monotonic() - started < timeout:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"{self.app} 종료 (exit code {self.proc.returncode}), 로그: {self.log_path}")
+            try:
+                if httpx.get(self.url + self.ready_path, timeout=1).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.05)
+        raise TimeoutError(f"{self.app}이(가) {timeout}초 안에 준비되지 않았습니다. 로그: {self.log_path}")
+
+    def stop(self) -> None:
+        if self.proc is not None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+            self._log.close()
+
+
+async def run_level(client: httpx.AsyncClient, scenario: Callable, concurrency: int, duration: float,
+                    next_keyword: Callable[[], str]) -> dict:
+    """concurrency개의 작업자가 duration초 동안 응답을 받는 즉시 다음 요청을 보냅니다. (closed loop)"""
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    stop_at = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            try:
+                response = await scenario(client, next_keyword())
+                statuses[response.status_code] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    errors = sum(count for status, count in statuses.items() if not (isinstance(status, int) and status < 400))
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            **{f"p{p}": ms(percentile(latencies, p)) for p in PERCENTILES},
+            "mean": ms(sum(latencies) / len(latencies)) if latencies else None,
+            "max": ms(max(latencies)) if latencies else None,
+        },
+        "status_counts": {str(status): count for status, count in sorted(statuses.items(), key=str)},
+    }
+
+
+async def run_suite(app_url: str, mock_url: str, args) -> List[dict]:
+    results = []
+    counter = iter(range(10 ** 9))
+
+    def next_keyword() -> str:
+        index = next(counter)
+        return keyword_for(index if args.cache == "cold" else index % args.keywords)
+
+    timeout = httpx.Timeout(args.request_timeout)
+    limits = httpx.Limits(max_connections=max(args.concurrency) * 2)
+    async with httpx.AsyncClient(base_url=app_url, timeout=timeout, limits=limits) as client, \
+            httpx.AsyncClient(base_url=mock_url, timeout=10) as mock:
+        for name in args.endpoints:
+            scenario = SCENARIOS[name]
+            for concurrency in args.concurrency:
+                if args.warmup:
+                    await run_level(client, scenario, concurrency, args.warmup, next_keyword)
+                await mock.post("/__mock/reset")
+                lag_before = parse_loop_lag((await client.get("/metrics")).text)
+                result = await run_level(client, scenario, concurrency, args.duration, next_keyword)
+                lag_after = parse_loop_lag((await client.get("/metrics")).text)
+                result = {
+                    "endpoint": name,
+                    "concurrency": concurrency,
+                    **result,
+                    "event_loop_lag": loop_lag_delta(lag_before, lag_after),
+                    "upstream_calls": (await mock.get("/__mock/stats")).json(),
+                }
+                latency = result["latency_ms"]
+                print(
+                    f"{name:12s} c={concurrency:<4d} {result['rps']:8.2f} req/s  "
+                    f"p50 {latency['p50']}ms  p95 {latency['p95']}ms  p99 {latency['p99']}ms  "
+                    f"errors {result['errors']}/{result['requests']}  "
+                    f"loop lag p99 {result['event_loop_lag']['p99_ms']}ms"
+                )
+                results.append(result)
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline_path: str) -> None:
+    """같은 엔드포인트/동시성끼리 초당 요청 수와 p95 변화율 출력"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {(r["endpoint"], r["concurrency"]): r for r in baseline.get("results", [])}
+    print(f"\n기준: {baseline_path} (commit {baseline.get('meta', {}).get('commit')})")
+    for result in report["results"]:
+        before = previous.get((result["endpoint"], result["concurrency"]))
+        if before is None:
+            continue
+
+        def change(new, old):
+            return f"{(new - old) / old * 100:+.1f}%" if new is not None and old else "n/a"
+
+        print(
+            f"{result['endpoint']:12s} c={result['concurrency']:<4d} "
+            f"req/s {before['rps']} → {result['rps']} ({change(result['rps'], before['rps'])})  "
+            f"p95 {before['latency_ms']['p95']} → {result['latency_ms']['p95']}ms "
+            f"({change(result['latency_ms']['p95'], before['latency_ms']['p95'])})"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="mock 상류 서버를 이용한 test:app 부하 측정")
+    parser.add_argument("--app", default="test:app")
+    parser.add_argument("--endpoints", default="news,news_stream,youtube,originals",
+                        help=f"쉼표로 구분 ({', '.join(SCENARIOS)})")
+    parser.add_argument("--concurrency", default="1,8,32", help="쉼표로 구분한 동시 요청 수")
+    parser.add_argument("--duration", type=float, default=10, help="동시성 단계별 측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=0, help="단계별 측정 전 워밍업 시간(초)")
+    parser.add_argument("--cache", default="warm", choices=["warm", "cold"])
+    parser.add_argument("--keywords", type=int, default=5, help="warm 모드에서 반복할 검색어 수")
+    parser.add_argument("--request-timeout", type=float, default=120)
+    parser.add_argument("--profile", help="mock 상류 서버 설정 JSON 파일 (mock_upstreams.py 참고)")
+    parser.add_argument("--app-env", action="append", default=[], metavar="KEY=VALUE",
+                        help="앱 프로세스에 추가로 넘길 환경변수")
+    parser.add_argument("--output", default="bench.json", help="결과 JSON 파일 경로")
+    parser.add_argument("--compare", help="이전 결과 JSON과 비교")
+    args = parser.parse_args()
+    args.endpoints = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    args.concurrency = [int(c) for c in args.concurrency.split(",")]
+    unknown = [name for name in args.endpoints if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"알 수 없는 엔드포인트: {', '.join(unknown)}")
+
+    profile = {}
+    if args.profile:
+        with open(args.profile, encoding="utf-8") as f:
+            profile = json.load(f)
+
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    mock = Server(
+        "mock_upstreams:app",
+        dict(os.environ, MOCK_UPSTREAM_PROFILE=json.dumps(profile)),
+        workdir, "/__mock/stats", os.path.join(workdir, "mock.log"),
+    )
+    app_env = dict(
+        os.environ,
+        NAVER_BASE_URL=mock.url,
+        YOUTUBE_BASE_URL=mock.url,
+        SUPADATA_BASE_URL=mock.url,
+        ELEVENLABS_BASE_URL=mock.url,
+        OPENAI_API_BASE=mock.url + "/v1",  # openai SDK가 import 시 읽음
+        YOUTUBE_API_KEY="bench",
+        SUPADATA_API_KEY="bench",
+        OPENAI_API_KEY="bench",
+        NAVER_CLIENT_ID="bench",
+        NAVER_CLIENT_SECRET="bench",
+        ELEVENLABS_API_KEY="bench",
+        STARTUP_MODE="eager",
+        HTTP_WARMUP="0",
+        CACHE_WARM_ENABLED="0",
+        LLM_CACHE_DB_PATH="",
+    )
+    for item in args.app_env:
+        key, _, value = item.partition("=")
+        app_env[key] = value
+    app = Server(args.app, app_env, workdir, "/ready", os.path.join(workdir, "app.log"))
+
+    print(f"작업 디렉터리: {workdir}")
+    mock.start()
+    try:
+        app.start()
+        try:
+            results = asyncio.run(run_suite(app.url, mock.url, args))
+        finally:
+            app.stop()
+    finally:
+        mock.stop()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "app": args.app,
+            "cache": args.cache,
+            "keywords": args.keywords,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "app_env": args.app_env,
+            "profile": profile,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {args.output}")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+import json
+import time
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import deadline
+
+
+def make_cache_key(**parts) -> str:
+    """입력 값들을 정렬된 JSON으로 직렬화한 뒤 sha256 해시를 키로 사용합니다."""
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """항목별 TTL을 가진 메모리 LRU 캐시 (이벤트 루프 안에서만 사용)"""
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        expires_at, value = item
+        if expires_at < time.time():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key: str) -> Optional[Any]:
+        """LRU 순서와 적중 통계를 바꾸지 않고 조회"""
+        item = self._data.get(key)
+        if item is None or item[0] < time.time():
+            return None
+        return item[1]
+
+    def expires_in(self, key: str) -> Optional[float]:
+        """만료까지 남은 시간(초). 없거나 만료되었으면 None (LRU 순서와 적중 통계는 그대로)"""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        remaining = item[0] - time.time()
+        return remaining if remaining >= 0 else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DiskCache:
+    """재시작 후에도 유지되는 SQLite 기반 캐시 (호출은 스레드에서 실행)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def get(self, key: str) -> Optional[tuple]:
+        """(만료 시각, 값)을 반환합니다. 없거나 만료되었으면 None"""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            return row[1], json.loads(row[0])
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), expires_at),
+            )
+            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class SummaryCache:
+    """
+    LLM 요약 결과 캐시.
+    메모리 LRU를 먼저 조회하고, 워커 간 공유 백엔드(backends.py)가 있으면 그다음, 디스크 경로가 설정되어 있으면
+    SQLite를 마지막으로 조회합니다. 아래 단계에서 가져온 값은 원래 만료 시각 그대로 메모리에 올립니다.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl: float = 3600,
+        disk_path: Optional[str] = None,
+        backend=None,
+    ):
+        self.ttl = ttl
+        self.memory = LRUCache(max_entries=max_entries, ttl=ttl)
+        self.disk = DiskCache(disk_path) if disk_path else None
+        self.backend = backend if backend is not None and backend.shared else None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.shared_hits = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is None and self.backend is not None:
+            try:
+                # (만료 시각, 값)
+                item = await self.backend.get(f"summary:{key}")
+            except Exception as e:
+                print(f"[ERROR] 공유 캐시 조회 오류: {e}")
+                item = None
+            if item is not None:
+                self.shared_hits += 1
+                value = self._load_into_memory(key, item)
+        if value is None and self.disk is not None:
+            try:
+                item = await asyncio.to_thread(self.disk.get, key)
+            except sqlite3.Error as e:
+                print(f"[ERROR] 디스크 캐시 조회 오류: {e}")
+                item = None
+            if item is not None:
+                self.disk_hits += 1
+                value = self._load_into_memory(key, item)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def _load_into_memory(self, key: str, item) -> Any:
+        expires_at, value = item
+        self.memory.set(key, value, expires_at - time.time())
+        return value
+
+    async def expires_in(self, key: str) -> Optional[float]:
+        """만료까지 남은 시간(초). 메모리에 없으면 공유 백엔드/디스크에서 가져와 확인하며, 어디에도 없으면 None (캐시 워머용)"""
+        if self.memory.peek(key) is None and await self.get(key) is None:
+            return None
+        return self.memory.expires_in(key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl
+        self.memory.set(key, value, ttl)
+        if self.backend is not None:
+            try:
+                await self.backend.set(f"summary:{key}", [expires_at, value], ttl)
+            except Exception as e:
+                print(f"[ERROR] 공유 캐시 저장 오류: {e}")
+        if self.disk is not None:
+            try:
+                await asyncio.to_thread(self.disk.set, key, value, expires_at)
+            except sqlite3.Error as e:
+                print(f"[ERROR] 디스크 캐시 저장 오류: {e}")
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "shared_hits": self.shared_hits,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "memory_entries": len(self.memory),
+        }
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
+
+class StaleWhileRevalidateCache:
+    """
+    짧은 TTL 캐시. TTL이 지나도 stale_ttl 이내라면 기존 값을 바로 반환하고
+    백그라운드에서 한 번만 갱신합니다.
+    워커 간 공유 백엔드를 주면 메모리에 없거나 만료된 값을 다른 워커가 저장한 값으로 먼저 채웁니다.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 120,
+        stale_ttl: float = 600,
+        max_entries: int = 500,
+        backend=None,
+        namespace: str = "swr",
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.memory = LRUCache(max_entries=max_entries, ttl=ttl + stale_ttl)
+        self.backend = backend if backend is not None and backend.shared else None
+        self.namespace = namespace
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+
+    async def _load_shared(self, key: str) -> Optional[tuple]:
+        """다른 워커가 저장한 (가져온 시각, 값)을 메모리로 가져옵니다."""
+        if self.backend is None:
+            return None
+        try:
+            item = await self.backend.get(f"{self.namespace}:{key}")
+        except Exception as e:
+            print(f"[ERROR] 공유 캐시 조회 오류: {e}")
+            return None
+        if item is None:
+            return None
+        fetched_at, value = item
+        remaining = fetched_at + self.ttl + self.stale_ttl - time.time()
+        if remaining <= 0:
+            return None
+        self.shared_hits += 1
+        self.memory.set(key, (fetched_at, value), remaining)
+        return fetched_at, value
+
+    async def _fetch_and_store(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        value = await fetch()
+        # 빈 결과(오류 포함)는 캐시하지 않음
+        if value:
+            fetched_at = time.time()
+            self.memory.set(key, (fetched_at, value))
+            if self.backend is not None:
+                try:
+                    await self.backend.set(f"{self.namespace}:{key}", [fetched_at, value], self.ttl + self.stale_ttl)
+                except Exception as e:
+                    print(f"[ERROR] 공유 캐시 저장 오류: {e}")
+        return value
+
+    def _refresh_in_background(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            # 요청이 끝난 뒤에도 계속되는 작업이므로 요청의 마감 시간과 무관하게 실행
+            deadline.clear()
+            try:
+                # 다른 워커가 이미 갱신했으면 그 값을 사용
+                item = await self._load_shared(key)
+                if item is None or time.time() - item[0] > self.ttl:
+                    await self._fetch_and_store(key, fetch)
+            except Exception as e:
+                print(f"[ERROR] 캐시 백그라운드 갱신 실패: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        item = self.memory.get(key)
+        if item is None:
+            item = await self._load_shared(key)
+        if item is None:
+            self.misses += 1
+            return await self._fetch_and_store(key, fetch)
+        fetched_at, value = item
+        if time.time() - fetched_at <= self.ttl:
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+            self._refresh_in_background(key, fetch)
+        return value
+
+    def peek(self, key: str) -> Optional[Any]:
+        """저장된 값을 통계에 반영하지 않고 조회 (만료 전 stale 값 포함)"""
+        item = self.memory.peek(key)
+        return None if item is None else item[1]
+
+    def age(self, key: str) -> Optional[float]:
+        """저장된 값이 가져온 지 몇 초 되었는지. 없으면 None (통계에는 반영하지 않음)"""
+        item = self.memory.peek(key)
+        return None if item is None else time.time() - item[0]
+
+    async def refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """TTL과 관계없이 새로 가져와 저장합니다. (캐시 워머용)"""
+        return await self._fetch_and_store(key, fetch)
+
+    def stats(self) -> dict:
+        total = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "shared_hits": self.shared_hits,
+            "hit_ratio": round((self.hits + self.stale_hits) / total, 4) if total else 0.0,
+            "entries": len(self.memory),
+        }
@@ -0,0 +1,163 @@
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+import httpx
+
+import deadline
+import metrics
+from rate_limit import Throttled, parse_retry_after, rate_limits
+
+# h2 패키지가 설치되어 있을 때만 HTTP/2 사용 (ALPN 협상으로 미지원 서버는 HTTP/1.1로 동작)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# 제공자별 기본 설정 (<NAME>_BASE_URL 환경변수로 주소 변경 가능, 예: 벤치마크용 mock 서버)
+PROVIDERS: Dict[str, dict] = {
+    "naver": {"base_url": os.getenv("NAVER_BASE_URL", "https://openapi.naver.com"), "timeout": 10},
+    "youtube": {"base_url": os.getenv("YOUTUBE_BASE_URL", "https://www.googleapis.com"), "timeout": 30},
+    "supadata": {"base_url": os.getenv("SUPADATA_BASE_URL", "https://api.supadata.ai"), "timeout": 30},
+    "elevenlabs": {"base_url": os.getenv("ELEVENLABS_BASE_URL", "https://api.elevenlabs.io"), "timeout": 30},
+}
+
+# 커넥션 풀 설정 (환경변수로 조정 가능)
+HTTP_POOL_MAX_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "20"))
+HTTP_POOL_MAX_KEEPALIVE = int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "1") == "1" and HTTP2_AVAILABLE
+# 속도 제한으로 보고 재시도할 응답 코드 (503은 Retry-After가 있을 때만)
+THROTTLE_STATUS_CODES = (429,)
+
+# 시작 시 각 제공자에 미리 연결해 둘지 여부
+HTTP_WARMUP = os.getenv("HTTP_WARMUP", "0") == "1"
+
+
+class ProviderClients:
+    """
+    제공자(네이버, 유튜브, SupaData, ElevenLabs)마다 하나씩 keep-alive 커넥션 풀을 유지합니다.
+    FastAPI lifespan에서 startup()/shutdown()을 호출해 앱 수명과 함께 관리합니다.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def _create_client(self, provider: str) -> httpx.AsyncClient:
+        config = PROVIDERS[provider]
+        return httpx.AsyncClient(
+            base_url=config["base_url"],
+            timeout=config["timeout"],
+            http2=HTTP2_ENABLED,
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+            event_hooks=metrics.httpx_event_hooks(provider),
+        )
+
+    def get(self, provider: str) -> httpx.AsyncClient:
+        """제공자별 비동기 클라이언트 반환 (lifespan 밖에서 호출되면 그때 생성)"""
+        client = self._clients.get(provider)
+        if client is None or client.is_closed:
+            client = self._create_client(provider)
+            self._clients[provider] = client
+        return client
+
+    @staticmethod
+    def _throttle_of(response: httpx.Response):
+        retry_after = parse_retry_after(response.headers)
+        if response.status_code in THROTTLE_STATUS_CODES or (
+            response.status_code == 503 and retry_after is not None
+        ):
+            return Throttled(retry_after, response=response)
+        return None
+
+    @staticmethod
+    def _record_error(provider: str, error: httpx.TransportError) -> None:
+        # 응답을 받지 못한 호출은 event hook에 잡히지 않으므로 따로 기록
+        metrics.record_upstream(provider, "timeout" if isinstance(error, httpx.TimeoutException) else "error")
+
+    @staticmethod
+    def _cap_timeout(provider: str, kwargs: dict) -> dict:
+        # 요청 마감 시간이 있으면 개별 호출 timeout을 남은 시간 이하로 줄임
+        if deadline.remaining() is not None:
+            kwargs["timeout"] = deadline.cap_timeout(kwargs.get("timeout", PROVIDERS[provider]["timeout"]))
+        return kwargs
+
+    async def request(self, provider: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        제공자별 속도 제한을 지키며 요청합니다. 429는 limiter가 백오프 후 재시도하고,
+        재시도를 모두 소진하면(또는 요청 마감 시간이 부족하면) 마지막 429 응답을 그대로 반환합니다.
+        """
+        client = self.get(provider)
+
+        async def send() -> httpx.Response:
+            try:
+                response = await client.request(method, url, **self._cap_timeout(provider, kwargs))
+            except httpx.TransportError as e:
+                self._record_error(provider, e)
+                raise
+            throttled = self._throttle_of(response)
+            if throttled is not None:
+                raise throttled
+            return response
+
+        return await rate_limits.get(provider).call(send)
+
+    @asynccontextmanager
+    async def stream(self, provider: str, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """request()의 스트리밍 버전. 응답 본문을 다 읽을 때까지 limiter의 자리를 차지합니다."""
+        limiter = rate_limits.get(provider)
+        client = self.get(provider)
+        attempt = 0
+        while True:
+            await limiter.acquire()
+            success = False
+            try:
+                async with client.stream(method, url, **self._cap_timeout(provider, kwargs)) as response:
+                    throttled = self._throttle_of(response)
+                    delay = limiter.backoff_delay(attempt, throttled.retry_after) if throttled else 0
+                    if throttled is None or not limiter.should_retry(attempt, delay):
+                        if throttled is not None:
+                            limiter.on_throttle(throttled.retry_after)
+                        yield response
+                        success = throttled is None
+                        return
+            except httpx.TransportError as e:
+                self._record_error(provider, e)
+                raise
+            finally:
+                await limiter.release(success)
+            limiter.on_throttle(throttled.retry_after)
+            print(f"[WARNING] {provider} 속도 제한(429). {delay:.1f}초 후 재시도 ({attempt + 1}/{limiter.max_retries})")
+            limiter.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _warmup_one(self, provider: str) -> None:
+        try:
+            # 응답 코드는 상관없음. DNS/TCP/TLS 연결만 미리 맺어 둔다.
+            await self.get(provider).head("/", timeout=5)
+        except httpx.HTTPError as e:
+            print(f"[WARNING] {provider} 커넥션 워밍업 실패: {e}")
+
+    async def warmup(self) -> None:
+        await asyncio.gather(*(self._warmup_one(p) for p in PROVIDERS))
+
+    async def startup(self, warmup: bool = HTTP_WARMUP) -> None:
+        for provider in PROVIDERS:
+            self.get(provider)
+        if warmup:
+            await self.warmup()
+
+    async def shutdown(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+http_clients = ProviderClients()
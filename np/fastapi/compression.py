@@ -0,0 +1,115 @@
+import gzip
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+# brotli가 설치되어 있으면 br을 우선 사용하고, 없으면 gzip만 사용
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 이미 압축된 형식이나, 이벤트를 바로바로 보내야 하는 스트리밍 응답은 압축하지 않음
+_SKIP_CONTENT_TYPES = ("text/event-stream", "application/x-ndjson", "audio/", "image/", "video/")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding(q 값 포함)에서 사용할 인코딩을 고릅니다. 같은 q 값이면 br → gzip 순서"""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+    wildcard = weights.get("*", 0.0)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for name in candidates:
+        q = weights.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    본문이 minimum_size 이상인 응답을 Accept-Encoding에 따라 brotli 또는 gzip으로 압축하는 ASGI 미들웨어.
+    본문을 한 번에 보내는 응답만 압축하고, 여러 번에 나눠 보내는 응답(스트리밍, 파일)은 그대로 전달합니다.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    def _compressible(self, headers: Headers, status: int) -> bool:
+        if status < 200 or status in (204, 206, 304) or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").lower()
+        return not any(content_type.startswith(skip) for skip in _SKIP_CONTENT_TYPES)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.minimum_size <= 0:
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                # 첫 본문을 보고 압축 여부를 정하므로 헤더 전송을 미룸
+                start = message
+                return
+            if passthrough or start is None:
+                await send(message)
+                return
+            if message["type"] != "http.response.body":
+                # http.response.pathsend 등 본문 외 메시지는 그대로 전달
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            passthrough = True
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or not self._compressible(headers, start["status"])
+            ):
+                await send(start)
+                await send(message)
+                return
+            compressed = self.compress(body, encoding)
+            if len(compressed) >= len(body):
+                await send(start)
+                await send(message)
+                return
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
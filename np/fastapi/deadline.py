@@ -0,0 +1,146 @@
+import time
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Awaitable, List, Optional
+from urllib.parse import parse_qs
+
+# 남은 시간(밀리초)을 받는 헤더와 쿼리 파라미터. 시계 차이가 없도록 절대 시각이 아닌 남은 시간으로 받음
+DEADLINE_HEADER = "x-request-deadline-ms"
+DEADLINE_QUERY = "deadline_ms"
+
+# 요청별 마감 시각 (time.monotonic 기준)
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """요청 마감 시간이 지났습니다."""
+
+
+class _TimedOut:
+    def __repr__(self) -> str:
+        return "TIMED_OUT"
+
+
+# 마감 시간까지 끝나지 않은 작업의 결과 자리에 들어가는 값
+TIMED_OUT = _TimedOut()
+
+
+def remaining() -> Optional[float]:
+    """현재 요청의 남은 시간(초). 마감이 없으면 None"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def clear() -> None:
+    """현재 작업의 마감 시간을 없앱니다. (여러 요청이 함께 기다리는 공유 작업용, 작업마다 컨텍스트가 따로라 호출 측에는 영향 없음)"""
+    _deadline.set(None)
+
+
+async def run_until(deadline: Optional[float], aw: Awaitable[Any]) -> Any:
+    """마감 시각(time.monotonic 기준)을 deadline으로 바꿔 실행합니다. None이면 마감 없이 실행"""
+    token = _deadline.set(deadline)
+    try:
+        return await aw
+    finally:
+        _deadline.reset(token)
+
+
+def run_within(seconds: Optional[float], aw: Awaitable[Any]) -> Awaitable[Any]:
+    """지금부터 seconds초를 마감으로 실행합니다. None이나 0이면 마감 없이 실행"""
+    return run_until(time.monotonic() + seconds if seconds else None, aw)
+
+
+def cap_timeout(timeout: Optional[float]) -> Optional[float]:
+    """개별 상류 호출의 timeout을 요청의 남은 시간 이하로 줄입니다."""
+    left = remaining()
+    if left is None:
+        return timeout
+    # 0이면 httpx가 즉시 타임아웃 처리하도록 아주 작은 값 유지
+    left = max(left, 0.001)
+    return left if timeout is None else min(timeout, left)
+
+
+async def run(aw: Awaitable[Any]) -> Any:
+    """남은 시간 안에 끝나지 않으면 작업을 취소하고 DeadlineExceeded를 올립니다."""
+    left = remaining()
+    if left is None:
+        return await aw
+    try:
+        return await asyncio.wait_for(aw, timeout=left)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded() from None
+
+
+async def gather(aws: List[Awaitable[Any]]) -> List[Any]:
+    """
+    asyncio.gather처럼 순서대로 결과를 반환하되, 마감 시간에 끝나지 않은 작업은 취소하고
+    그 자리에 TIMED_OUT을 넣습니다.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    if not tasks:
+        return []
+    try:
+        _, pending = await asyncio.wait(tasks, timeout=remaining())
+    finally:
+        # 여기서 취소되면(클라이언트 종료 등) 남은 작업도 함께 정리
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+    if pending:
+        await asyncio.wait(pending)
+    return [TIMED_OUT if task in pending else task.result() for task in tasks]
+
+
+def _parse_budget_ms(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        budget = float(value) / 1000
+    except ValueError:
+        return None
+    return budget if budget > 0 else None
+
+
+class DeadlineMiddleware:
+    """
+    요청마다 마감 시각을 정해 contextvar에 기록하는 ASGI 미들웨어.
+    X-Request-Deadline-Ms 헤더나 deadline_ms 쿼리로 받은 값(없으면 기본값)을 maximum 이하로 제한해 사용합니다.
+    """
+
+    def __init__(self, app, default: Optional[float] = None, maximum: Optional[float] = None):
+        self.app = app
+        self.default = default
+        self.maximum = maximum
+
+    def _budget(self, scope) -> Optional[float]:
+        budget = None
+        for name, value in scope.get("headers", []):
+            if name.decode("latin-1").lower() == DEADLINE_HEADER:
+                budget = _parse_budget_ms(value.decode("latin-1"))
+                break
+        if budget is None and scope.get("query_string"):
+            values = parse_qs(scope["query_string"].decode("latin-1")).get(DEADLINE_QUERY)
+            budget = _parse_budget_ms(values[0] if values else None)
+        if budget is None:
+            budget = self.default
+        if budget is not None and self.maximum:
+            budget = min(budget, self.maximum)
+        return budget
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        budget = self._budget(scope)
+        token = _deadline.set(time.monotonic() + budget if budget else None)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _deadline.reset(token)
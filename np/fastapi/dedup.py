@@ -0,0 +1,83 @@
+import re
+import hashlib
+from typing import List, Sequence
+
+# 글자/숫자 외(공백, 문장부호, 따옴표 등)는 매체마다 다르게 붙으므로 모두 제거하고 비교
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize(text: str) -> str:
+    return _NON_WORD.sub("", text.lower())
+
+
+def simhash(text: str, ngram: int = 3, bits: int = 64) -> int:
+    """
+    정규화한 글의 글자 n-gram으로 SimHash를 계산합니다. 띄어쓰기가 달라도 같은 값이 나오도록 공백을 제거한 뒤 자릅니다.
+    n-gram이 자주 나올수록(중복 포함) 가중치가 커집니다.
+    """
+    text = normalize(text)
+    if len(text) <= ngram:
+        grams = [text] if text else []
+    else:
+        grams = [text[i:i + ngram] for i in range(len(text) - ngram + 1)]
+    if not grams:
+        return 0
+    digest_size = bits // 8
+    rows = [
+        format(int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=digest_size).digest(), "big"), f"0{bits}b")
+        for gram in grams
+    ]
+    # 비트 위치별로 1이 과반이면 1 (열 단위 집계는 zip/count로 처리해 파이썬 반복을 줄임)
+    half = len(rows) / 2
+    return int("".join("1" if column.count("1") > half else "0" for column in zip(*rows)), 2)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class NearDuplicateDetector:
+    """
+    SimHash로 거의 같은 글(같은 통신사 기사를 여러 매체가 옮겨 실은 경우 등)을 찾습니다.
+    threshold는 유사도(1 - 해밍 거리 / 비트 수)이며, 0이면 중복 검사를 하지 않습니다.
+    """
+
+    def __init__(self, threshold: float = 0.9, ngram: int = 3, bits: int = 64):
+        self.threshold = threshold
+        self.ngram = ngram
+        self.bits = bits
+        self.max_distance = int(round((1 - threshold) * bits))
+        self.checked = 0
+        self.duplicates = 0
+
+    def representatives(self, texts: Sequence[str]) -> List[int]:
+        """
+        글마다 대표 글의 순서를 반환합니다. 대표 글은 자기 자신(i)을, 중복 글은 먼저 나온 대표 글의 순서를 가리킵니다.
+        """
+        self.checked += len(texts)
+        if self.threshold <= 0:
+            return list(range(len(texts)))
+        hashes = [simhash(text, self.ngram, self.bits) if normalize(text) else None for text in texts]
+        result: List[int] = []
+        for index, value in enumerate(hashes):
+            original = index
+            if value is not None:
+                for candidate in range(index):
+                    if (
+                        result[candidate] == candidate
+                        and hashes[candidate] is not None
+                        and hamming_distance(value, hashes[candidate]) <= self.max_distance
+                    ):
+                        original = candidate
+                        break
+            if original != index:
+                self.duplicates += 1
+            result.append(original)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "checked": self.checked,
+            "duplicates": self.duplicates,
+            "duplicate_ratio": round(self.duplicates / self.checked, 4) if self.checked else 0.0,
+        }
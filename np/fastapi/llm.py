@@ -0,0 +1,37 @@
+import time
+
+import deadline
+import metrics
+from rate_limit import Throttled, parse_retry_after, rate_limits
+from startup import lazy_import
+
+# OpenAI SDK는 import 비용이 커서 첫 호출(또는 시작 시 명시적 로딩) 때 실제로 로딩
+openai = lazy_import("openai")
+
+
+async def chat_completion(**kwargs):
+    """
+    OpenAI ChatCompletion 호출. 공유 limiter로 속도/동시 요청 수를 제한하고 429(RateLimitError)는 백오프 후 재시도합니다.
+    재시도를 모두 소진하면 원래 RateLimitError를 그대로 올립니다.
+    """
+    left = deadline.remaining()
+    if left is not None and not kwargs.get("stream"):
+        # 요청 마감 시간 이후까지 응답을 기다리지 않도록 OpenAI 요청 timeout도 제한
+        # (스트리밍은 호출 측에서 청크 단위로 마감 시간을 확인)
+        kwargs.setdefault("request_timeout", max(left, 0.001))
+
+    async def attempt():
+        started = time.perf_counter()
+        try:
+            with metrics.stage("openai"):
+                response = await openai.ChatCompletion.acreate(**kwargs)
+        except openai.error.RateLimitError as e:
+            metrics.record_upstream("openai", 429, time.perf_counter() - started)
+            raise Throttled(parse_retry_after(getattr(e, "headers", None)), error=e)
+        except openai.error.OpenAIError as e:
+            metrics.record_upstream("openai", getattr(e, "http_status", None) or "error")
+            raise
+        metrics.record_upstream("openai", 200, time.perf_counter() - started)
+        return response
+
+    return await rate_limits.get("openai").call(attempt)
@@ -0,0 +1,125 @@
+import re
+import asyncio
+from typing import Awaitable, Callable, List
+
+# tiktoken이 설치되어 있으면 정확한 토큰 수를, 없으면 문자 수 기반 추정치를 사용
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENCODING = None
+
+# 문장 경계: 마침표/물음표/느낌표(및 닫는 따옴표·괄호) 뒤의 공백
+_SENTENCE_END = re.compile(r"(?<=[.!?。])[\"'”’)\]]*\s+")
+
+ChunkSummarizer = Callable[[str], Awaitable[str]]
+
+
+def estimate_tokens(text: str) -> int:
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    # 영문/숫자는 대략 4글자당 1토큰, 한글 등은 글자당 1~2토큰이라 보수적으로 1.5로 계산
+    ascii_count = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_count + 3) // 4 + ((len(text) - ascii_count) * 3 + 1) // 2
+
+
+def _split_oversized(piece: str, max_tokens: int) -> List[str]:
+    """문장 하나가 예산보다 길면 글자 수로 자릅니다."""
+    tokens = estimate_tokens(piece)
+    parts = -(-tokens // max_tokens)
+    size = -(-len(piece) // parts)
+    return [piece[i:i + size] for i in range(0, len(piece), size)]
+
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    """
+    문단 → 문장 순으로 경계를 지키며 max_tokens 이하의 청크로 나눕니다.
+    """
+    pieces: List[str] = []
+    for paragraph in re.split(r"\n\s*\n|\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if estimate_tokens(paragraph) <= max_tokens:
+            pieces.append(paragraph)
+            continue
+        for sentence in _SENTENCE_END.split(paragraph):
+            if estimate_tokens(sentence) <= max_tokens:
+                pieces.append(sentence)
+            else:
+                pieces.extend(_split_oversized(sentence, max_tokens))
+
+    # 조각을 이어 붙일 때 넣는 줄바꿈도 예산에 포함
+    separator_tokens = estimate_tokens("\n")
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for piece in pieces:
+        piece_tokens = estimate_tokens(piece)
+        if current and current_tokens + separator_tokens + piece_tokens > max_tokens:
+            chunks.append("\n".join(current))
+            current, current_tokens = [], 0
+        if current:
+            current_tokens += separator_tokens
+        current.append(piece)
+        current_tokens += piece_tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+class MapReduceSummarizer:
+    """
+    긴 입력을 토큰 예산 단위 청크로 나눠 동시에 요약(map)하고,
+    호출 측은 그 결과를 모아 마지막 요약 한 번(reduce)만 수행합니다.
+    입력이 청크 하나에 들어가면 나누지 않고 그대로 반환합니다.
+    """
+
+    def __init__(self, chunk_tokens: int = 2000, max_concurrency: int = 4, max_rounds: int = 3):
+        self.chunk_tokens = chunk_tokens
+        self.max_concurrency = max_concurrency
+        # 부분 요약을 합쳐도 예산을 넘으면 한 번 더 map (아주 긴 입력 대비)
+        self.max_rounds = max_rounds
+        self.split_inputs = 0
+        self.over_budget = 0
+
+    def needs_split(self, text: str) -> bool:
+        return estimate_tokens(text) > self.chunk_tokens
+
+    def key_parts(self, text: str) -> dict:
+        """결과가 청크 크기에 따라 달라지므로, 나눠 요약하는 입력은 캐시 키에 청크 크기를 포함합니다."""
+        return {"chunk_tokens": self.chunk_tokens} if self.needs_split(text) else {}
+
+    async def map_chunks(self, chunks: List[str], summarize_chunk: ChunkSummarizer) -> List[str]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(chunk: str) -> str:
+            async with semaphore:
+                return await summarize_chunk(chunk)
+
+        return list(await asyncio.gather(*(run(chunk) for chunk in chunks)))
+
+    async def condense(self, text: str, summarize_chunk: ChunkSummarizer) -> str:
+        """
+        reduce 단계에 넣을 텍스트를 반환합니다.
+        짧은 입력은 그대로, 긴 입력은 청크별 요약을 순서대로 이어 붙인 텍스트입니다.
+        max_rounds번 줄여도 예산을 넘으면 그대로 반환하되 경고를 남기고 over_budget으로 집계합니다.
+        """
+        if self.needs_split(text):
+            self.split_inputs += 1
+        for _ in range(self.max_rounds):
+            if not self.needs_split(text):
+                return text
+            chunks = split_into_chunks(text, self.chunk_tokens)
+            summaries = await self.map_chunks(chunks, summarize_chunk)
+            text = "\n\n".join(s.strip() for s in summaries if s and s.strip())
+        if self.needs_split(text):
+            self.over_budget += 1
+            print(
+                f"[WARNING] {self.max_rounds}회 나눠 요약한 뒤에도 예산을 넘는 입력입니다. "
+                f"(약 {estimate_tokens(text)}토큰 > {self.chunk_tokens}토큰)"
+            )
+        return text
+
+    def stats(self) -> dict:
+        return {"split_inputs": self.split_inputs, "over_budget": self.over_budget}
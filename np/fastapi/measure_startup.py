@@ -0,0 +1,100 @@
+"""
+서비스 import → ready 시간 측정 스크립트
+
+uvicorn 프로세스를 새로 띄워 /ready 가 200을 반환할 때까지의 시간을 여러 번 측정합니다.
+
+    python measure_startup.py --mode background --runs 5
+    python measure_startup.py --mode eager --runs 5 --output startup.json
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+import urllib.request
+import urllib.error
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_once(app: str, mode: str, timeout: float) -> dict:
+    port = free_port()
+    env = dict(os.environ, STARTUP_MODE=mode)
+    started = time.monotonic()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    listening_at = None
+    try:
+        while time.monotonic() - started < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"서버 프로세스가 종료되었습니다 (exit code {proc.returncode})")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=1) as resp:
+                    status = json.loads(resp.read().decode("utf-8"))
+                    return {
+                        "listening_seconds": round((listening_at or time.monotonic()) - started, 3),
+                        "ready_seconds": round(time.monotonic() - started, 3),
+                        "components": status.get("components", {}),
+                    }
+            except urllib.error.HTTPError as e:
+                # 503: 서버는 떴지만 아직 준비 중
+                if e.code == 503 and listening_at is None:
+                    listening_at = time.monotonic()
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                pass
+            time.sleep(0.02)
+        raise TimeoutError(f"{timeout}초 안에 ready 상태가 되지 않았습니다.")
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="import → ready 시간 측정")
+    parser.add_argument("--app", default="test:app")
+    parser.add_argument("--mode", default="eager", choices=["eager", "background", "lazy"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    runs = []
+    for i in range(args.runs):
+        result = measure_once(args.app, args.mode, args.timeout)
+        print(f"[{i + 1}/{args.runs}] listening {result['listening_seconds']}s, ready {result['ready_seconds']}s")
+        runs.append(result)
+
+    ready = [r["ready_seconds"] for r in runs]
+    listening = [r["listening_seconds"] for r in runs]
+    report = {
+        "app": args.app,
+        "mode": args.mode,
+        "runs": len(runs),
+        "ready_seconds_median": round(statistics.median(ready), 3),
+        "ready_seconds_min": min(ready),
+        "ready_seconds_max": max(ready),
+        "listening_seconds_median": round(statistics.median(listening), 3),
+        "last_components": runs[-1]["components"],
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+import time
+import asyncio
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 지연 시간 히스토그램 기본 구간(초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[str, ...]
+Sample = Tuple[Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> Labels:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key: Labels) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def lines(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self.lines()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def lines(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 값 → [구간별 개수..., 합계, 전체 개수]
+        self._values: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        counts = self._values.get(key)
+        if counts is None:
+            counts = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            counts[index] += 1
+        counts[-2] += value
+        counts[-1] += 1
+
+    def lines(self) -> List[str]:
+        lines = []
+        for key, counts in self._values.items():
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(float(bound))})} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {counts[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(counts[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {counts[-1]}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """/metrics 요청 시점에 다른 구성 요소의 stats()에서 값을 읽어 오는 지표"""
+
+    def __init__(self, name: str, help: str, kind: str, collect: Callable[[], Iterable[Sample]]):
+        super().__init__(name, help)
+        self.kind = kind
+        self.collect = collect
+
+    def lines(self) -> List[str]:
+        try:
+            samples = list(self.collect())
+        except Exception as e:
+            print(f"[ERROR] 지표 수집 오류 ({self.name}): {e}")
+            return []
+        return [f"{self.name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def callback(self, name: str, help: str, kind: str, collect: Callable[[], Iterable[Sample]]) -> None:
+        self.register(CallbackMetric(name, help, kind, collect))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.register(Counter(
+    "actio_http_requests_total", "처리한 HTTP 요청 수", ("route", "method", "status")
+))
+HTTP_DURATION = registry.register(Histogram(
+    "actio_http_request_duration_seconds", "HTTP 요청 처리 시간 (스트리밍은 본문 전송 완료까지)", ("route",)
+))
+HTTP_IN_FLIGHT = registry.register(Gauge(
+    "actio_http_requests_in_flight", "처리 중인 HTTP 요청 수"
+))
+STAGE_DURATION = registry.register(Histogram(
+    "actio_stage_duration_seconds", "처리 단계별 소요 시간", ("stage",)
+))
+STAGE_IN_FLIGHT = registry.register(Gauge(
+    "actio_stage_in_flight", "처리 단계별 진행 중인 작업 수", ("stage",)
+))
+STAGE_ERRORS = registry.register(Counter(
+    "actio_stage_errors_total", "처리 단계별 예외 수", ("stage",)
+))
+UPSTREAM_RESPONSES = registry.register(Counter(
+    "actio_upstream_responses_total", "상류 API 응답 코드별 횟수 (연결 실패는 error, 타임아웃은 timeout)", ("provider", "status")
+))
+UPSTREAM_DURATION = registry.register(Histogram(
+    "actio_upstream_response_seconds", "상류 API 응답 헤더까지 걸린 시간", ("provider",)
+))
+LOOP_LAG = registry.register(Histogram(
+    "actio_event_loop_lag_seconds", "이벤트 루프 지연 (예약한 sleep보다 늦게 깨어난 시간)", buckets=LOOP_LAG_BUCKETS
+))
+
+
+@contextmanager
+def stage(name: str):
+    """with 블록(안의 await 포함)의 소요 시간, 진행 중 개수, 예외 수를 단계 이름으로 기록합니다."""
+    STAGE_IN_FLIGHT.inc(stage=name)
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=name)
+        raise
+    finally:
+        STAGE_IN_FLIGHT.dec(stage=name)
+        STAGE_DURATION.observe(time.perf_counter() - started, stage=name)
+
+
+def record_upstream(provider: str, status, seconds: Optional[float] = None) -> None:
+    UPSTREAM_RESPONSES.inc(provider=provider, status=status)
+    if seconds is not None:
+        UPSTREAM_DURATION.observe(seconds, provider=provider)
+
+
+def httpx_event_hooks(provider: str) -> dict:
+    """httpx 클라이언트에 붙여 상류 응답 코드와 응답 시간을 기록하는 event_hooks"""
+
+    async def on_request(request) -> None:
+        request.extensions["actio_started"] = time.perf_counter()
+
+    async def on_response(response) -> None:
+        started = response.request.extensions.get("actio_started")
+        record_upstream(
+            provider, response.status_code, time.perf_counter() - started if started is not None else None
+        )
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+def stats_samples(stats: Dict[str, dict], field: str, label: str) -> List[Sample]:
+    """{이름: stats() 결과}에서 field 값을 (라벨, 값) 목록으로 변환 (없는 필드는 건너뜀)"""
+    samples = []
+    for name, values in stats.items():
+        value = values.get(field)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            samples.append(({label: name}, value))
+    return samples
+
+
+class LoopLagMonitor:
+    """interval마다 깨어나 예정보다 늦은 시간을 이벤트 루프 지연으로 기록합니다."""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.last = 0.0
+        self.max = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            self.last = lag
+            self.max = max(self.max, lag)
+            LOOP_LAG.observe(lag)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class MetricsMiddleware:
+    """
+    HTTP 요청 수/처리 시간/진행 중 개수를 기록하는 ASGI 미들웨어.
+    라벨에는 실제 경로 대신 라우트 경로(/audio/{filename} 등)를 사용해 라벨 수가 늘어나지 않게 합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: Dict[object, str] = {}
+
+    def _route(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        route = self._routes.get(endpoint)
+        if route is None:
+            app = scope.get("app")
+            for candidate in getattr(app, "routes", []):
+                if getattr(candidate, "endpoint", None) is endpoint:
+                    route = candidate.path
+                    break
+            else:
+                route = getattr(endpoint, "__name__", "unknown")
+            self._routes[endpoint] = route
+        return route
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = self._route(scope)
+            HTTP_DURATION.observe(time.perf_counter() - started, route=route)
+            HTTP_REQUESTS.inc(route=route, method=scope["method"], status=status)
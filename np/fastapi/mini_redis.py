@@ -0,0 +1,219 @@
+"""
+테스트/로컬 개발용 최소 RESP(Redis 프로토콜) 서버
+
+Redis 없이 STATE_BACKEND_URL=redis://... 경로(RedisBackend)를 확인할 때 사용합니다.
+backends.RedisBackend가 쓰는 명령(GET, SET EX/PX/NX/XX, DEL 등)만 지원하며, 데이터는 메모리에만 있습니다.
+EVAL은 backends.COMPARE_AND_DELETE_SCRIPT 하나만 지원합니다.
+
+    python mini_redis.py --port 6380
+    STATE_BACKEND_URL=redis://127.0.0.1:6380/0 uvicorn test:app --workers 4
+"""
+import time
+import asyncio
+import argparse
+from typing import Dict, List, Optional, Tuple
+
+from backends import COMPARE_AND_DELETE_SCRIPT
+
+
+class RespError(Exception):
+    pass
+
+
+class MiniRedis:
+    def __init__(self):
+        # key → (값, 만료 시각(monotonic) 또는 None)
+        self._data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def sweep(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, (_, expires_at) in self._data.items() if expires_at is not None and expires_at <= now]:
+            del self._data[key]
+
+    def execute(self, args: List[bytes]):
+        if not args:
+            raise RespError("ERR empty command")
+        command = args[0].upper().decode("latin-1")
+        handler = getattr(self, f"cmd_{command.lower()}", None)
+        if handler is None:
+            raise RespError(f"ERR unknown command '{command}'")
+        return handler(*args[1:])
+
+    def cmd_ping(self, *args):
+        return args[0] if args else "PONG"
+
+    def cmd_echo(self, message):
+        return message
+
+    def cmd_select(self, db):
+        return "OK"
+
+    def cmd_client(self, *args):
+        return "OK"
+
+    def cmd_get(self, key):
+        return self._get(key)
+
+    def cmd_set(self, key, value, *options):
+        expires_at = None
+        nx = xx = False
+        options = list(options)
+        while options:
+            option = options.pop(0).upper()
+            if option in (b"EX", b"PX"):
+                if not options:
+                    raise RespError("ERR syntax error")
+                amount = int(options.pop(0))
+                expires_at = time.monotonic() + (amount if option == b"EX" else amount / 1000)
+            elif option == b"NX":
+                nx = True
+            elif option == b"XX":
+                xx = True
+            else:
+                raise RespError("ERR syntax error")
+        exists = self._get(key) is not None
+        if (nx and exists) or (xx and not exists):
+            return None
+        self._data[key] = (value, expires_at)
+        return "OK"
+
+    def cmd_del(self, *keys):
+        removed = 0
+        for key in keys:
+            if self._get(key) is not None:
+                del self._data[key]
+                removed += 1
+        return removed
+
+    def cmd_eval(self, script, numkeys, *args):
+        if script.decode("utf-8") != COMPARE_AND_DELETE_SCRIPT:
+            raise RespError("ERR mini_redis supports only the compare-and-delete script")
+        if int(numkeys) != 1 or len(args) != 2:
+            raise RespError("ERR wrong number of arguments for compare-and-delete")
+        key, token = args
+        if self._get(key) != token:
+            return 0
+        del self._data[key]
+        return 1
+
+    def cmd_exists(self, *keys):
+        return sum(1 for key in keys if self._get(key) is not None)
+
+    def cmd_pttl(self, key):
+        if self._get(key) is None:
+            return -2
+        expires_at = self._data[key][1]
+        return -1 if expires_at is None else int((expires_at - time.monotonic()) * 1000)
+
+    def cmd_dbsize(self):
+        self.sweep()
+        return len(self._data)
+
+    def cmd_flushdb(self, *args):
+        self._data.clear()
+        return "OK"
+
+    cmd_flushall = cmd_flushdb
+
+
+def encode(value) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, RespError):
+        return f"-{value}\r\n".encode("utf-8")
+    if isinstance(value, str):
+        return f"+{value}\r\n".encode("utf-8")
+    if isinstance(value, int):
+        return f":{value}\r\n".encode("ascii")
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(encode(item) for item in value)
+    raise TypeError(f"RESP로 변환할 수 없는 값: {value!r}")
+
+
+async def read_command(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # 인라인 명령 (telnet/redis-cli 호환)
+        return line.strip().split()
+    args = []
+    for _ in range(int(line[1:])):
+        header = await reader.readline()
+        if not header.startswith(b"$"):
+            raise RespError("ERR Protocol error: expected '$'")
+        length = int(header[1:])
+        data = await reader.readexactly(length + 2)
+        args.append(data[:-2])
+    return args
+
+
+async def serve(host: str, port: int) -> None:
+    store = MiniRedis()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    args = await read_command(reader)
+                except RespError as e:
+                    writer.write(encode(e))
+                    break
+                if args is None:
+                    break
+                if args and args[0].upper() == b"QUIT":
+                    writer.write(encode("OK"))
+                    break
+                try:
+                    reply = store.execute(args)
+                except RespError as e:
+                    reply = e
+                except (TypeError, ValueError):
+                    reply = RespError("ERR wrong number of arguments or invalid value")
+                writer.write(encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def sweeper() -> None:
+        while True:
+            await asyncio.sleep(1)
+            store.sweep()
+
+    server = await asyncio.start_server(handle, host, port)
+    print(f"[INFO] mini_redis 실행 중: {host}:{port}")
+    sweep_task = asyncio.create_task(sweeper())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        sweep_task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="테스트용 최소 RESP 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
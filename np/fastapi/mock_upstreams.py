@@ -0,0 +1,240 @@
+"""
+벤치마크용 상류 API(네이버, 유튜브, SupaData, OpenAI, ElevenLabs) 대역 서버
+
+실제 API 키 없이 test.py의 처리량/지연 시간을 측정하기 위해 사용합니다. bench.py가 자동으로 띄우며,
+직접 실행할 수도 있습니다.
+
+    MOCK_UPSTREAM_PROFILE='{"openai": {"latency_ms": 800, "throttle_rate": 0.05}}' \\
+        uvicorn mock_upstreams:app --port 9000
+
+제공자별 설정 (MOCK_UPSTREAM_PROFILE JSON으로 기본값 덮어쓰기):
+    latency_ms     응답 지연 중앙값 (로그정규분포)
+    jitter         로그정규분포 sigma (0이면 항상 latency_ms)
+    error_rate     500 응답 비율
+    throttle_rate  429 응답 비율
+    retry_after    429 응답의 Retry-After(초), 0이면 헤더 없음
+    duplicate_rate (naver) 다른 매체가 옮겨 실은 것처럼 첫 기사와 거의 같은 기사를 돌려주는 비율
+    invalid_json_rate  (openai) 일괄 요약 요청에 JSON이 아닌 응답을 보내는 비율
+"""
+import os
+import json
+import math
+import time
+import random
+import asyncio
+import hashlib
+from collections import Counter
+from typing import Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+DEFAULT_PROFILE = {
+    "naver": {
+        "latency_ms": 80, "jitter": 0.4, "error_rate": 0.0, "throttle_rate": 0.0, "retry_after": 1,
+        "duplicate_rate": 0.0,
+    },
+    "youtube": {"latency_ms": 150, "jitter": 0.4, "error_rate": 0.0, "throttle_rate": 0.0, "retry_after": 1},
+    "supadata": {
+        "latency_ms": 400, "jitter": 0.5, "error_rate": 0.0, "throttle_rate": 0.0, "retry_after": 1,
+        "transcript_words": 600,
+    },
+    "openai": {
+        "latency_ms": 1200, "jitter": 0.4, "error_rate": 0.0, "throttle_rate": 0.0, "retry_after": 1,
+        "stream_chunks": 20, "invalid_json_rate": 0.0,
+    },
+    "elevenlabs": {
+        "latency_ms": 300, "jitter": 0.3, "error_rate": 0.0, "throttle_rate": 0.0, "retry_after": 1,
+        "chunks": 16, "chunk_bytes": 4096, "chunk_interval_ms": 20,
+    },
+}
+
+
+def load_profile(raw: Optional[str]) -> dict:
+    profile = {name: dict(values) for name, values in DEFAULT_PROFILE.items()}
+    for name, values in json.loads(raw or "{}").items():
+        profile.setdefault(name, {}).update(values)
+    return profile
+
+
+PROFILE = load_profile(os.getenv("MOCK_UPSTREAM_PROFILE"))
+
+app = FastAPI()
+calls: Counter = Counter()
+
+
+def _seed(*parts) -> str:
+    return hashlib.md5("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:11]
+
+
+async def _simulate(provider: str) -> Optional[Response]:
+    """지연을 흉내 내고, 설정한 비율로 429/500 응답을 반환합니다. 정상 처리할 차례면 None"""
+    config = PROFILE[provider]
+    median = config["latency_ms"] / 1000
+    sigma = config.get("jitter", 0)
+    delay = random.lognormvariate(math.log(median), sigma) if median > 0 and sigma > 0 else median
+    await asyncio.sleep(delay)
+    roll = random.random()
+    if roll < config.get("throttle_rate", 0):
+        calls[(provider, 429)] += 1
+        headers = {"Retry-After": str(config["retry_after"])} if config.get("retry_after") else {}
+        return JSONResponse(
+            {"error": {"message": "Rate limit reached (mock)", "type": "requests", "code": "rate_limit_exceeded"}},
+            status_code=429,
+            headers=headers,
+        )
+    if roll < config.get("throttle_rate", 0) + config.get("error_rate", 0):
+        calls[(provider, 500)] += 1
+        return JSONResponse({"error": {"message": "Internal error (mock)", "type": "server_error"}}, status_code=500)
+    calls[(provider, 200)] += 1
+    return None
+
+
+_WORDS = [
+    "발표", "공개", "논란", "확대", "감소", "증가", "계획", "협력", "투자", "출시", "경쟁", "전망",
+    "정부", "시장", "기업", "팬들", "업계", "관계자", "실적", "일정", "반응", "영향", "조사", "결과",
+]
+
+
+def _article_text(query: str, sort: str, i: int) -> tuple:
+    """기사마다 다른 단어 조합으로 제목/설명을 만듭니다. (같은 검색어/순서면 항상 같은 내용)"""
+    rng = random.Random(_seed(query, sort, i))
+    title = f"<b>{query}</b> " + " ".join(rng.sample(_WORDS, 3))
+    sentences = [f"{query} " + " ".join(rng.sample(_WORDS, 5)) + "." for _ in range(3)]
+    return title, " ".join(sentences)
+
+
+@app.get("/v1/search/news.json")
+async def naver_news(query: str, display: int = 3, sort: str = "sim"):
+    failure = await _simulate("naver")
+    if failure is not None:
+        return failure
+    duplicate_rate = PROFILE["naver"].get("duplicate_rate", 0)
+    items = []
+    for i in range(display):
+        source = i
+        # 검색어/순서로 정해지는 값이라 같은 요청에는 같은 결과
+        if i > 0 and random.Random(_seed(query, sort, i, "dup")).random() < duplicate_rate:
+            source = 0
+        title, description = _article_text(query, sort, source)
+        if source != i:
+            title, description = f"[매체{i}] {title}", f"{description} (매체{i} 제공)"
+        items.append({
+            "title": title,
+            "description": description,
+            "originallink": f"https://news.example.com/{_seed(query, sort, i)}",
+            "link": f"https://n.news.example.com/{_seed(query, sort, i)}",
+        })
+    return {"items": items}
+
+
+@app.get("/youtube/v3/search")
+async def youtube_search(q: str, maxResults: int = 3):
+    failure = await _simulate("youtube")
+    if failure is not None:
+        return failure
+    return {
+        "items": [
+            {"id": {"videoId": _seed(q, i)}, "snippet": {"title": f"{q} 영상 {i}"}}
+            for i in range(maxResults)
+        ]
+    }
+
+
+@app.get("/v1/youtube/transcript")
+async def supadata_transcript(videoId: str):
+    failure = await _simulate("supadata")
+    if failure is not None:
+        return failure
+    words = PROFILE["supadata"].get("transcript_words", 600)
+    return {"content": [{"text": f"{videoId} 자막 문장 {i}."} for i in range(max(1, words // 4))]}
+
+
+def _completion_text(messages: list) -> str:
+    prompt = "".join(str(m.get("content", "")) for m in messages)
+    batch = _batch_articles(messages)
+    if batch is not None:
+        # 일괄 요약 요청 ({"articles": [...]})에는 {"summaries": [...]} 형식으로 응답
+        if random.random() < PROFILE["openai"].get("invalid_json_rate", 0):
+            return "요약을 생성하지 못했습니다."
+        return json.dumps({
+            "summaries": [
+                {"id": item.get("id"), "summary": f"모의 요약입니다 ({len(str(item.get('text', '')))}자 입력, {_seed(item)})."}
+                for item in batch
+            ]
+        }, ensure_ascii=False)
+    return f"모의 요약입니다 ({len(prompt)}자 입력, {_seed(prompt)})."
+
+
+def _batch_articles(messages: list) -> Optional[list]:
+    if not messages:
+        return None
+    try:
+        data = json.loads(messages[-1].get("content", ""))
+    except (TypeError, ValueError):
+        return None
+    return data.get("articles") if isinstance(data, dict) else None
+
+
+@app.post("/v1/chat/completions")
+async def openai_chat(request: Request):
+    body = await request.json()
+    failure = await _simulate("openai")
+    if failure is not None:
+        return failure
+    text = _completion_text(body.get("messages", []))
+    model = body.get("model", "gpt-3.5-turbo")
+    if not body.get("stream"):
+        return {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    count = max(1, PROFILE["openai"].get("stream_chunks", 20))
+    step = max(1, math.ceil(len(text) / count))
+
+    async def events():
+        for start in range(0, len(text), step):
+            chunk = {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": text[start:start + step]}, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+            await asyncio.sleep(0.01)
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.post("/v1/text-to-speech/{voice_id}/stream")
+async def elevenlabs_stream(voice_id: str):
+    failure = await _simulate("elevenlabs")
+    if failure is not None:
+        return failure
+    config = PROFILE["elevenlabs"]
+
+    async def audio():
+        for _ in range(config.get("chunks", 16)):
+            yield os.urandom(config.get("chunk_bytes", 4096))
+            await asyncio.sleep(config.get("chunk_interval_ms", 20) / 1000)
+
+    return StreamingResponse(audio(), media_type="audio/mpeg")
+
+
+@app.get("/__mock/stats")
+async def mock_stats():
+    """제공자/응답 코드별 호출 수"""
+    return {f"{provider}:{status}": count for (provider, status), count in sorted(calls.items())}
+
+
+@app.post("/__mock/reset")
+async def mock_reset():
+    calls.clear()
+    return {"ok": True}
@@ -0,0 +1,242 @@
+import os
+import time
+import random
+import asyncio
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import deadline
+
+T = TypeVar("T")
+
+# 제공자별 기본 한도. RATE_LIMIT_<NAME>_RPS / _BURST / _CONCURRENCY 환경변수로 조정
+PROVIDER_LIMITS: Dict[str, dict] = {
+    "naver": {"rps": 10, "burst": 10, "concurrency": 10},
+    "youtube": {"rps": 5, "burst": 5, "concurrency": 5},
+    "supadata": {"rps": 2, "burst": 4, "concurrency": 4},
+    "elevenlabs": {"rps": 2, "burst": 3, "concurrency": 3},
+    "openai": {"rps": 5, "burst": 10, "concurrency": 8},
+}
+
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "3"))
+RATE_LIMIT_BASE_DELAY = float(os.getenv("RATE_LIMIT_BASE_DELAY", "0.5"))
+RATE_LIMIT_MAX_DELAY = float(os.getenv("RATE_LIMIT_MAX_DELAY", "30"))
+# 워커 프로세스 수 (uvicorn --workers 기본값과 같은 WEB_CONCURRENCY). 제공자 한도를 워커 수로 나눠 각 워커가 나눠 가짐
+RATE_LIMIT_WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+
+
+def parse_retry_after(headers: Optional[Any]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 초로 변환합니다."""
+    if not headers:
+        return None
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class Throttled(Exception):
+    """
+    상류에서 속도 제한(429 등)을 받았음을 limiter에 알리는 예외.
+    재시도를 모두 소진하면 response가 있으면 그 응답을, error가 있으면 원래 예외를 호출 측에 돌려줍니다.
+    """
+
+    def __init__(self, retry_after: Optional[float] = None, response: Any = None, error: Optional[BaseException] = None):
+        super().__init__(f"rate limited (retry_after={retry_after})")
+        self.retry_after = retry_after
+        self.response = response
+        self.error = error
+
+
+class ProviderLimiter:
+    """
+    제공자 하나에 대한 요청 속도(토큰 버킷)와 동시 요청 수(AIMD)를 함께 제한합니다.
+
+    - 성공할 때마다 동시 요청 한도를 조금씩 늘리고(가산 증가), 429를 받으면 절반으로 줄입니다(승산 감소).
+    - Retry-After를 받으면 그 시간 동안 이 제공자로 가는 모든 요청을 멈춥니다.
+    - 재시도 간격은 지수 백오프에 지터를 섞어 여러 요청이 동시에 다시 몰리지 않게 합니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rps: float,
+        burst: int,
+        concurrency: int,
+        min_concurrency: int = 1,
+        max_retries: int = RATE_LIMIT_MAX_RETRIES,
+        base_delay: float = RATE_LIMIT_BASE_DELAY,
+        max_delay: float = RATE_LIMIT_MAX_DELAY,
+    ):
+        self.name = name
+        self.rps = rps
+        self.burst = burst
+        self.max_concurrency = concurrency
+        self.min_concurrency = min_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.limit = float(concurrency)
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._decreased_at = 0.0
+        self._inflight = 0
+        self._cond: Optional[asyncio.Condition] = None
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+
+    def _condition(self) -> asyncio.Condition:
+        # 이벤트 루프 안에서 처음 사용할 때 생성
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def _take_token(self) -> None:
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rps)
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rps)
+
+    async def acquire(self) -> None:
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self._inflight < int(self.limit))
+            self._inflight += 1
+        try:
+            await self._take_token()
+        except BaseException:
+            await self.release()
+            raise
+        self.requests += 1
+
+    async def release(self, success: bool = False) -> None:
+        cond = self._condition()
+        async with cond:
+            self._inflight -= 1
+            if success:
+                # 가산 증가: 한도만큼 성공하면 1 증가
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            cond.notify_all()
+
+    @asynccontextmanager
+    async def slot(self):
+        """요청 하나(스트리밍이면 응답을 다 받을 때까지)에 대한 자리를 잡습니다."""
+        await self.acquire()
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            await self.release(success)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        self.throttled += 1
+        now = time.monotonic()
+        # 동시에 돌아온 429 여러 개로 한도가 한꺼번에 무너지지 않도록 1초에 한 번만 감소
+        if now - self._decreased_at >= 1.0:
+            self.limit = max(self.min_concurrency, self.limit / 2)
+            self._decreased_at = now
+        self._tokens = 0.0
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + min(retry_after, self.max_delay))
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            # 서버가 알려준 시간 + 약간의 지터
+            return min(retry_after, self.max_delay) + random.uniform(0, self.base_delay)
+        # full jitter 지수 백오프
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt + 1)))
+
+    def should_retry(self, attempt: int, delay: float) -> bool:
+        """재시도 횟수가 남았고, 기다린 뒤에도 요청 마감 시간 안이면 True"""
+        left = deadline.remaining()
+        return attempt < self.max_retries and (left is None or delay < left)
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        fn()을 한도 안에서 실행합니다. fn이 Throttled를 올리면 백오프 후 다시 시도합니다.
+        """
+        attempt = 0
+        while True:
+            try:
+                async with self.slot():
+                    return await fn()
+            except Throttled as e:
+                self.on_throttle(e.retry_after)
+                delay = self.backoff_delay(attempt, e.retry_after)
+                if not self.should_retry(attempt, delay):
+                    if e.response is not None:
+                        return e.response
+                    if e.error is not None:
+                        raise e.error
+                    raise
+                print(f"[WARNING] {self.name} 속도 제한(429). {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                self.retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    @property
+    def busy(self) -> bool:
+        """동시 요청 한도의 절반 이상을 쓰고 있거나 Retry-After로 멈춘 상태"""
+        return self._inflight >= max(1, int(self.limit) // 2) or time.monotonic() < self._paused_until
+
+    def stats(self) -> dict:
+        return {
+            "concurrency_limit": round(self.limit, 2),
+            "inflight": self._inflight,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "retries": self.retries,
+        }
+
+
+class RateLimiters:
+    """
+    프로세스 안의 모든 엔드포인트가 공유하는 제공자별 limiter 모음.
+    워커가 여러 개면 각 워커는 전체 한도의 1/workers만 사용합니다.
+    """
+
+    def __init__(self, limits: Dict[str, dict], workers: int = 1):
+        self._limits = limits
+        self.workers = workers
+        self._limiters: Dict[str, ProviderLimiter] = {}
+
+    def get(self, provider: str) -> ProviderLimiter:
+        limiter = self._limiters.get(provider)
+        if limiter is None:
+            config = self._limits[provider]
+            prefix = f"RATE_LIMIT_{provider.upper()}_"
+            limiter = ProviderLimiter(
+                provider,
+                rps=float(os.getenv(prefix + "RPS", str(config["rps"]))) / self.workers,
+                burst=max(1, int(os.getenv(prefix + "BURST", str(config["burst"]))) // self.workers),
+                concurrency=max(1, int(os.getenv(prefix + "CONCURRENCY", str(config["concurrency"]))) // self.workers),
+            )
+            self._limiters[provider] = limiter
+        return limiter
+
+    def busy(self) -> bool:
+        return any(limiter.busy for limiter in self._limiters.values())
+
+    def stats(self) -> dict:
+        return {name: limiter.stats() for name, limiter in self._limiters.items()}
+
+
+rate_limits = RateLimiters(PROVIDER_LIMITS, RATE_LIMIT_WORKERS)
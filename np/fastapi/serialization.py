@@ -0,0 +1,44 @@
+import json
+from typing import Any, List, Optional, Sequence
+
+from fastapi.responses import JSONResponse
+
+# orjson이 설치되어 있으면 사용하고, 없으면 표준 json으로 같은 형식(공백 없음, UTF-8 그대로)을 만듦
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """dict/list 응답을 dumps()로 직렬화합니다. (모델 객체는 미리 dict로 변환해서 전달)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[List[str]]:
+    """
+    "title,url,summary" 형식의 fields 파라미터를 필드 목록으로 바꿉니다. 비어 있으면 None(모든 필드)입니다.
+    허용하지 않는 필드가 있으면 ValueError를 올립니다.
+    """
+    if not fields:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError(f"알 수 없는 필드: {', '.join(unknown)} (사용 가능: {', '.join(allowed)})")
+    return names or None
+
+
+def project(item: dict, names: Optional[List[str]]) -> dict:
+    """지정한 필드만 남긴 새 dict를 반환합니다. (공유 결과를 바꾸지 않도록 원본은 그대로 둠)"""
+    if names is None:
+        return item
+    return {name: item[name] for name in names if name in item}
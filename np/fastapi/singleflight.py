@@ -0,0 +1,117 @@
+import os
+import uuid
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import deadline
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 작업을 하나로 합칩니다.
+
+    - 처음 들어온 호출이 작업(Task)을 만들고, 끝나기 전에 들어온 같은 키의 호출은 그 결과를 함께 기다립니다.
+    - 기다리던 호출 하나가 취소되어도(클라이언트 연결 종료 등) 공유 작업은 계속 실행됩니다.
+    - 작업이 끝나면 키를 지우므로 결과를 보관하지는 않습니다. (보관은 각 캐시가 담당)
+    - 공유 작업은 마감 시간 없이 실행되고, 각 호출은 자기 요청의 마감 시간까지만 기다립니다.
+      (마감이 짧은 요청이 먼저 들어와도 다른 요청의 결과가 시간 초과로 잘리지 않음)
+
+    워커 간 공유 백엔드(backend.shared)를 주면 워커 사이에서도 합칩니다. 키별 잠금(lease)을 얻은 워커만 계산하고
+    결과를 result_ttl 동안 백엔드에 남기며, 다른 워커는 결과가 생기거나 잠금이 풀릴 때까지 기다립니다.
+    이때 결과는 JSON으로 저장할 수 있는 값이어야 하고, publishable(결과)이 False인 결과(부분 결과 등)는 남기지 않습니다.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        lease: float = 120,
+        result_ttl: float = 5,
+        poll_interval: float = 0.05,
+        max_poll_interval: float = 0.5,
+        publishable: Optional[Callable[[Any], bool]] = None,
+    ):
+        self.backend = backend if backend is not None and backend.shared else None
+        self.lease = lease
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.publishable = publishable
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.leaders = 0
+        self.followers = 0
+        self.remote_followers = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.create_task(self._run(key, fn))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.followers += 1
+        return await deadline.run(asyncio.shield(task))
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        # 작업(Task)은 만든 요청의 컨텍스트를 복사하므로 여기서 마감 시간을 지워도 그 요청에는 영향 없음
+        deadline.clear()
+        if self.backend is None:
+            return await fn()
+        return await self._across_workers(key, fn)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 기다리는 호출이 모두 취소된 뒤 실패한 경우 "exception was never retrieved" 경고 방지
+        if not task.cancelled():
+            task.exception()
+
+    async def _quietly(self, aw: Awaitable[Any]) -> None:
+        try:
+            await aw
+        except Exception as e:
+            print(f"[WARNING] 공유 백엔드 기록 실패: {e}")
+
+    async def _across_workers(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        lock_key, result_key = f"sf:lock:{key}", f"sf:result:{key}"
+        # 잠금마다 다른 값을 넣어, 풀 때 아직 내 잠금인지 확인
+        token = f"{self.owner}-{uuid.uuid4().hex[:8]}"
+        delay = self.poll_interval
+        waited = False
+        while True:
+            try:
+                stored = await self.backend.get(result_key)
+                if stored is not None:
+                    return stored["value"]
+                if await self.backend.add(lock_key, token, self.lease):
+                    break
+            except Exception as e:
+                # 백엔드 장애 시 워커 안에서만 합치고 계속 처리
+                print(f"[WARNING] 공유 백엔드 조회 실패, 이 워커에서 계산합니다: {e}")
+                return await fn()
+            if not waited:
+                waited = True
+                self.remote_followers += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_poll_interval)
+
+        try:
+            value = await fn()
+            if self.publishable is None or self.publishable(value):
+                await self._quietly(self.backend.set(result_key, {"value": value}, self.result_ttl))
+            return value
+        finally:
+            # 실패해도 잠금을 풀어 기다리던 워커가 직접 계산하도록 함
+            # (lease가 지나 다른 워커가 잠금을 얻었으면 그 잠금은 건드리지 않음)
+            await self._quietly(self.backend.delete_if(lock_key, token))
+
+    def stats(self) -> dict:
+        total = self.leaders + self.followers
+        return {
+            "inflight": len(self._inflight),
+            "leaders": self.leaders,
+            "followers": self.followers,
+            "remote_followers": self.remote_followers,
+            "coalesced_ratio": round(self.followers / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,136 @@
+import sys
+import time
+import asyncio
+import importlib.util
+from typing import Awaitable, Callable, Dict, Optional
+
+# 프로세스가 이 모듈을 처음 import한 시점 (import → ready 시간 측정 기준)
+PROCESS_STARTED_AT = time.monotonic()
+
+
+def lazy_import(name: str):
+    """
+    모듈을 실제 속성 접근 시점까지 로딩을 미루는 import.
+    이미 로딩되어 있으면 그대로 반환합니다.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"모듈을 찾을 수 없습니다: {name}")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class Component:
+    def __init__(self, name: str, loader: Callable[[], Awaitable[None]], required: bool = True):
+        self.name = name
+        self.loader = loader
+        self.required = required
+        self.state = "pending"
+        self.seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _load(self) -> None:
+        self.state = "loading"
+        started = time.monotonic()
+        try:
+            await self.loader()
+            self.state = "ready"
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e)
+            print(f"[ERROR] 구성 요소 초기화 실패 ({self.name}): {e}")
+        finally:
+            self.seconds = round(time.monotonic() - started, 3)
+
+    async def ensure(self) -> None:
+        """아직 초기화되지 않았으면 초기화하고, 진행 중이면 완료될 때까지 기다립니다."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._load())
+        await asyncio.shield(self._task)
+
+
+class StartupManager:
+    """
+    무거운 구성 요소(JVM/Okt, OpenAI SDK, 커넥션 워밍업 등)의 초기화 시점을 관리합니다.
+
+    - eager: lifespan 시작 시 모두 초기화한 뒤 트래픽을 받음 (기존 동작)
+    - background: 바로 트래픽을 받고 백그라운드에서 초기화, 끝나면 ready
+    - lazy: 미리 초기화하지 않음. 각 구성 요소는 처음 사용할 때 초기화됨
+    """
+
+    MODES = ("eager", "background", "lazy")
+
+    def __init__(self, mode: str = "eager"):
+        if mode not in self.MODES:
+            print(f"[WARNING] 알 수 없는 STARTUP_MODE '{mode}', eager로 동작합니다.")
+            mode = "eager"
+        self.mode = mode
+        self.components: Dict[str, Component] = {}
+        self.ready_at: Optional[float] = None
+        self._background: Optional[asyncio.Task] = None
+
+    def register(self, name: str, loader: Callable[[], Awaitable[None]], required: bool = True) -> None:
+        self.components[name] = Component(name, loader, required)
+
+    async def ensure(self, name: str) -> None:
+        await self.components[name].ensure()
+
+    async def _load_all(self) -> None:
+        await asyncio.gather(*(c.ensure() for c in self.components.values()))
+        self._mark_ready()
+
+    def _mark_ready(self) -> None:
+        if self.ready_at is None:
+            self.ready_at = time.monotonic()
+            print(f"[INFO] 서비스 준비 완료 ({self.mode}): import 후 {self.ready_at - PROCESS_STARTED_AT:.3f}초")
+
+    async def start(self) -> None:
+        if self.mode == "eager":
+            await self._load_all()
+        elif self.mode == "background":
+            self._background = asyncio.create_task(self._load_all())
+        else:
+            self._mark_ready()
+
+    async def stop(self) -> None:
+        if self._background is not None and not self._background.done():
+            self._background.cancel()
+
+    @property
+    def ready(self) -> bool:
+        # 실패한 구성 요소는 사용 시 폴백하므로 준비 완료를 막지 않음 (degraded로 표시)
+        if self.mode == "lazy":
+            return True
+        return all(
+            c.state in ("ready", "failed") for c in self.components.values() if c.required
+        )
+
+    @property
+    def degraded(self) -> bool:
+        return any(c.state == "failed" for c in self.components.values())
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "degraded": self.degraded,
+            "mode": self.mode,
+            "startup_seconds": (
+                round(self.ready_at - PROCESS_STARTED_AT, 3) if self.ready_at else None
+            ),
+            "components": {
+                name: {
+                    "state": c.state,
+                    "required": c.required,
+                    "seconds": c.seconds,
+                    "error": c.error,
+                }
+                for name, c in self.components.items()
+            },
+        }
@@ -0,0 +1,61 @@
+import time
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, List, Optional, Tuple
+
+from fastapi.responses import StreamingResponse
+
+from deadline import TIMED_OUT
+from serialization import dumps
+
+# 지원하는 스트리밍 형식: 줄 단위 JSON(NDJSON) 또는 Server-Sent Events
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def encode_event(event: dict, fmt: str) -> bytes:
+    data = dumps(event)
+    if fmt == "sse":
+        return f"event: {event.get('type', 'message')}\ndata: ".encode("utf-8") + data + b"\n\n"
+    return data + b"\n"
+
+
+def event_stream_response(events: AsyncIterator[dict], fmt: str = "ndjson") -> StreamingResponse:
+    async def body():
+        async for event in events:
+            yield encode_event(event, fmt)
+
+    return StreamingResponse(
+        body(),
+        media_type=STREAM_MEDIA_TYPES[fmt],
+        # 프록시(nginx 등)가 응답을 모아 두지 않도록
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def as_completed_indexed(
+    coros: List[Awaitable[Any]], timeout: Optional[float] = None
+) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    작업들을 동시에 실행하고 끝나는 순서대로 (원래 인덱스, 결과)를 반환합니다.
+    timeout(초)이 지나면 남은 작업을 취소하고 각각 (인덱스, TIMED_OUT)을 반환합니다.
+    소비자가 중간에 끊기면(클라이언트 연결 종료) 남은 작업은 취소합니다.
+    """
+    tasks = {asyncio.ensure_future(coro): index for index, coro in enumerate(coros)}
+    pending = set(tasks)
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    try:
+        while pending:
+            left = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+            done, pending = await asyncio.wait(pending, timeout=left, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in sorted(done, key=tasks.get):
+                yield tasks[task], task.result()
+        for task in sorted(pending, key=tasks.get):
+            task.cancel()
+            yield tasks[task], TIMED_OUT
+    finally:
+        for task in pending:
+            task.cancel()
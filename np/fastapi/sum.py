@@ -1,18 +1,40 @@
 import os
+import asyncio
 import html
-import httpx
 import re
-import uuid
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import List
 from dotenv import load_dotenv
-from fastapi import FastAPI, Query, Response, HTTPException
+from fastapi import FastAPI, Query, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import openai
-from elevenlabs.client import ElevenLabs
-from konlpy.tag import Okt
+from clients import http_clients
+from llm import chat_completion
+from rate_limit import parse_retry_after, rate_limits
+from summaries import SummaryStore
+from tokenizer import NounExtractor
+from tts import AudioCache
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    AUDIO_DIR.mkdir(exist_ok=True, parents=True)
+    await asyncio.to_thread(audio_cache.load)
+    summary_store.start()
+    await http_clients.startup()
+    try:
+        await noun_extractor.warmup()
+    except Exception as e:
+        print(f"Okt 워밍업 실패: {e}")
+    yield
+    await http_clients.shutdown()
+    noun_extractor.shutdown()
+    await summary_store.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -26,50 +48,66 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID")
 NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET")
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
+SUMMARY_CONCURRENCY = max(1, int(os.getenv("SUMMARY_CONCURRENCY", "5")))
 
 openai.api_key = OPENAI_API_KEY
-client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
-okt = Okt()
+elevenlabs_client = None
+noun_extractor = NounExtractor()
 
+# 예전 .txt 요약 파일 디렉토리는 읽기 전용 폴백으로만 사용
 SUMMARY_DIR = Path("summaries")
-SUMMARY_DIR.mkdir(exist_ok=True, parents=True)
+summary_store = SummaryStore(
+    os.getenv("SUMMARY_DB_PATH", "summaries.db"),
+    legacy_dir=SUMMARY_DIR,
+    retention=float(os.getenv("SUMMARY_RETENTION", str(7 * 24 * 3600))),
+    max_entries=int(os.getenv("SUMMARY_MAX_ENTRIES", "100000")),
+)
+AUDIO_DIR = Path("audio_summaries")
+audio_cache = AudioCache(
+    AUDIO_DIR, max_bytes=int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+)
+
+def get_elevenlabs_client():
+    # ElevenLabs SDK는 import/생성 비용이 있어 /tts 첫 호출 때 생성
+    global elevenlabs_client
+    if elevenlabs_client is None:
+        from elevenlabs.client import AsyncElevenLabs
+        elevenlabs_client = AsyncElevenLabs(api_key=ELEVENLABS_API_KEY)
+    return elevenlabs_client
+
+def is_rate_limited(error: Exception) -> bool:
+    # ElevenLabs SDK의 ApiError(status_code=429). SDK를 지연 import하므로 속성으로 확인
+    return getattr(error, "status_code", None) == 429
 
 def strip_html_tags(text: str) -> str:
     return re.sub(r'<[^>]+>', '', text)
 
-def extract_nouns(query: str) -> str:
-    try:
-        nouns = okt.nouns(query)
-        filtered = list({noun for noun in nouns if len(noun) >= 2})
-        return ' '.join(filtered) if filtered else query
-    except Exception as e:
-        print(f"명사 추출 오류: {e}")
-        return query
+async def extract_nouns(query: str) -> str:
+    return await noun_extractor.extract(query)
 
 async def fetch_news(query: str, display: int = 2, sort: str = "sim") -> List[dict]:
-    url = f"https://openapi.naver.com/v1/search/news.json?query={query}&display={display}&sort={sort}"
+    params = {"query": query, "display": display, "sort": sort}
     headers = {
         "X-Naver-Client-Id": NAVER_CLIENT_ID,
         "X-Naver-Client-Secret": NAVER_CLIENT_SECRET,
     }
-    async with httpx.AsyncClient() as client_http:
-        resp = await client_http.get(url, headers=headers)
-        if resp.status_code != 200:
-            print(f"네이버 뉴스 API 오류: {resp.text}")
-            return []
-        data = resp.json()
-        return [
-            {
-                "title": strip_html_tags(html.unescape(item["title"])),
-                "description": html.unescape(item["description"]),
-                "url": item.get("originallink") or item["link"],
-            }
-            for item in data.get("items", [])
-        ]
+    resp = await http_clients.request("naver", "GET", "/v1/search/news.json", params=params, headers=headers)
+    if resp.status_code != 200:
+        print(f"네이버 뉴스 API 오류: {resp.text}")
+        return []
+    data = resp.json()
+    return [
+        {
+            "title": strip_html_tags(html.unescape(item["title"])),
+            "description": html.unescape(item["description"]),
+            "url": item.get("originallink") or item["link"],
+        }
+        for item in data.get("items", [])
+    ]
 
 async def summarize_with_openai(content: str, keyword: str) -> str:
     try:
-        response = await openai.ChatCompletion.acreate(
+        response = await chat_completion(
             model="gpt-3.5-turbo",
             messages=[
                 {
@@ -88,8 +126,32 @@ async def summarize_with_openai(content: str, keyword: str) -> str:
         summary = response["choices"][0]["message"]["content"]
         return strip_html_tags(summary)
     except Exception as e:
+        # 실패 문구가 요약으로 저장되지 않도록 호출 측(summarize_article)에서 실패로 처리
         print(f"OpenAI 요약 실패: {e}")
-        return "(요약 실패)"
+        raise
+
+async def summarize_article(article: dict, keyword: str, semaphore: asyncio.Semaphore) -> dict:
+    async with semaphore:
+        try:
+            summary = await summarize_with_openai(
+                article["description"] or article["title"], keyword
+            )
+            file_id = summary_store.put(
+                summary, keyword=keyword, url=article["url"], title=article["title"]
+            )
+            status = "ok"
+        except Exception as e:
+            print(f"기사 요약 처리 실패: {e}")
+            summary = "(요약 실패)"
+            file_id = None
+            status = "failed"
+    return {
+        "title": article["title"],
+        "url": article["url"],
+        "summary": summary,
+        "file_id": file_id,
+        "status": status
+    }
 
 @app.get("/summaries")
 async def summarize_news(
@@ -97,50 +159,90 @@ async def summarize_news(
     sort: str = Query("sim", enum=["sim", "date"]),
     smart_search: bool = True
 ):
-    search_query = extract_nouns(q) if smart_search else q
+    search_query = await extract_nouns(q) if smart_search else q
     articles = await fetch_news(search_query, 2, sort)
     if not articles:
         return []
-    results = []
-    for idx, article in enumerate(articles):
-        summary = await summarize_with_openai(
-            article["description"] or article["title"], q
-        )
-        file_id = f"{uuid.uuid4().hex}.txt"
-        filepath = SUMMARY_DIR / file_id
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(summary)
-        results.append({
-            "title": article["title"],
-            "url": article["url"],
-            "summary": summary,
-            "file_id": file_id
-        })
-    return results
+    semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+    return await asyncio.gather(
+        *(summarize_article(article, q, semaphore) for article in articles)
+    )
 
 @app.get("/tts")
 async def text_to_speech(
-    file_id: str = Query(..., description="summaries에서 받은 파일명"),
-    voice_id: str = Query("21m00Tcm4TlvDq8ikWAM")
+    file_id: str = Query(..., description="summaries에서 받은 file_id"),
+    voice_id: str = Query("21m00Tcm4TlvDq8ikWAM"),
+    stream: bool = Query(False, description="True면 합성되는 청크를 바로 전송")
 ):
-    filepath = SUMMARY_DIR / file_id
-    if not filepath.exists():
+    record = await summary_store.get(file_id)
+    if record is None:
         raise HTTPException(status_code=404, detail="File not found")
-    with open(filepath, "r", encoding="utf-8") as f:
-        text = f.read()
-    try:
-        audio = client.text_to_speech.convert(
-            voice_id=voice_id,
-            model_id="eleven_multilingual_v2",
-            text=text,
-            output_format="mp3_44100_128",
+    text = record["summary"]
+    model_id = "eleven_multilingual_v2"
+    output_format = "mp3_44100_128"
+
+    async def chunks():
+        # 합성이 끝날 때까지 ElevenLabs 동시 요청 한도의 자리를 차지
+        # 429는 limiter에 알려 한도를 줄이고, 아직 청크를 받기 전이면 백오프 후 재시도 (clients.stream과 같은 방식)
+        limiter = rate_limits.get("elevenlabs")
+        attempt = 0
+        while True:
+            started = False
+            try:
+                async with limiter.slot():
+                    async for chunk in get_elevenlabs_client().text_to_speech.stream(
+                        voice_id,
+                        model_id=model_id,
+                        text=text,
+                        output_format=output_format,
+                    ):
+                        started = True
+                        yield chunk
+                return
+            except Exception as e:
+                if not is_rate_limited(e):
+                    raise
+                retry_after = parse_retry_after(getattr(e, "headers", None))
+                limiter.on_throttle(retry_after)
+                delay = limiter.backoff_delay(attempt, retry_after)
+                if started or not limiter.should_retry(attempt, delay):
+                    raise
+                print(f"elevenlabs 속도 제한(429). {delay:.1f}초 후 재시도 ({attempt + 1}/{limiter.max_retries})")
+                limiter.retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    # 같은 텍스트 + 음성이면 저장된 MP3를 그대로 반환
+    cache_key = AudioCache.make_key(text, voice_id, model_id, output_format=output_format)
+    if stream:
+        # 청크가 생성되는 대로 전송하면서 캐시 파일에도 기록
+        audio = audio_cache.stream(cache_key, chunks)
+        # 첫 청크를 미리 받아 합성 오류는 응답 헤더를 보내기 전에 상태 코드로 돌려줌
+        try:
+            first_chunk = await audio.__anext__()
+        except StopAsyncIteration:
+            first_chunk = b""
+        except Exception as e:
+            print(f"TTS 스트리밍 변환 오류: {e}")
+            raise HTTPException(status_code=500, detail="TTS processing failed")
+
+        async def body():
+            yield first_chunk
+            async for chunk in audio:
+                yield chunk
+
+        return StreamingResponse(
+            body(),
+            media_type="audio/mpeg",
+            headers={"Content-Disposition": f"inline; filename={file_id}.mp3"}
         )
-        audio_bytes = b"".join(audio)
-        return Response(
-            content=audio_bytes,
+    try:
+        audio_file_path = await audio_cache.get_or_create(cache_key, chunks)
+        return FileResponse(
+            audio_file_path,
             media_type="audio/mpeg",
             headers={"Content-Disposition": f"inline; filename={file_id}.mp3"}
         )
     except Exception as e:
         print(f"TTS 변환 오류: {e}")
-        raise HTTPException(status_code=500, detail="TTS processing failed")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="TTS processing failed")
@@ -0,0 +1,238 @@
+import os
+import time
+import uuid
+import asyncio
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import metrics
+
+# (file_id, summary, keyword, url, title, created_at)
+SummaryRow = Tuple[str, str, Optional[str], Optional[str], Optional[str], float]
+
+
+class SummaryStore:
+    """
+    기사 요약을 SQLite(WAL)에 저장하고 file_id로 조회합니다. (summaries/ 디렉터리의 uuid .txt 파일 대체)
+
+    - put()은 메모리 대기열에 넣고 바로 file_id를 반환하며, 백그라운드 작업이 모아서 한 트랜잭션으로 기록합니다.
+      기록 전에도 get()은 대기열에서 찾아 반환합니다.
+    - retention보다 오래된 요약과 max_entries를 넘는 오래된 요약은 주기적으로 삭제합니다.
+    - 예전 방식의 .txt 파일(file_id가 .txt로 끝나는 값)은 legacy_dir에서 읽고, 보관 기간이 지나면 함께 정리합니다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        legacy_dir: Optional[Path] = None,
+        retention: float = 7 * 24 * 3600,
+        max_entries: int = 100000,
+        batch_size: int = 64,
+        flush_interval: float = 0.5,
+        evict_interval: float = 600,
+    ):
+        self.path = path
+        self.legacy_dir = legacy_dir
+        self.retention = retention
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.evict_interval = evict_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[str, SummaryRow] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._last_evicted = time.monotonic()
+        self.writes = 0
+        self.evicted = 0
+        self.hits = 0
+        self.legacy_hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "file_id TEXT PRIMARY KEY, "
+                "summary TEXT NOT NULL, "
+                "keyword TEXT, "
+                "url TEXT, "
+                "title TEXT, "
+                "created_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_summaries_created_at ON summaries (created_at)"
+            )
+        return self._conn
+
+    # --- 동기 함수 (스레드에서 실행) ---
+
+    def _write_rows(self, rows: List[SummaryRow]) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO summaries (file_id, summary, keyword, url, title, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+
+    def _read_row(self, file_id: str) -> Optional[SummaryRow]:
+        with self._lock:
+            return self._connect().execute(
+                "SELECT file_id, summary, keyword, url, title, created_at FROM summaries WHERE file_id = ?",
+                (file_id,),
+            ).fetchone()
+
+    def _read_legacy(self, file_id: str) -> Optional[SummaryRow]:
+        # 경로 조작 방지: 디렉터리 밖을 가리키는 이름은 무시
+        if self.legacy_dir is None or Path(file_id).name != file_id:
+            return None
+        filepath = self.legacy_dir / file_id
+        try:
+            with open(filepath, "r", encoding="utf-8") as f:
+                summary = f.read()
+            created_at = filepath.stat().st_mtime
+        except OSError:
+            return None
+        return file_id, summary, None, None, None, created_at
+
+    def _evict(self) -> int:
+        cutoff = time.time() - self.retention
+        with self._lock:
+            conn = self._connect()
+            removed = conn.execute("DELETE FROM summaries WHERE created_at < ?", (cutoff,)).rowcount
+            removed += conn.execute(
+                "DELETE FROM summaries WHERE file_id IN ("
+                "SELECT file_id FROM summaries ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+            conn.commit()
+        if self.legacy_dir is not None and self.legacy_dir.is_dir():
+            with os.scandir(self.legacy_dir) as entries:
+                for entry in entries:
+                    try:
+                        if entry.name.endswith(".txt") and entry.stat().st_mtime < cutoff:
+                            os.unlink(entry.path)
+                            removed += 1
+                    except OSError:
+                        continue
+        return removed
+
+    # --- 비동기 API ---
+
+    def _ensure_writer(self) -> None:
+        if self._writer is None or self._writer.done():
+            self._wakeup = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._writer = asyncio.create_task(self._write_loop())
+
+    async def _write_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+            if time.monotonic() - self._last_evicted >= self.evict_interval:
+                self._last_evicted = time.monotonic()
+                try:
+                    self.evicted += await asyncio.to_thread(self._evict)
+                except (sqlite3.Error, OSError) as e:
+                    print(f"[ERROR] 요약 저장소 정리 오류: {e}")
+
+    async def flush(self) -> None:
+        """대기열의 요약을 한 트랜잭션으로 기록합니다."""
+        if not self._pending or self._flush_lock is None:
+            return
+        async with self._flush_lock:
+            rows = list(self._pending.values())
+            if not rows:
+                return
+            try:
+                with metrics.stage("summary_store_write"):
+                    await asyncio.to_thread(self._write_rows, rows)
+            except sqlite3.Error as e:
+                # 대기열에 남겨 두고 다음 주기에 다시 시도
+                print(f"[ERROR] 요약 저장소 기록 오류 ({len(rows)}건): {e}")
+                return
+            for row in rows:
+                self._pending.pop(row[0], None)
+            self.writes += len(rows)
+
+    def start(self) -> None:
+        self._ensure_writer()
+
+    def put(
+        self,
+        summary: str,
+        keyword: Optional[str] = None,
+        url: Optional[str] = None,
+        title: Optional[str] = None,
+    ) -> str:
+        """요약을 기록 대기열에 넣고 file_id를 반환합니다."""
+        self._ensure_writer()
+        file_id = uuid.uuid4().hex
+        self._pending[file_id] = (file_id, summary, keyword, url, title, time.time())
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        return file_id
+
+    async def get(self, file_id: str) -> Optional[dict]:
+        """file_id로 요약과 메타데이터를 조회합니다. 없거나 보관 기간이 지났으면 None"""
+        row = self._pending.get(file_id)
+        if row is None:
+            try:
+                row = await asyncio.to_thread(self._read_row, file_id)
+            except sqlite3.Error as e:
+                print(f"[ERROR] 요약 저장소 조회 오류 ({file_id}): {e}")
+                row = None
+            if row is None and file_id.endswith(".txt"):
+                row = await asyncio.to_thread(self._read_legacy, file_id)
+                if row is not None:
+                    self.legacy_hits += 1
+        if row is None or row[5] < time.time() - self.retention:
+            self.misses += 1
+            return None
+        self.hits += 1
+        file_id, summary, keyword, url, title, created_at = row
+        return {
+            "file_id": file_id,
+            "summary": summary,
+            "keyword": keyword,
+            "url": url,
+            "title": title,
+            "created_at": created_at,
+        }
+
+    def stats(self) -> dict:
+        return {
+            "writes": self.writes,
+            "pending": len(self._pending),
+            "evicted": self.evicted,
+            "hits": self.hits,
+            "legacy_hits": self.legacy_hits,
+            "misses": self.misses,
+        }
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        await self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,22 +1,41 @@
+from startup import StartupManager, lazy_import # import 시각 기록을 위해 가장 먼저 import
 import os
+import asyncio
 import html
 import httpx
 import re
-import uuid
-import requests
-import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
-from fastapi import FastAPI, Query, HTTPException, Body
+from fastapi import FastAPI, Query, HTTPException, Body, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles # StaticFiles 임포트
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-import openai
-from konlpy.tag import Okt
-from requests.exceptions import HTTPError, ConnectionError, Timeout
-import uvicorn # uvicorn 임포트 (if __name__ == "__main__": 블록에서 직접 실행 시 필요)
+from clients import http_clients
+from llm import chat_completion
+from rate_limit import rate_limits
+from cache import StaleWhileRevalidateCache, SummaryCache, make_cache_key
+from transcripts import TranscriptStore
+from summaries import SummaryStore
+from tokenizer import NounExtractor
+from tts import AudioCache
+from mapreduce import MapReduceSummarizer
+from batching import BatchSummarizer
+from dedup import NearDuplicateDetector
+from streaming import as_completed_indexed, event_stream_response
+from serialization import FastJSONResponse, parse_fields, project
+from compression import CompressionMiddleware
+import deadline
+from deadline import TIMED_OUT, DeadlineExceeded, DeadlineMiddleware
+from warmer import CacheWarmer
+from singleflight import SingleFlight
+from backends import create_backend
+import metrics
+from metrics import PROMETHEUS_CONTENT_TYPE, LoopLagMonitor, MetricsMiddleware
+
+# OpenAI SDK는 import 비용이 커서 처음 사용할 때(또는 백그라운드 초기화 시) 로딩
+openai = lazy_import("openai")
 
 
 # 환경변수 로드
@@ -31,20 +50,183 @@ NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET", "YOUR_NAVER_CLIENT_SECRET
 # ElevenLabs API 키 추가 (환경 변수에서 로드)
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY", "YOUR_ELEVENLABS_API_KEY")
 
-print(f"YOUTUBE_API_KEY loaded: {'Yes' if YOUTUBE_API_KEY != 'YOUR_YOUTUBE_API_KEY' else 'No (default)'}")
-print(f"SUPADATA_API_KEY loaded: {'Yes' if SUPADATA_API_KEY != 'YOUR_SUPADATA_API_KEY' else 'No (default)'}")
-print(f"OPENAI_API_KEY loaded: {'Yes' if OPENAI_API_KEY != 'YOUR_OPENAI_API_KEY' else 'No (default)'}")
-print(f"NAVER_CLIENT_ID loaded: {'Yes' if NAVER_CLIENT_ID != 'YOUR_NAVER_CLIENT_ID' else 'No (default)'}")
-print(f"NAVER_CLIENT_SECRET loaded: {'Yes' if NAVER_CLIENT_SECRET != 'YOUR_NAVER_CLIENT_SECRET' else 'No (default)'}")
-print(f"ELEVENLABS_API_KEY loaded: {'Yes' if ELEVENLABS_API_KEY != 'YOUR_ELEVENLABS_API_KEY' else 'No (default)'}")
+# 요청 전체 처리 시간 한도 (X-Request-Deadline-Ms 헤더나 deadline_ms 쿼리로 요청별 지정, 0이면 기본 한도 없음)
+# 한도가 지나면 남은 작업을 취소하고 그때까지 끝난 결과만 반환 (나머지는 status: timed_out)
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "55"))
+REQUEST_DEADLINE_MAX_SECONDS = float(os.getenv("REQUEST_DEADLINE_MAX_SECONDS", "120"))
+
+# 워커 프로세스 수 (uvicorn --workers 기본값)와 워커 간 공유 캐시/중복 제거 상태 저장소
+# memory:// (워커 1개), sqlite:///state.db (같은 호스트의 워커끼리), redis://host:6379/0 (여러 호스트)
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+STATE_BACKEND_URL = os.getenv("STATE_BACKEND_URL") or ("sqlite:///state.db" if WEB_CONCURRENCY > 1 else "memory://")
+
+# 기사별 요약(OpenAI 호출 + 파일 저장)을 동시에 처리할 최대 개수
+SUMMARY_CONCURRENCY = max(1, int(os.getenv("SUMMARY_CONCURRENCY", "5")))
+
+# OpenAI 요약 캐시 설정 (LLM_CACHE_DB_PATH를 지정하면 재시작 후에도 유지되는 디스크 캐시 사용)
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "3600"))
+LLM_CACHE_DB_PATH = os.getenv("LLM_CACHE_DB_PATH") or None
+
+# 시작 모드: eager(초기화 후 트래픽 수신) / background(즉시 수신, 백그라운드 초기화) / lazy(첫 사용 시 초기화)
+STARTUP_MODE = os.getenv("STARTUP_MODE", "eager")
+
+# 명사 추출(Okt) 메모 크기와 시작 시 JVM 워밍업 여부
+NOUN_MEMO_SIZE = int(os.getenv("NOUN_MEMO_SIZE", "2048"))
+OKT_WARMUP = os.getenv("OKT_WARMUP", "1") == "1"
+
+# 네이버 뉴스 검색 결과 캐시 (TTL 경과 후 NEWS_CACHE_STALE_TTL 동안은 기존 값을 주고 백그라운드 갱신)
+NEWS_CACHE_TTL = float(os.getenv("NEWS_CACHE_TTL", "120"))
+NEWS_CACHE_STALE_TTL = float(os.getenv("NEWS_CACHE_STALE_TTL", "600"))
+NEWS_CACHE_MAX_ENTRIES = int(os.getenv("NEWS_CACHE_MAX_ENTRIES", "500"))
+
+# 유튜브 검색 결과 캐시 (검색 API 할당량이 작아 뉴스보다 길게 보관)
+YOUTUBE_CACHE_TTL = float(os.getenv("YOUTUBE_CACHE_TTL", "1800"))
+YOUTUBE_CACHE_STALE_TTL = float(os.getenv("YOUTUBE_CACHE_STALE_TTL", "3600"))
+YOUTUBE_CACHE_MAX_ENTRIES = int(os.getenv("YOUTUBE_CACHE_MAX_ENTRIES", "200"))
+
+# 캐시 워머: 설정한 검색어 + 최근 CACHE_WARM_MIN_COUNT회 이상 요청된 상위 CACHE_WARM_TOP_N개 검색어의
+# 검색 결과와 요약을 CACHE_WARM_INTERVAL초마다 미리 계산 (검색 캐시와 LLM 요약 캐시 모두 TTL의 CACHE_WARM_REFRESH_RATIO 시점부터 갱신)
+# 요청 횟수 집계는 CACHE_WARM_HALF_LIFE초마다 절반으로 줄어듦
+CACHE_WARM_ENABLED = os.getenv("CACHE_WARM_ENABLED", "1") == "1"
+CACHE_WARM_KEYWORDS = [k.strip() for k in os.getenv("CACHE_WARM_KEYWORDS", "카리나").split(",") if k.strip()]
+CACHE_WARM_TOP_N = int(os.getenv("CACHE_WARM_TOP_N", "10"))
+CACHE_WARM_MIN_COUNT = float(os.getenv("CACHE_WARM_MIN_COUNT", "2"))
+CACHE_WARM_INTERVAL = float(os.getenv("CACHE_WARM_INTERVAL", "60"))
+CACHE_WARM_REFRESH_RATIO = float(os.getenv("CACHE_WARM_REFRESH_RATIO", "0.8"))
+CACHE_WARM_HALF_LIFE = float(os.getenv("CACHE_WARM_HALF_LIFE", "3600"))
+
+# 유튜브 자막 저장소 (자막 없음 결과는 TRANSCRIPT_NEGATIVE_TTL 동안만 보관)
+TRANSCRIPT_DB_PATH = os.getenv("TRANSCRIPT_DB_PATH", "transcripts.db")
+TRANSCRIPT_TTL = float(os.getenv("TRANSCRIPT_TTL", str(30 * 24 * 3600)))
+TRANSCRIPT_NEGATIVE_TTL = float(os.getenv("TRANSCRIPT_NEGATIVE_TTL", str(6 * 3600)))
+
+# 기사 요약 저장소 (file_id로 조회, 보관 기간/최대 개수를 넘으면 오래된 것부터 삭제)
+SUMMARY_DB_PATH = os.getenv("SUMMARY_DB_PATH", "summaries.db")
+SUMMARY_RETENTION = float(os.getenv("SUMMARY_RETENTION", str(7 * 24 * 3600)))
+SUMMARY_MAX_ENTRIES = int(os.getenv("SUMMARY_MAX_ENTRIES", "100000"))
+
+# 음성 파일 디렉토리 용량 한도 (모든 워커의 파일 합계, 넘으면 가장 오래 재생되지 않은 파일부터 삭제, 0이면 무제한)
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+# 파일명이 내용 해시라 같은 URL의 내용은 바뀌지 않음. 브라우저는 만료 후 ETag로 재검증
+AUDIO_CACHE_CONTROL = os.getenv("AUDIO_CACHE_CONTROL", "public, max-age=86400")
+
+# 응답 압축 (Accept-Encoding에 따라 brotli/gzip, 본문이 이 크기(바이트) 미만이면 압축하지 않음, 0이면 사용 안 함)
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "6"))
+RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "4"))
+
+# 이벤트 루프 지연 측정 간격(초)
+METRICS_LOOP_LAG_INTERVAL = float(os.getenv("METRICS_LOOP_LAG_INTERVAL", "0.5"))
+
+OPENAI_MODEL = "gpt-3.5-turbo"
+
+# 긴 입력(유튜브 자막, 재요약 본문)은 자르지 않고 청크별로 동시에 요약한 뒤 한 번 더 요약
+MAPREDUCE_CHUNK_TOKENS = int(os.getenv("MAPREDUCE_CHUNK_TOKENS", "2000"))
+MAPREDUCE_CONCURRENCY = max(1, int(os.getenv("MAPREDUCE_CONCURRENCY", "4")))
+CHUNK_SUMMARY_TEMPERATURE = 0.2
+CHUNK_SUMMARY_MAX_TOKENS = 400
+
+# 네이버 뉴스 검색 결과 수 (거의 같은 기사는 한 번만 요약하므로 늘려도 요약 비용이 그만큼 늘지는 않음)
+NEWS_DISPLAY = min(100, max(1, int(os.getenv("NEWS_DISPLAY", "3"))))
+# 여러 매체가 옮겨 실은 같은 기사 판정 기준 (제목+설명 SimHash 유사도, 0이면 사용 안 함)
+NEWS_DEDUP_THRESHOLD = float(os.getenv("NEWS_DEDUP_THRESHOLD", "0.85"))
+
+# 검색된 기사 여러 건은 한 번의 호출로 요약 (설명 합계가 NEWS_BATCH_MAX_TOKENS 이하일 때, 0이면 기사별로 요약)
+NEWS_BATCH_MAX_TOKENS = int(os.getenv("NEWS_BATCH_MAX_TOKENS", "1500"))
+NEWS_BATCH_MIN_ITEMS = max(2, int(os.getenv("NEWS_BATCH_MIN_ITEMS", "2")))
+NEWS_BATCH_TOKENS_PER_ITEM = 500
+
+# 요약 프롬프트 템플릿 (캐시 키에도 포함되므로 문구를 바꾸면 기존 캐시는 자연히 무효화됨)
+NEWS_SUMMARY_PROMPT = (
+    "뉴스 기사를 한국어 존댓말로 매우 상세하고 깊이 있게 요약해 주세요. "
+    "반드시 '{keyword}'에 관한 핵심 내용을 포함해 3~4문장으로 작성해 주세요. "
+    "문체는 일관된 존댓말을 사용해 주세요."
+)
+NEWS_BATCH_PROMPT = (
+    "여러 뉴스 기사가 JSON으로 주어집니다. 각 기사를 다음 지시에 따라 서로 섞지 말고 따로 요약해 주세요.\n"
+    "지시: {instruction}\n"
+    '출력은 {{"summaries": [{{"id": 기사 id, "summary": "요약"}}]}} 형식의 JSON만 작성하고, '
+    "모든 기사 id에 대해 요약을 하나씩 포함해 주세요."
+)
+YOUTUBE_SYSTEM_PROMPT = "You are a helpful assistant that summarizes text in Korean."
+YOUTUBE_SUMMARY_PROMPT = (
+    "아래 유튜브 영상 자막 내용을 한국어로 1줄로 요약해줘.\n"
+    "자막:\n{text}"
+)
+ORIGINALS_SUMMARY_PROMPT = (
+    "다음 여러 뉴스 기사와 유튜브 영상 본문을 종합해 핵심 내용을 한국어로 상세하게 요약해 주세요. "
+    "각 줄은 핵심 내용을 담아야 하며, 불필요하게 문장을 늘리지 마세요."
+    "중복되는 내용은 한 번만 포함하고, 전체 흐름을 자연스럽게 정리하되, 반드시 15줄 이상으로 요약해 주세요."
+)
+CHUNK_SUMMARY_PROMPT = (
+    "다음은 긴 글의 일부입니다. 이 부분에 나오는 핵심 사실과 주장을 빠짐없이 한국어로 간결하게 요약해 주세요. "
+    "나중에 다른 부분의 요약과 합쳐지므로 서론이나 맺음말 없이 내용만 작성해 주세요."
+)
+
+def print_api_key_status() -> None:
+    print(f"YOUTUBE_API_KEY loaded: {'Yes' if YOUTUBE_API_KEY != 'YOUR_YOUTUBE_API_KEY' else 'No (default)'}")
+    print(f"SUPADATA_API_KEY loaded: {'Yes' if SUPADATA_API_KEY != 'YOUR_SUPADATA_API_KEY' else 'No (default)'}")
+    print(f"OPENAI_API_KEY loaded: {'Yes' if OPENAI_API_KEY != 'YOUR_OPENAI_API_KEY' else 'No (default)'}")
+    print(f"NAVER_CLIENT_ID loaded: {'Yes' if NAVER_CLIENT_ID != 'YOUR_NAVER_CLIENT_ID' else 'No (default)'}")
+    print(f"NAVER_CLIENT_SECRET loaded: {'Yes' if NAVER_CLIENT_SECRET != 'YOUR_NAVER_CLIENT_SECRET' else 'No (default)'}")
+    print(f"ELEVENLABS_API_KEY loaded: {'Yes' if ELEVENLABS_API_KEY != 'YOUR_ELEVENLABS_API_KEY' else 'No (default)'}")
+
+
+async def load_openai() -> None:
+    # 속성 접근으로 지연 import된 OpenAI SDK를 실제로 로딩
+    openai.api_key = OPENAI_API_KEY
+    openai.ChatCompletion
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    print_api_key_status()
+    AUDIO_DIR.mkdir(exist_ok=True, parents=True)
+    await asyncio.to_thread(audio_cache.load)
+    summary_store.start()
+    # STARTUP_MODE에 따라 커넥션 풀/워밍업, OpenAI SDK, JVM+Okt 초기화 시점이 달라짐
+    await startup_manager.start()
+    loop_lag_monitor.start()
+    if CACHE_WARM_ENABLED:
+        cache_warmer.start()
+    yield
+    await cache_warmer.stop()
+    await loop_lag_monitor.stop()
+    await startup_manager.stop()
+    await http_clients.shutdown()
+    noun_extractor.shutdown()
+    summary_cache.close()
+    transcript_store.close()
+    await state_backend.close()
+    await summary_store.close()
 
 
 app = FastAPI(
     title="통합 미디어 요약 API",
     description="뉴스 요약 + 유튜브 영상 요약 서비스",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # 응답 JSON은 orjson(설치된 경우)으로 직렬화
+    default_response_class=FastJSONResponse,
 )
 
+app.add_middleware(
+    DeadlineMiddleware,
+    default=REQUEST_DEADLINE_SECONDS or None,
+    maximum=REQUEST_DEADLINE_MAX_SECONDS or None,
+)
+
+# 압축 시간도 요청 처리 시간에 포함되도록 MetricsMiddleware 안쪽에 둠
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=RESPONSE_COMPRESSION_MIN_BYTES,
+    gzip_level=RESPONSE_GZIP_LEVEL,
+    brotli_quality=RESPONSE_BROTLI_QUALITY,
+)
+
+# 가장 바깥에서 요청 처리 시간을 측정
+app.add_middleware(MetricsMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -53,50 +235,155 @@ app.add_middleware(
 )
 
 openai.api_key = OPENAI_API_KEY
-okt = Okt()
+noun_extractor = NounExtractor(memo_size=NOUN_MEMO_SIZE)
+state_backend = create_backend(STATE_BACKEND_URL)
+summary_cache = SummaryCache(
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+    ttl=LLM_CACHE_TTL,
+    disk_path=LLM_CACHE_DB_PATH,
+    backend=state_backend,
+)
+news_cache = StaleWhileRevalidateCache(
+    ttl=NEWS_CACHE_TTL,
+    stale_ttl=NEWS_CACHE_STALE_TTL,
+    max_entries=NEWS_CACHE_MAX_ENTRIES,
+    backend=state_backend,
+    namespace="news",
+)
+def complete_result(value) -> bool:
+    """다른 워커에 넘겨줄 만한 결과인지 (실패(None)나 시간 초과·실패 항목이 섞인 부분 결과는 공유하지 않음)"""
+    if value is None:
+        return False
+    if isinstance(value, list):
+        return not any(isinstance(item, dict) and item.get("status") in ("timed_out", "failed") for item in value)
+    return True
 
+# 동시에 들어온 같은 요청(엔드포인트 결과, 검색, 요약, 음성 합성)을 하나의 계산으로 합침 (공유 백엔드면 워커 간에도)
+inflight = SingleFlight(
+    backend=state_backend, lease=REQUEST_DEADLINE_MAX_SECONDS or 120, publishable=complete_result
+)
+youtube_cache = StaleWhileRevalidateCache(
+    ttl=YOUTUBE_CACHE_TTL,
+    stale_ttl=YOUTUBE_CACHE_STALE_TTL,
+    max_entries=YOUTUBE_CACHE_MAX_ENTRIES,
+    backend=state_backend,
+    namespace="youtube",
+)
+transcript_store = TranscriptStore(
+    TRANSCRIPT_DB_PATH,
+    ttl=TRANSCRIPT_TTL,
+    negative_ttl=TRANSCRIPT_NEGATIVE_TTL,
+)
+# 예전 버전이 요약을 .txt 파일로 저장하던 디렉토리 (읽기 전용 폴백, 보관 기간이 지나면 정리)
 SUMMARY_DIR = Path("summaries")
-SUMMARY_DIR.mkdir(exist_ok=True, parents=True)
+summary_store = SummaryStore(
+    SUMMARY_DB_PATH,
+    legacy_dir=SUMMARY_DIR,
+    retention=SUMMARY_RETENTION,
+    max_entries=SUMMARY_MAX_ENTRIES,
+)
+long_text_summarizer = MapReduceSummarizer(
+    chunk_tokens=MAPREDUCE_CHUNK_TOKENS,
+    max_concurrency=MAPREDUCE_CONCURRENCY,
+)
+news_deduper = NearDuplicateDetector(NEWS_DEDUP_THRESHOLD)
+news_batcher = BatchSummarizer(
+    max_input_tokens=NEWS_BATCH_MAX_TOKENS,
+    min_items=NEWS_BATCH_MIN_ITEMS,
+    output_tokens_per_item=NEWS_BATCH_TOKENS_PER_ITEM,
+)
 
-# 음성 파일을 저장할 디렉토리 생성
+startup_manager = StartupManager(STARTUP_MODE)
+startup_manager.register("http_clients", http_clients.startup)
+startup_manager.register("openai", load_openai)
+if OKT_WARMUP:
+    # JVM 기동과 Okt 첫 호출 비용을 첫 요청 대신 시작 시점에 치름
+    startup_manager.register("okt", noun_extractor.warmup)
+
+# 음성 파일을 저장할 디렉토리 (lifespan 시작 시 생성)
 AUDIO_DIR = Path("audio_summaries")
-AUDIO_DIR.mkdir(exist_ok=True, parents=True)
 
-# FastAPI 정적 파일 서빙 설정 (오디오 파일 접근을 위해 필요)
-app.mount("/audio", StaticFiles(directory=AUDIO_DIR), name="audio")
+# 같은 텍스트/음성 설정의 합성 결과를 재사용하는 오디오 캐시 (공유 백엔드면 같은 호스트의 워커 간에도 합성 1회)
+audio_cache = AudioCache(
+    AUDIO_DIR, max_bytes=AUDIO_CACHE_MAX_BYTES, backend=state_backend, lease=REQUEST_DEADLINE_MAX_SECONDS or 120
+)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match는 약한 비교: W/ 접두어는 무시
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+@app.api_route("/audio/{filename}", methods=["GET", "HEAD"])
+async def serve_audio(filename: str, request: Request):
+    """
+    저장된 음성 파일 제공. Range 요청(탐색)과 If-None-Match 재검증(304)을 지원합니다.
+    """
+    path = await audio_cache.lookup(filename)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+    # 파일명 자체가 내용 해시이므로 그대로 ETag로 사용
+    etag = f'"{path.stem}"'
+    headers = {"ETag": etag, "Cache-Control": AUDIO_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type="audio/mpeg", headers=headers)
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+@app.get("/ready")
+async def ready():
+    status = startup_manager.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
 
 
 def strip_html_tags(text: str) -> str:
     return re.sub(r'<[^>]+>', '', text)
 
-def extract_nouns(query: str) -> str:
-    try:
-        nouns = okt.nouns(query)
-        filtered = list({noun for noun in nouns if len(noun) >= 2})
-        return ' '.join(filtered) if filtered else query
-    except Exception as e:
-        print(f"[ERROR] 명사 추출 오류: {e}")
-        return query
+async def extract_nouns(query: str) -> str:
+    # Okt 호출은 전용 스레드에서 실행되어 이벤트 루프를 막지 않음
+    return await noun_extractor.extract(query)
+
+def canonical_query(query: str) -> str:
+    return ' '.join(query.split())
+
+def news_cache_key(query: str, display: int, sort: str) -> str:
+    return make_cache_key(query=query, display=display, sort=sort)
 
 async def fetch_news(query: str, display: int = 3, sort: str = "sim") -> List[dict]:
-    url = f"https://openapi.naver.com/v1/search/news.json?query={query}&display={display}&sort={sort}"
+    """정규화한 검색어 + sort + display 기준으로 캐시된 네이버 검색 결과를 반환합니다."""
+    query = canonical_query(query)
+    cache_key = news_cache_key(query, display, sort)
+    return await news_cache.get_or_fetch(
+        cache_key, lambda: inflight.do(cache_key, lambda: search_naver_news(query, display, sort))
+    )
+
+async def search_naver_news(query: str, display: int = 3, sort: str = "sim") -> List[dict]:
+    params = {"query": query, "display": display, "sort": sort}
     headers = {
         "X-Naver-Client-Id": NAVER_CLIENT_ID,
         "X-Naver-Client-Secret": NAVER_CLIENT_SECRET,
     }
     try:
-        async with httpx.AsyncClient() as client_http:
-            resp = await client_http.get(url, headers=headers, timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-            return [
-                {
-                    "title": strip_html_tags(html.unescape(item["title"])),
-                    "description": html.unescape(item["description"]),
-                    "url": item.get("originallink") or item["link"],
-                }
-                for item in data.get("items", [])
-            ]
+        resp = await http_clients.request(
+            "naver", "GET", "/v1/search/news.json", params=params, headers=headers, timeout=10
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        return [
+            {
+                "title": strip_html_tags(html.unescape(item["title"])),
+                "description": html.unescape(item["description"]),
+                "url": item.get("originallink") or item["link"],
+            }
+            for item in data.get("items", [])
+        ]
     except httpx.HTTPStatusError as e:
         print(f"[ERROR] 네이버 뉴스 API HTTP 상태 오류: {e.response.status_code} - {e.response.text}")
         return []
@@ -107,65 +394,247 @@ async def fetch_news(query: str, display: int = 3, sort: str = "sim") -> List[di
         print(f"[ERROR] 네이버 뉴스 API 호출 중 예기치 않은 오류: {e}")
         return []
 
-async def summarize_with_openai(content: str, keyword: str) -> str:
+class SummaryFailed(Exception):
+    """OpenAI 요약 실패. 메시지는 실패 항목의 summary로 보여 주며 캐시/요약 저장소에는 남기지 않습니다."""
+
+NEWS_SUMMARY_TEMPERATURE = 0.3
+
+def article_content(article: dict) -> str:
+    return article["description"] or article["title"]
+
+def news_summary_cache_key(content: str, keyword: str) -> str:
+    return make_cache_key(
+        text=content, keyword=keyword, model=OPENAI_MODEL,
+        prompt=NEWS_SUMMARY_PROMPT, temperature=NEWS_SUMMARY_TEMPERATURE,
+    )
+
+async def summarize_with_openai(content: str, keyword: str, refresh: bool = False) -> str:
+    """refresh=True면 캐시에 있어도 새로 요약해 저장합니다. (캐시 워머용)"""
+    temperature = NEWS_SUMMARY_TEMPERATURE
+    cache_key = news_summary_cache_key(content, keyword)
+    cached = None if refresh else await summary_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    return await inflight.do(
+        cache_key, lambda: request_news_summary(content, keyword, temperature, cache_key)
+    )
+
+async def request_news_summary(content: str, keyword: str, temperature: float, cache_key: str) -> str:
     try:
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-3.5-turbo",
+        response = await chat_completion(
+            model=OPENAI_MODEL,
             messages=[
                 {
                     "role": "system",
-                    "content": (
-                        "뉴스 기사를 한국어 존댓말로 매우 상세하고 깊이 있게 요약해 주세요. "
-                        f"반드시 '{keyword}'에 관한 핵심 내용을 포함해 3~4문장으로 작성해 주세요. "
-                        "문체는 일관된 존댓말을 사용해 주세요."
-                    ),
+                    "content": NEWS_SUMMARY_PROMPT.format(keyword=keyword),
                 },
                 {"role": "user", "content": content},
             ],
-            temperature=0.3,
+            temperature=temperature,
             max_tokens=800,
         )
-        summary = response.choices[0].message['content']
-        return strip_html_tags(summary)
+        summary = strip_html_tags(response.choices[0].message['content'])
+        await summary_cache.set(cache_key, summary)
+        return summary
     except openai.error.AuthenticationError as e:
         print(f"[ERROR] OpenAI 인증 오류: {e}")
-        return "(OpenAI 인증 실패)"
+        raise SummaryFailed("(OpenAI 인증 실패)") from e
     except openai.error.OpenAIError as e:
         print(f"[ERROR] OpenAI API 오류: {e}")
-        return "(OpenAI API 오류)"
+        raise SummaryFailed("(OpenAI API 오류)") from e
     except Exception as e:
         print(f"[ERROR] OpenAI 요약 실패 (예기치 않은 오류): {e}")
-        return "(요약 실패)"
+        raise SummaryFailed("(요약 실패)") from e
+
+async def summarize_articles_batched(articles: List[dict], keyword: str, refresh: bool = False) -> Dict[int, str]:
+    """
+    기사 여러 건을 한 번의 OpenAI 호출로 요약합니다. 반환값은 {기사 순서: 요약}이며 캐시에 있던 요약도 포함합니다.
+    묶을 조건이 안 되거나(기사 수, 입력 크기) 응답을 해석하지 못한 기사는 빠지므로 호출 측에서 기사별로 요약합니다.
+    refresh=True면 캐시를 보지 않고 모두 새로 요약합니다. (캐시 워머용)
+    """
+    contents = [article_content(article) for article in articles]
+    keys = [news_summary_cache_key(content, keyword) for content in contents]
+    summaries: Dict[int, str] = {}
+    for index, key in enumerate(keys):
+        cached = None if refresh else await summary_cache.get(key)
+        if cached is not None:
+            summaries[index] = cached
+    pending = [index for index in range(len(articles)) if index not in summaries]
+    if not news_batcher.should_batch([contents[index] for index in pending]):
+        return summaries
+    try:
+        batch = await deadline.run(inflight.do(
+            make_cache_key(endpoint="news/batch", items=[keys[index] for index in pending]),
+            lambda: request_news_batch_summary(
+                [contents[index] for index in pending], [keys[index] for index in pending], keyword
+            )
+        ))
+    except DeadlineExceeded:
+        return summaries
+    except Exception as e:
+        print(f"[WARNING] 기사 일괄 요약 실패, 기사별로 요약합니다: {e}")
+        return summaries
+    for index, summary in zip(pending, batch):
+        if summary is not None:
+            summaries[index] = summary
+    return summaries
+
+async def request_news_batch_summary(contents: List[str], cache_keys: List[str], keyword: str) -> List[Optional[str]]:
+    """
+    기사별 지시문(NEWS_SUMMARY_PROMPT)을 그대로 따르므로 결과는 기사별 요약과 같은 캐시 키로 저장합니다.
+    OpenAI 오류나 해석할 수 없는 응답은 예외로 올립니다.
+    """
+    try:
+        response = await chat_completion(
+            model=OPENAI_MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": NEWS_BATCH_PROMPT.format(
+                        instruction=NEWS_SUMMARY_PROMPT.format(keyword=keyword)
+                    ),
+                },
+                {"role": "user", "content": news_batcher.build_input(contents)},
+            ],
+            temperature=NEWS_SUMMARY_TEMPERATURE,
+            max_tokens=news_batcher.max_tokens(len(contents)),
+        )
+    except Exception:
+        news_batcher.failed(len(contents))
+        raise
+    summaries = news_batcher.parse(response.choices[0].message['content'], len(contents))
+    results: List[Optional[str]] = []
+    for summary, cache_key in zip(summaries, cache_keys):
+        if summary is not None:
+            summary = strip_html_tags(summary)
+            await summary_cache.set(cache_key, summary)
+        results.append(summary)
+    return results
+
+async def summarize_article(
+    article: dict, keyword: str, semaphore: asyncio.Semaphore, summary: Optional[str] = None
+) -> dict:
+    """
+    기사 한 건을 요약하고 요약 저장소에 기록합니다. 일괄 요약으로 이미 얻은 요약(summary)이 있으면 그대로 사용합니다.
+    실패하더라도 예외를 올리지 않고 해당 기사만 실패 결과로 반환합니다. (실패한 요약은 저장하지 않음)
+    """
+    async with semaphore:
+        try:
+            if summary is None:
+                summary = await summarize_with_openai(article_content(article), keyword)
+            # 저장은 백그라운드에서 모아서 기록되므로 바로 file_id를 받음
+            file_id = summary_store.put(
+                summary, keyword=keyword, url=article["url"], title=article["title"]
+            )
+            status = "ok"
+        except Exception as e:
+            print(f"[ERROR] 기사 요약 처리 실패 ({article.get('url')}): {e}")
+            summary = str(e) if isinstance(e, SummaryFailed) else "(요약 실패)"
+            file_id = None
+            status = "failed"
+    return article_result(article, summary, file_id, status)
+
+def article_result(
+    article: dict, summary: str, file_id: Optional[str], status: str, duplicate_of: Optional[int] = None
+) -> dict:
+    return {
+        "title": article["title"],
+        "url": article["url"],
+        "summary": summary,
+        "file_id": file_id,
+        "description": article["description"],
+        "status": status,
+        "duplicate_of": duplicate_of # 거의 같은 기사면 요약을 가져온 기사의 순서
+    }
+
+NEWS_FIELDS = ("title", "url", "summary", "file_id", "description", "status", "duplicate_of")
+FIELDS_QUERY_DESCRIPTION = "응답에 포함할 필드 (쉼표로 구분, 예: title,url,summary). 비우면 모든 필드"
+
+def requested_fields(fields: Optional[str], allowed) -> Optional[List[str]]:
+    try:
+        return parse_fields(fields, allowed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def find_duplicates(articles: List[dict]) -> List[int]:
+    """기사마다 대표 기사의 순서를 반환합니다. (대표 기사는 자기 자신)"""
+    return news_deduper.representatives(
+        [f"{article['title']} {article['description']}" for article in articles]
+    )
+
+def duplicate_result(article: dict, original: dict, original_index: int, keyword: str) -> dict:
+    """대표 기사의 요약을 그대로 쓰고, 제목/URL/요약 저장 기록은 중복 기사 자신의 것으로 채웁니다."""
+    file_id = None
+    if original["status"] == "ok":
+        file_id = summary_store.put(
+            original["summary"], keyword=keyword, url=article["url"], title=article["title"]
+        )
+    return article_result(article, original["summary"], file_id, original["status"], original_index)
+
+def article_or_timeout(article: dict, result) -> dict:
+    """요청 마감 시간까지 끝나지 않은 기사는 timed_out 상태로 채웁니다."""
+    if result is TIMED_OUT:
+        return article_result(article, "(시간 초과)", None, "timed_out")
+    return result
+
+async def find_articles(q: str, sort: str, smart_search: bool) -> List[dict]:
+    async def find():
+        search_query = await extract_nouns(q) if smart_search else q
+        return await fetch_news(search_query, NEWS_DISPLAY, sort)
+
+    try:
+        return await deadline.run(find())
+    except DeadlineExceeded:
+        raise HTTPException(status_code=504, detail="요청 처리 시간이 초과되었습니다. (뉴스 검색)")
+
+async def build_news_summaries(q: str, sort: str, smart_search: bool) -> List[dict]:
+    articles = await find_articles(q, sort, smart_search)
+    if not articles:
+        print("[WARNING] 뉴스 검색 결과가 없습니다.")
+        return []
+    # 거의 같은 기사는 대표 기사 하나만 요약
+    originals = find_duplicates(articles)
+    unique = [index for index, original in enumerate(originals) if original == index]
+    # 짧은 기사들은 한 번의 호출로 요약하고, 빠진 기사만 기사별로 동시에 요약
+    # (입력 순서를 유지하므로 네이버 검색 순서 그대로 반환)
+    # 요청 마감 시간이 지나면 남은 요약은 취소하고 끝난 것만 반환
+    batched = await summarize_articles_batched([articles[index] for index in unique], q)
+    semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+    results = await deadline.gather(
+        [summarize_article(articles[index], q, semaphore, batched.get(position)) for position, index in enumerate(unique)]
+    )
+    summarized = {
+        index: article_or_timeout(articles[index], result) for index, result in zip(unique, results)
+    }
+    return [
+        summarized[index] if original == index else duplicate_result(article, summarized[original], original, q)
+        for index, (article, original) in enumerate(zip(articles, originals))
+    ]
 
 @app.get("/news/summaries")
 async def summarize_news(
     q: str = Query("카리나", min_length=2, max_length=50),
     sort: str = Query("sim", enum=["sim", "date"]),
-    smart_search: bool = True
+    smart_search: bool = True,
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION)
 ):
+    names = requested_fields(fields, NEWS_FIELDS)
+    # 캐시 키, 인기 검색어 집계, 캐시 워밍이 모두 같은 검색어를 보도록 한 번만 정규화
+    q = canonical_query(q)
+    cache_warmer.observe("news", q)
     try:
-        search_query = extract_nouns(q) if smart_search else q
-        articles = await fetch_news(search_query, 3, sort)
-        if not articles:
-            print("[WARNING] 뉴스 검색 결과가 없습니다.")
-            return []
-        results = []
-        for article in articles:
-            summary = await summarize_with_openai(
-                article["description"] or article["title"], q
-            )
-            file_id = f"{uuid.uuid4().hex}.txt"
-            filepath = SUMMARY_DIR / file_id
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(summary)
-            results.append({
-                "title": article["title"],
-                "url": article["url"],
-                "summary": summary,
-                "file_id": file_id,
-                "description": article["description"]
-            })
-        return results
+        # 같은 검색어로 동시에 들어온 요청은 한 번만 계산하고 결과를 함께 받음
+        # (필드 선택은 공유 결과를 바꾸지 않도록 요청마다 따로 적용)
+        # 공유 작업은 요청 마감이 아닌 최대 마감까지 실행하고, 각 요청은 자기 마감까지만 기다림(넘으면 504)
+        results = await inflight.do(
+            make_cache_key(endpoint="news/summaries", q=q, sort=sort, smart_search=smart_search),
+            lambda: deadline.run_within(REQUEST_DEADLINE_MAX_SECONDS, build_news_summaries(q, sort, smart_search))
+        )
+        return FastJSONResponse([project(item, names) for item in results])
+    except HTTPException:
+        raise
+    except DeadlineExceeded:
+        raise HTTPException(status_code=504, detail="요청 처리 시간이 초과되었습니다. (뉴스 요약)")
     except Exception as e:
         print(f"[CRITICAL ERROR] /news/summaries 엔드포인트 처리 중 오류: {e}")
         raise HTTPException(
@@ -173,14 +642,66 @@ async def summarize_news(
             detail=f"서버 오류: 뉴스 요약 처리 중 문제가 발생했습니다. {str(e)}"
         )
 
+@app.get("/news/summaries/stream")
+async def stream_news_summaries(
+    q: str = Query("카리나", min_length=2, max_length=50),
+    sort: str = Query("sim", enum=["sim", "date"]),
+    smart_search: bool = True,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$"),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION)
+):
+    """
+    /news/summaries의 스트리밍 버전. 기사 요약이 끝나는 대로 하나씩 전송합니다.
+    이벤트: meta(count) → item(index, data) × N → done
+    """
+    names = requested_fields(fields, NEWS_FIELDS)
+    q = canonical_query(q)
+    cache_warmer.observe("news", q)
+    try:
+        articles = await find_articles(q, sort, smart_search)
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"[CRITICAL ERROR] /news/summaries/stream 엔드포인트 처리 중 오류: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"서버 오류: 뉴스 요약 처리 중 문제가 발생했습니다. {str(e)}"
+        )
+
+    async def events():
+        yield {"type": "meta", "count": len(articles)}
+        # 거의 같은 기사는 대표 기사 요약이 끝날 때 함께 전송
+        originals = find_duplicates(articles)
+        unique = [index for index, original in enumerate(originals) if original == index]
+        # /news/summaries와 같이 짧은 기사들은 한 번의 호출로 먼저 요약해 바로 보내고,
+        # 빠진 기사만 기사별로 요약하며 끝나는 대로 전송
+        batched = await summarize_articles_batched([articles[index] for index in unique], q)
+        semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+        async for position, item in as_completed_indexed(
+            [summarize_article(articles[index], q, semaphore, batched.get(position)) for position, index in enumerate(unique)],
+            timeout=deadline.remaining()
+        ):
+            index = unique[position]
+            data = article_or_timeout(articles[index], item)
+            yield {"type": "item", "index": index, "data": project(data, names)}
+            for duplicate, original in enumerate(originals):
+                if original == index and duplicate != index:
+                    copy = duplicate_result(articles[duplicate], data, index, q)
+                    yield {"type": "item", "index": duplicate, "data": project(copy, names)}
+        yield {"type": "done"}
+
+    return event_stream_response(events(), fmt)
+
 class VideoSummary(BaseModel):
     video_id: str
     title: str
     summary: str
     transcript: str = ""
+    status: str = "ok" # ok / failed / timed_out
+
+VIDEO_FIELDS = tuple(VideoSummary.model_fields)
 
-def search_youtube_videos(keyword: str) -> list:
-    url = "https://www.googleapis.com/youtube/v3/search"
+async def search_youtube_videos(keyword: str) -> list:
     params = {
         "part": "snippet",
         "q": keyword,
@@ -190,7 +711,7 @@ def search_youtube_videos(keyword: str) -> list:
         "order": "relevance"
     }
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = await http_clients.request("youtube", "GET", "/youtube/v3/search", params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
         return [
@@ -198,13 +719,13 @@ def search_youtube_videos(keyword: str) -> list:
             for item in data.get('items', [])
             if item['id'].get('videoId')
         ]
-    except HTTPError as e:
+    except httpx.HTTPStatusError as e:
         print(f"[ERROR] 유튜브 검색 HTTP 오류: {e.response.status_code} - {e.response.text}")
         raise HTTPException(
             status_code=400,
             detail=f"유튜브 검색 API 오류 (HTTP): {str(e.response.text)}"
         )
-    except (ConnectionError, Timeout) as e:
+    except httpx.RequestError as e:
         print(f"[ERROR] 유튜브 검색 네트워크/타임아웃 오류: {e}")
         raise HTTPException(
             status_code=500,
@@ -217,93 +738,143 @@ def search_youtube_videos(keyword: str) -> list:
             detail=f"유튜브 검색 API 오류: {str(e)}"
         )
 
-def get_auto_captions(video_id: str, retry_count: int = 3) -> str:
-    url = "https://api.supadata.ai/v1/youtube/transcript"
+async def get_auto_captions(video_id: str) -> str:
+    # 저장소에 있으면 SupaData를 호출하지 않음 (자막 없음 결과 포함)
+    stored = await transcript_store.get(video_id)
+    if stored is not None:
+        return stored[1]
+    transcript = await inflight.do(f"captions:{video_id}", lambda: fetch_auto_captions(video_id))
+    if transcript is None:
+        return "자막 추출 실패(429 Too Many Requests)"
+    await transcript_store.put(video_id, transcript)
+    return transcript
+
+async def fetch_auto_captions(video_id: str) -> Optional[str]:
+    """
+    SupaData에서 자막을 가져옵니다.
+    429는 공유 limiter가 백오프 후 재시도하며, 재시도를 모두 소진하면 None을 반환합니다.
+    """
     params = {"videoId": video_id}
     headers = {"x-api-key": SUPADATA_API_KEY}
-    for attempt in range(retry_count):
-        try:
-            response = requests.get(url, params=params, headers=headers, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            content = data.get("content", "")
-            if isinstance(content, list):
-                return " ".join([item.get('text', '') for item in content])
-            elif isinstance(content, str):
-                return content
+    try:
+        response = await http_clients.request(
+            "supadata", "GET", "/v1/youtube/transcript", params=params, headers=headers, timeout=30
+        )
+        response.raise_for_status()
+        data = response.json()
+        content = data.get("content", "")
+        if isinstance(content, list):
+            return " ".join([item.get('text', '') for item in content])
+        elif isinstance(content, str):
+            return content
+        return ""
+    except httpx.HTTPStatusError as e:
+        print(f"[ERROR] SupaData 자막 추출 HTTP 오류 ({video_id}): {e.response.status_code} - {e.response.text}")
+        if e.response.status_code == 429:
+            return None
+        elif e.response.status_code == 404:
+            # 자막이 없는 영상: 부정 결과로 저장되도록 빈 문자열 반환
             return ""
-        except HTTPError as e:
-            if hasattr(e.response, "status_code"):
-                print(f"[ERROR] SupaData 자막 추출 HTTP 오류 ({video_id}): {e.response.status_code} - {e.response.text}")
-            if e.response.status_code == 429:
-                wait_time = 2 ** (attempt + 1)
-                print(f"429 오류 발생. {wait_time}초 후 재시도...")
-                time.sleep(wait_time)
-                continue
-            elif e.response.status_code in [401, 403]:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"SupaData 자막 API 인증 오류 ({video_id}): {str(e.response.text)}"
-                )
-            else:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"SupaData 자막 추출 오류 ({video_id}): {str(e)}"
-                )
-        except (ConnectionError, Timeout) as e:
-            print(f"[ERROR] SupaData 자막 추출 네트워크/타임아웃 오류 ({video_id}): {e}")
+        elif e.response.status_code in [401, 403]:
             raise HTTPException(
                 status_code=500,
-                detail=f"SupaData 자막 추출 네트워크 오류 ({video_id}): {str(e)}"
+                detail=f"SupaData 자막 API 인증 오류 ({video_id}): {str(e.response.text)}"
             )
-        except Exception as e:
-            print(f"[ERROR] SupaData 자막 추출 중 예기치 않은 오류 ({video_id}): {e}")
+        else:
             raise HTTPException(
                 status_code=500,
-                detail=f"자막 추출 오류 ({video_id}): {str(e)}"
+                detail=f"SupaData 자막 추출 오류 ({video_id}): {str(e)}"
             )
-    return "자막 추출 실패(429 Too Many Requests)"
+    except httpx.RequestError as e:
+        print(f"[ERROR] SupaData 자막 추출 네트워크/타임아웃 오류 ({video_id}): {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"SupaData 자막 추출 네트워크 오류 ({video_id}): {str(e)}"
+        )
+    except Exception as e:
+        print(f"[ERROR] SupaData 자막 추출 중 예기치 않은 오류 ({video_id}): {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"자막 추출 오류 ({video_id}): {str(e)}"
+        )
+
+async def summarize_chunk(chunk: str) -> str:
+    """긴 입력의 청크 하나를 요약 (map 단계). 오류는 호출 측에서 처리합니다."""
+    cache_key = make_cache_key(
+        text=chunk, keyword=None, model=OPENAI_MODEL,
+        prompt=CHUNK_SUMMARY_PROMPT, temperature=CHUNK_SUMMARY_TEMPERATURE,
+    )
+    cached = await summary_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    response = await chat_completion(
+        model=OPENAI_MODEL,
+        messages=[
+            {"role": "system", "content": CHUNK_SUMMARY_PROMPT},
+            {"role": "user", "content": chunk}
+        ],
+        temperature=CHUNK_SUMMARY_TEMPERATURE,
+        max_tokens=CHUNK_SUMMARY_MAX_TOKENS
+    )
+    summary = response.choices[0].message['content'].strip()
+    if summary:
+        await summary_cache.set(cache_key, summary)
+    return summary
 
-def summarize_youtube_text(text: str) -> str:
+YOUTUBE_SUMMARY_TEMPERATURE = 0.3
+
+def youtube_summary_cache_key(text: str) -> str:
+    return make_cache_key(
+        text=text, keyword=None, model=OPENAI_MODEL,
+        prompt=YOUTUBE_SYSTEM_PROMPT + YOUTUBE_SUMMARY_PROMPT, temperature=YOUTUBE_SUMMARY_TEMPERATURE,
+        **long_text_summarizer.key_parts(text),
+    )
+
+async def summarize_youtube_text(text: str, refresh: bool = False) -> str:
+    """refresh=True면 캐시에 있어도 새로 요약해 저장합니다. (캐시 워머용)"""
     if not text or len(text.strip()) == 0:
         return "자막 내용 없음"
-    prompt = (
-        "아래 유튜브 영상 자막 내용을 한국어로 1줄로 요약해줘.\n"
-        "자막:\n" + text[:8000]
+    temperature = YOUTUBE_SUMMARY_TEMPERATURE
+    cache_key = youtube_summary_cache_key(text)
+    cached = None if refresh else await summary_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    return await inflight.do(
+        cache_key, lambda: request_youtube_summary(text, temperature, cache_key)
     )
+
+async def request_youtube_summary(text: str, temperature: float, cache_key: str) -> str:
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
+        reduce_input = await long_text_summarizer.condense(text, summarize_chunk)
+        response = await chat_completion(
+            model=OPENAI_MODEL,
             messages=[
-                {"role": "system", "content": "You are a helpful assistant that summarizes text in Korean."},
-                {"role": "user", "content": prompt}
+                {"role": "system", "content": YOUTUBE_SYSTEM_PROMPT},
+                {"role": "user", "content": YOUTUBE_SUMMARY_PROMPT.format(text=reduce_input)}
             ],
             max_tokens=500,
-            temperature=0.3
+            temperature=temperature
         )
-        return response.choices[0].message['content'].strip()
+        summary = response.choices[0].message['content'].strip()
+        await summary_cache.set(cache_key, summary)
+        return summary
     except openai.error.AuthenticationError as e:
         print(f"[ERROR] OpenAI 요약 (자막) 인증 오류: {e}")
-        return f"요약 오류: OpenAI 인증 실패"
+        raise SummaryFailed("요약 오류: OpenAI 인증 실패") from e
     except openai.error.OpenAIError as e:
         print(f"[ERROR] OpenAI 요약 (자막) API 오류: {e}")
-        return f"요약 오류: OpenAI API 문제"
+        raise SummaryFailed("요약 오류: OpenAI API 문제") from e
     except Exception as e:
         print(f"[ERROR] OpenAI 요약 (자막) 실패 (예기치 않은 오류): {e}")
-        return f"요약 오류: {str(e)}"
+        raise SummaryFailed(f"요약 오류: {str(e)}") from e
 
-# ElevenLabs 음성 합성 함수
-async def generate_audio_from_text(text: str, voice_id: str = "21m00Tcm4TlvDpxAtCSJ", stability: float = 0.5, clarity: float = 0.75) -> Optional[str]:
-    """
-    ElevenLabs API를 사용하여 텍스트를 오디오로 변환하고, 파일 경로를 반환합니다.
-    voice_id는 함수 호출 시 전달되는 값 또는 기본값 (Adam)을 사용합니다.
-    """
-    if not ELEVENLABS_API_KEY or ELEVENLABS_API_KEY == "YOUR_ELEVENLABS_API_KEY":
-        print("[ERROR] ElevenLabs API 키가 설정되지 않았습니다.")
-        return None
+# ElevenLabs 음성 합성
+ELEVENLABS_MODEL_ID = "eleven_multilingual_v2" # 한국어 지원 모델 사용
+DEFAULT_VOICE_ID = "21m00Tcm4TlvDpxAtCSJ"
 
-
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
+def elevenlabs_chunks(text: str, voice_id: str, stability: float, clarity: float):
+    """ElevenLabs 스트리밍 API에서 오디오 청크를 받는 비동기 제너레이터 함수를 반환합니다."""
+    url = f"/v1/text-to-speech/{voice_id}/stream"
     headers = {
         "xi-api-key": ELEVENLABS_API_KEY,
         "Content-Type": "application/json",
@@ -311,26 +882,54 @@ async def generate_audio_from_text(text: str, voice_id: str = "21m00Tcm4TlvDpxAt
     }
     data = {
         "text": text,
-        "model_id": "eleven_multilingual_v2", # 한국어 지원 모델 사용
+        "model_id": ELEVENLABS_MODEL_ID,
         "voice_settings": {
             "stability": stability,
             "similarity_boost": clarity
         }
     }
 
-    try:
-        async with httpx.AsyncClient(timeout=30) as client_http: # 타임아웃 추가
-            response = await client_http.post(url, headers=headers, json=data)
+    async def chunks():
+        async with http_clients.stream(
+            "elevenlabs", "POST", url, headers=headers, json=data, timeout=30
+        ) as response:
+            if response.is_error:
+                await response.aread() # 오류 메시지를 로그에 남기기 위해 본문을 읽음
             response.raise_for_status() # HTTP 오류가 발생하면 예외 발생
+            async for chunk in response.aiter_bytes():
+                yield chunk
 
-            audio_file_name = f"summary_{uuid.uuid4().hex}.mp3"
-            audio_file_path = AUDIO_DIR / audio_file_name
+    return chunks
 
-            with open(audio_file_path, "wb") as f:
-                f.write(response.content)
-            
-            # 클라이언트가 접근할 수 있는 URL 반환
-            return f"/audio/{audio_file_name}"
+def audio_cache_key(text: str, voice_id: str, stability: float, clarity: float) -> str:
+    return AudioCache.make_key(
+        text, voice_id, ELEVENLABS_MODEL_ID, stability=stability, clarity=clarity
+    )
+
+async def generate_audio_from_text(text: str, voice_id: str = DEFAULT_VOICE_ID, stability: float = 0.5, clarity: float = 0.75) -> Optional[str]:
+    """
+    ElevenLabs API를 사용하여 텍스트를 오디오로 변환하고, 파일 경로를 반환합니다.
+    voice_id는 함수 호출 시 전달되는 값 또는 기본값 (Adam)을 사용합니다.
+    """
+    if not ELEVENLABS_API_KEY or ELEVENLABS_API_KEY == "YOUR_ELEVENLABS_API_KEY":
+        print("[ERROR] ElevenLabs API 키가 설정되지 않았습니다.")
+        return None
+
+    try:
+        # 같은 입력이면 기존 파일을 바로 반환, 동시에 들어온 같은 요청은 합성 1회만 수행
+        # 오디오는 청크 단위로 파일에 기록되어 전체를 메모리에 올리지 않음
+        key = audio_cache_key(text, voice_id, stability, clarity)
+
+        async def synthesize() -> str:
+            path = await audio_cache.get_or_create(key, elevenlabs_chunks(text, voice_id, stability, clarity))
+            return path.name
+
+        # 다른 워커가 같은 입력을 합성 중이면 그 결과 파일을 사용
+        with metrics.stage("tts"):
+            filename = await inflight.do(f"tts:{key}", synthesize)
+
+        # 클라이언트가 접근할 수 있는 URL 반환
+        return f"/audio/{filename}"
     except httpx.HTTPStatusError as e:
         print(f"[ERROR] ElevenLabs API HTTP 오류: {e.response.status_code} - {e.response.text}")
         return None
@@ -341,42 +940,145 @@ async def generate_audio_from_text(text: str, voice_id: str = "21m00Tcm4TlvDpxAt
         print(f"[ERROR] ElevenLabs 음성 합성 중 예기치 않은 오류: {e}")
         return None
 
+class TTSRequest(BaseModel):
+    text: str
+    voice_id: str = DEFAULT_VOICE_ID
+    stability: float = 0.5
+    clarity: float = 0.75
+
+@app.post("/tts/stream")
+async def stream_tts(request: TTSRequest):
+    """
+    합성되는 오디오를 청크 단위(chunked transfer)로 바로 전송합니다.
+    동시에 같은 입력의 캐시 파일에도 기록되므로, 이후 요청은 저장된 파일을 받습니다.
+    """
+    if not ELEVENLABS_API_KEY or ELEVENLABS_API_KEY == "YOUR_ELEVENLABS_API_KEY":
+        raise HTTPException(status_code=500, detail="ElevenLabs API 키가 설정되지 않았습니다.")
+    if not request.text.strip():
+        raise HTTPException(status_code=400, detail="변환할 텍스트가 없습니다.")
+
+    key = audio_cache_key(request.text, request.voice_id, request.stability, request.clarity)
+    audio = audio_cache.stream(
+        key, elevenlabs_chunks(request.text, request.voice_id, request.stability, request.clarity)
+    )
+    # 첫 청크를 미리 받아 업스트림 오류는 응답 헤더를 보내기 전에 상태 코드로 돌려줌
+    try:
+        first_chunk = await audio.__anext__()
+    except StopAsyncIteration:
+        first_chunk = b""
+    except httpx.HTTPStatusError as e:
+        print(f"[ERROR] ElevenLabs API HTTP 오류: {e.response.status_code} - {e.response.text}")
+        raise HTTPException(status_code=502, detail="ElevenLabs 음성 합성 실패")
+    except Exception as e:
+        print(f"[ERROR] ElevenLabs 스트리밍 음성 합성 오류: {e}")
+        raise HTTPException(status_code=502, detail="ElevenLabs 음성 합성 실패")
+
+    async def body():
+        yield first_chunk
+        async for chunk in audio:
+            yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type="audio/mpeg",
+        headers={"Content-Disposition": f"inline; filename=tts_{key[:16]}.mp3"}
+    )
+
+
+async def summarize_video(video: dict, semaphore: asyncio.Semaphore) -> VideoSummary:
+    """영상 한 건의 자막 추출 → 요약. 실패는 해당 영상 결과로만 반환합니다."""
+    async with semaphore:
+        try:
+            transcript = await get_auto_captions(video['id'])
+            summary = await summarize_youtube_text(transcript) if transcript else "자막 없음"
+            return VideoSummary(
+                video_id=video['id'],
+                title=video['title'],
+                summary=summary,
+                transcript=transcript
+            )
+        except HTTPException as e:
+            print(f"[ERROR] 영상 {video['id']} 처리 실패: {e.detail}")
+            return VideoSummary(
+                video_id=video['id'],
+                title=video['title'],
+                summary=f"요약 불가: {e.detail[:50]}...",
+                transcript="",
+                status="failed"
+            )
+        except SummaryFailed as e:
+            return VideoSummary(
+                video_id=video['id'],
+                title=video['title'],
+                summary=str(e),
+                transcript=transcript,
+                status="failed"
+            )
+
+def video_or_timeout(video: dict, result) -> VideoSummary:
+    if result is TIMED_OUT:
+        return VideoSummary(
+            video_id=video['id'],
+            title=video['title'],
+            summary="(시간 초과)",
+            status="timed_out"
+        )
+    return result
+
+def youtube_cache_key(keyword: str) -> str:
+    return make_cache_key(query=canonical_query(keyword), source="youtube")
+
+async def fetch_videos(keyword: str) -> List[dict]:
+    """캐시된 유튜브 검색 결과를 반환합니다. (검색 실패는 캐시하지 않고 HTTPException 그대로 전달)"""
+    cache_key = youtube_cache_key(keyword)
+    return await youtube_cache.get_or_fetch(
+        cache_key, lambda: inflight.do(cache_key, lambda: search_youtube_videos(keyword))
+    )
+
+async def find_videos(keyword: str) -> List[dict]:
+    try:
+        videos = await deadline.run(fetch_videos(keyword))
+    except DeadlineExceeded:
+        raise HTTPException(status_code=504, detail="요청 처리 시간이 초과되었습니다. (유튜브 검색)")
+    if not videos:
+        print("[WARNING] 유튜브 검색 결과가 없습니다.")
+        raise HTTPException(
+            status_code=404,
+            detail="검색 결과가 없습니다."
+        )
+    return videos[:3]
+
+async def build_video_summaries(keyword: str) -> List[dict]:
+    videos = await find_videos(keyword)
+    # 영상별 자막 추출 + 요약을 동시에 실행 (검색 순서 유지, 마감 시간이 지나면 끝난 것만 반환)
+    semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+    results = await deadline.gather(
+        [summarize_video(video, semaphore) for video in videos]
+    )
+    # 워커 간 공유 백엔드에 저장할 수 있도록 dict로 변환
+    return [video_or_timeout(video, result).model_dump() for video, result in zip(videos, results)]
 
 @app.get("/youtube-summaries", response_model=List[VideoSummary])
 async def summarize_videos(
-    keyword: str = Query(..., description="검색할 키워드 (예: 인공지능)")
+    keyword: str = Query(..., description="검색할 키워드 (예: 인공지능)"),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION)
 ):
+    names = requested_fields(fields, VIDEO_FIELDS)
+    keyword = canonical_query(keyword)
+    cache_warmer.observe("youtube", keyword)
     try:
-        videos = search_youtube_videos(keyword)
-        if not videos:
-            print("[WARNING] 유튜브 검색 결과가 없습니다.")
-            raise HTTPException(
-                status_code=404,
-                detail="검색 결과가 없습니다."
-            )
-        results = []
-        for video in videos[:3]:
-            try:
-                transcript = get_auto_captions(video['id'])
-                summary = summarize_youtube_text(transcript) if transcript else "자막 없음"
-                results.append(VideoSummary(
-                    video_id=video['id'],
-                    title=video['title'],
-                    summary=summary,
-                    transcript=transcript
-                ))
-            except HTTPException as e:
-                print(f"[ERROR] 영상 {video['id']} 처리 실패: {e.detail}")
-                results.append(VideoSummary(
-                    video_id=video['id'],
-                    title=video['title'],
-                    summary=f"요약 불가: {e.detail[:50]}...",
-                    transcript=""
-                ))
-        return results
+        # 같은 키워드의 요청은 한 번만 계산 (/news/summaries와 같은 방식)
+        results = await inflight.do(
+            make_cache_key(endpoint="youtube-summaries", keyword=keyword),
+            lambda: deadline.run_within(REQUEST_DEADLINE_MAX_SECONDS, build_video_summaries(keyword))
+        )
+        # 결과는 이미 VideoSummary에서 만든 dict이므로 response_model 재검증 없이 바로 직렬화
+        return FastJSONResponse([project(item, names) for item in results])
     except HTTPException as he:
         print(f"[CRITICAL ERROR] /youtube-summaries 엔드포인트에서 HTTPException 발생: {he.detail}")
         raise he
+    except DeadlineExceeded:
+        raise HTTPException(status_code=504, detail="요청 처리 시간이 초과되었습니다. (유튜브 요약)")
     except Exception as e:
         print(f"[CRITICAL ERROR] /youtube-summaries 엔드포인트 처리 중 예기치 않은 오류: {e}")
         raise HTTPException(
@@ -384,6 +1086,86 @@ async def summarize_videos(
             detail=f"서버 오류: 유튜브 요약 처리 중 문제가 발생했습니다. {str(e)}"
         )
 
+@app.get("/youtube-summaries/stream")
+async def stream_video_summaries(
+    keyword: str = Query(..., description="검색할 키워드 (예: 인공지능)"),
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$"),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION)
+):
+    """
+    /youtube-summaries의 스트리밍 버전. 영상 요약이 끝나는 대로 하나씩 전송합니다.
+    이벤트: meta(count) → item(index, data) × N → done
+    """
+    names = requested_fields(fields, VIDEO_FIELDS)
+    keyword = canonical_query(keyword)
+    cache_warmer.observe("youtube", keyword)
+    try:
+        videos = await find_videos(keyword)
+    except HTTPException as he:
+        print(f"[CRITICAL ERROR] /youtube-summaries/stream 엔드포인트에서 HTTPException 발생: {he.detail}")
+        raise he
+
+    async def events():
+        yield {"type": "meta", "count": len(videos)}
+        semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+        async for index, item in as_completed_indexed(
+            [summarize_video(video, semaphore) for video in videos],
+            timeout=deadline.remaining()
+        ):
+            yield {"type": "item", "index": index, "data": project(video_or_timeout(videos[index], item).model_dump(), names)}
+        yield {"type": "done"}
+
+    return event_stream_response(events(), fmt)
+
+ORIGINALS_TEMPERATURE = 0.2
+ORIGINALS_VOICE_ID = "fLvpMIGwcTmxzsUF4z1U" # 'Bella' 음성 ID
+
+def build_originals_text(originals_list: List[str]) -> str:
+    return "\n\n".join(originals_list)
+
+def originals_cache_key(combined_text: str) -> str:
+    return make_cache_key(
+        text=combined_text, keyword=None, model=OPENAI_MODEL,
+        prompt=ORIGINALS_SUMMARY_PROMPT, temperature=ORIGINALS_TEMPERATURE,
+        **long_text_summarizer.key_parts(combined_text),
+    )
+
+def originals_messages(combined_text: str) -> List[dict]:
+    return [
+        {"role": "system", "content": ORIGINALS_SUMMARY_PROMPT},
+        {"role": "user", "content": combined_text}
+    ]
+
+async def create_originals_summary(combined_text: str) -> str:
+    cache_key = originals_cache_key(combined_text)
+    summary = await summary_cache.get(cache_key)
+    if summary is None:
+        reduce_input = await long_text_summarizer.condense(combined_text, summarize_chunk)
+        response = await chat_completion(
+            model=OPENAI_MODEL,
+            messages=originals_messages(reduce_input),
+            temperature=ORIGINALS_TEMPERATURE,
+            max_tokens=3000
+        )
+        summary = response.choices[0].message['content']
+        if summary:
+            await summary_cache.set(cache_key, summary)
+    return summary
+
+async def originals_audio(summary: str) -> Optional[str]:
+    """
+    요약 음성 생성. 요청 마감 시간이 지나면 기다리지 않고 None을 반환합니다.
+    (합성 자체는 캐시를 위해 계속 진행되어 다음 요청에서 바로 재사용됨)
+    """
+    try:
+        audio_url = await deadline.run(generate_audio_from_text(summary, voice_id=ORIGINALS_VOICE_ID))
+    except DeadlineExceeded:
+        print("[WARNING] 요청 마감 시간 초과로 음성 없이 요약만 반환합니다.")
+        return None
+    if not audio_url:
+        print("[WARNING] ElevenLabs 음성 생성에 실패했습니다.")
+    return audio_url
+
 @app.post("/summarize-originals")
 async def summarize_originals(originals: dict = Body(...)):
     """
@@ -392,52 +1174,248 @@ async def summarize_originals(originals: dict = Body(...)):
     originals_list = originals.get("originals", [])
     if not originals_list:
         return {"summary": "선택된 본문이 없습니다.", "audio_url": None} # audio_url 추가
-    combined_text = "\n\n".join(originals_list)
     
     summary = ""
     audio_url = None
 
     try:
-        if len(combined_text) > 3500:
-            combined_text = combined_text[:3500] + "... [중략]"
-        
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "다음 여러 뉴스 기사와 유튜브 영상 본문을 종합해 핵심 내용을 한국어로 상세하게 요약해 주세요. "
-                        "각 줄은 핵심 내용을 담아야 하며, 불필요하게 문장을 늘리지 마세요."
-                        "중복되는 내용은 한 번만 포함하고, 전체 흐름을 자연스럽게 정리하되, 반드시 15줄 이상으로 요약해 주세요."
-                    )
-                },
-                {"role": "user", "content": combined_text}
-            ],
-            temperature=0.2,
-            max_tokens=3000
-        )
-        summary = response.choices[0].message['content']
+        combined_text = build_originals_text(originals_list)
+        summary = await deadline.run(create_originals_summary(combined_text))
 
         if summary:
-            # 이 부분을 직접 Voice ID로 교체합니다.
-            korean_voice_id = "fLvpMIGwcTmxzsUF4z1U" # 직접 'Bella' 음성 ID 삽입
-            audio_url = await generate_audio_from_text(summary, voice_id=korean_voice_id)
-            if not audio_url:
-                print("[WARNING] ElevenLabs 음성 생성에 실패했습니다.")
-
+            audio_url = await originals_audio(summary)
+        # 음성까지 마감 시간 안에 끝나지 못했으면 요약만 반환 (timed_out)
+        status = "timed_out" if summary and not audio_url and deadline.expired() else "ok"
 
-        return {"summary": summary, "audio_url": audio_url}
+        return {"summary": summary, "audio_url": audio_url, "status": status}
 
+    except DeadlineExceeded:
+        print("[WARNING] /summarize-originals 요청 마감 시간 초과")
+        return {"summary": "재요약 실패: 처리 시간 초과", "audio_url": None, "status": "timed_out"}
     except openai.error.AuthenticationError as e:
         print(f"[ERROR] 재요약 OpenAI 인증 오류: {e}")
-        return {"summary": f"재요약 실패: OpenAI 인증 문제 - {e}", "audio_url": None}
+        return {"summary": f"재요약 실패: OpenAI 인증 문제 - {e}", "audio_url": None, "status": "failed"}
     except openai.error.OpenAIError as e:
         print(f"[ERROR] 재요약 OpenAI API 오류: {e}")
-        return {"summary": f"재요약 실패: OpenAI API 문제 - {e}", "audio_url": None}
+        return {"summary": f"재요약 실패: OpenAI API 문제 - {e}", "audio_url": None, "status": "failed"}
     except Exception as e:
         print(f"[CRITICAL ERROR] /summarize-originals 엔드포인트 처리 중 예기치 않은 오류: {e}")
-        return {"summary": f"재요약 실패: {str(e)}", "audio_url": None}
+        return {"summary": f"재요약 실패: {str(e)}", "audio_url": None, "status": "failed"}
+
+@app.post("/summarize-originals/stream")
+async def stream_summarize_originals(
+    originals: dict = Body(...),
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$")
+):
+    """
+    /summarize-originals의 스트리밍 버전. OpenAI 토큰을 받는 대로 전송합니다.
+    이벤트: token(content) × N → summary(summary) → done(summary, audio_url, status) / 실패 시 error(detail, status)
+    """
+    originals_list = originals.get("originals", [])
+
+    async def events():
+        if not originals_list:
+            yield {"type": "done", "summary": "선택된 본문이 없습니다.", "audio_url": None}
+            return
+        try:
+            combined_text = build_originals_text(originals_list)
+            cache_key = originals_cache_key(combined_text)
+            summary = await summary_cache.get(cache_key)
+            timed_out = False
+            if summary is not None:
+                yield {"type": "token", "content": summary}
+            else:
+                # map 단계는 한꺼번에 끝내고, 마지막 reduce 요약만 토큰 단위로 전송
+                reduce_input = await deadline.run(
+                    long_text_summarizer.condense(combined_text, summarize_chunk)
+                )
+                response = await deadline.run(chat_completion(
+                    model=OPENAI_MODEL,
+                    messages=originals_messages(reduce_input),
+                    temperature=ORIGINALS_TEMPERATURE,
+                    max_tokens=3000,
+                    stream=True
+                ))
+                parts = []
+                chunks = response.__aiter__()
+                while True:
+                    try:
+                        chunk = await deadline.run(chunks.__anext__())
+                    except StopAsyncIteration:
+                        break
+                    except DeadlineExceeded:
+                        # 마감 시간까지 받은 부분만 반환 (불완전한 요약은 캐시하지 않음)
+                        timed_out = True
+                        break
+                    content = chunk.choices[0].delta.get("content")
+                    if content:
+                        parts.append(content)
+                        yield {"type": "token", "content": content}
+                summary = "".join(parts)
+                if summary and not timed_out:
+                    await summary_cache.set(cache_key, summary)
+        except DeadlineExceeded:
+            print("[WARNING] /summarize-originals/stream 요청 마감 시간 초과")
+            yield {"type": "error", "detail": "재요약 실패: 처리 시간 초과", "status": "timed_out"}
+            return
+        except openai.error.OpenAIError as e:
+            print(f"[ERROR] 재요약 스트리밍 OpenAI API 오류: {e}")
+            yield {"type": "error", "detail": f"재요약 실패: OpenAI API 문제 - {e}", "status": "failed"}
+            return
+        except Exception as e:
+            print(f"[CRITICAL ERROR] /summarize-originals/stream 처리 중 예기치 않은 오류: {e}")
+            yield {"type": "error", "detail": f"재요약 실패: {str(e)}", "status": "failed"}
+            return
+
+        status = "timed_out" if timed_out else "ok"
+        yield {"type": "summary", "summary": summary, "status": status}
+        audio_url = None
+        if summary and not timed_out:
+            audio_url = await originals_audio(summary)
+            if not audio_url and deadline.expired():
+                status = "timed_out"
+        yield {"type": "done", "summary": summary, "audio_url": audio_url, "status": status}
+
+    return event_stream_response(events(), fmt)
+
+# 캐시 워밍
+def needs_warming(cache: StaleWhileRevalidateCache, key: str) -> bool:
+    """아직 없거나 TTL 만료가 가까운 항목만 갱신"""
+    age = cache.age(key)
+    return age is None or age >= cache.ttl * CACHE_WARM_REFRESH_RATIO
+
+async def summary_needs_warming(cache_key: str) -> bool:
+    """LLM 요약도 검색 캐시와 같은 비율로, 아직 없거나 TTL 만료가 가까운 것만 갱신"""
+    remaining = await summary_cache.expires_in(cache_key)
+    return remaining is None or remaining <= summary_cache.ttl * (1 - CACHE_WARM_REFRESH_RATIO)
+
+async def extract_warm_nouns(keywords: List[str]) -> None:
+    """이번 주기에 워밍할 뉴스 검색어의 명사를 한 번의 Okt 스레드 작업으로 추출해 메모에 올림"""
+    await noun_extractor.extract_many([canonical_query(keyword) for keyword in keywords])
+
+async def warm_news(keyword: str) -> None:
+    """/news/summaries 기본 옵션(smart_search, sort=sim)의 검색 결과와 기사 요약을 미리 계산"""
+    keyword = canonical_query(keyword)
+    query = canonical_query(await extract_nouns(keyword))
+    key = news_cache_key(query, NEWS_DISPLAY, "sim")
+    if needs_warming(news_cache, key):
+        articles = await news_cache.refresh(key, lambda: search_naver_news(query, NEWS_DISPLAY, "sim"))
+    else:
+        articles = news_cache.peek(key)
+    articles = articles or []
+    originals = find_duplicates(articles)
+    stale = []
+    for index, article in enumerate(articles):
+        if originals[index] == index and await summary_needs_warming(news_summary_cache_key(article_content(article), keyword)):
+            stale.append(article)
+    batched = await summarize_articles_batched(stale, keyword, refresh=True)
+    for index, article in enumerate(stale):
+        if index not in batched:
+            await summarize_with_openai(article_content(article), keyword, refresh=True)
+
+async def warm_youtube(keyword: str) -> None:
+    """/youtube-summaries의 검색 결과와 영상 요약을 미리 계산"""
+    keyword = canonical_query(keyword)
+    key = youtube_cache_key(keyword)
+    if needs_warming(youtube_cache, key):
+        videos = await youtube_cache.refresh(key, lambda: search_youtube_videos(keyword))
+    else:
+        videos = youtube_cache.peek(key)
+    for video in (videos or [])[:3]:
+        transcript = await get_auto_captions(video["id"])
+        if transcript and await summary_needs_warming(youtube_summary_cache_key(transcript)):
+            await summarize_youtube_text(transcript, refresh=True)
+
+# 사용자 요청이 상류 limiter를 쓰고 있으면 워밍을 미룸
+cache_warmer = CacheWarmer(
+    CACHE_WARM_KEYWORDS,
+    top_n=CACHE_WARM_TOP_N,
+    min_count=CACHE_WARM_MIN_COUNT,
+    interval=CACHE_WARM_INTERVAL,
+    half_life=CACHE_WARM_HALF_LIFE,
+    is_ready=lambda: startup_manager.ready,
+    is_busy=rate_limits.busy,
+    backend=state_backend,
+)
+cache_warmer.register("news", warm_news, prepare=extract_warm_nouns)
+cache_warmer.register("youtube", warm_youtube)
+
+# 지표
+loop_lag_monitor = LoopLagMonitor(METRICS_LOOP_LAG_INTERVAL)
+
+def cache_stats_by_name() -> dict:
+    nouns = noun_extractor.stats()
+    return {
+        "llm_summary": summary_cache.stats(),
+        "news_search": news_cache.stats(),
+        "youtube_search": youtube_cache.stats(),
+        "transcripts": transcript_store.stats(),
+        "summaries": summary_store.stats(),
+        "tts_audio": audio_cache.stats(),
+        "nouns": {"hits": nouns["memo_hits"], "misses": nouns["memo_misses"]},
+    }
+
+# 다른 구성 요소의 stats()는 /metrics 요청 시점에만 읽음
+for field, kind, help in [
+    ("hits", "counter", "캐시 적중 수"),
+    ("stale_hits", "counter", "만료 후 기존 값을 반환한 수 (백그라운드 갱신)"),
+    ("misses", "counter", "캐시 미스 수"),
+    ("hit_ratio", "gauge", "캐시 적중률"),
+]:
+    metrics.registry.callback(
+        f"actio_cache_{field}" + ("_total" if kind == "counter" else ""), help, kind,
+        lambda field=field: metrics.stats_samples(cache_stats_by_name(), field, "cache"),
+    )
+for field, kind, help in [
+    ("concurrency_limit", "gauge", "상류 제공자별 현재 동시 요청 한도 (AIMD)"),
+    ("inflight", "gauge", "상류 제공자별 진행 중인 요청 수"),
+    ("throttled", "counter", "상류 제공자별 속도 제한(429) 응답 수"),
+    ("retries", "counter", "상류 제공자별 재시도 수"),
+]:
+    metrics.registry.callback(
+        f"actio_rate_limit_{field}" + ("_total" if kind == "counter" else ""), help, kind,
+        lambda field=field: metrics.stats_samples(rate_limits.stats(), field, "provider"),
+    )
+metrics.registry.callback(
+    "actio_singleflight_coalesced_total", "진행 중인 같은 계산에 합쳐진 요청 수", "counter",
+    lambda: [({}, inflight.followers)],
+)
+metrics.registry.callback(
+    "actio_summary_store_pending", "기록 대기 중인 요약 수", "gauge",
+    lambda: [({}, summary_store.stats()["pending"])],
+)
+metrics.registry.callback(
+    "actio_audio_cache_bytes", "음성 파일 디렉터리 사용량", "gauge",
+    lambda: [({}, audio_cache.stats()["bytes"])],
+)
+metrics.registry.callback(
+    "actio_event_loop_lag_last_seconds", "가장 최근에 측정한 이벤트 루프 지연", "gauge",
+    lambda: [({}, loop_lag_monitor.last)],
+)
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus 텍스트 형식 지표"""
+    return Response(metrics.registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return {
+        "llm_summary": summary_cache.stats(),
+        "news_search": news_cache.stats(),
+        "youtube_search": youtube_cache.stats(),
+        "nouns": noun_extractor.stats(),
+        "transcripts": transcript_store.stats(),
+        "summaries": summary_store.stats(),
+        "tts_audio": audio_cache.stats(),
+        "warmer": cache_warmer.stats(),
+        "singleflight": inflight.stats(),
+        "news_batch": news_batcher.stats(),
+        "news_dedup": news_deduper.stats(),
+        "long_text": long_text_summarizer.stats(),
+        "backend": {"url": state_backend.describe(), "workers": WEB_CONCURRENCY, "pid": os.getpid()},
+    }
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
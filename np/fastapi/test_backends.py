@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+
+from backends import COMPARE_AND_DELETE_SCRIPT, MemoryBackend, SQLiteBackend
+from mini_redis import MiniRedis, RespError
+from singleflight import SingleFlight
+
+
+@pytest.fixture
+def sqlite_path(tmp_path):
+    return str(tmp_path / "state.db")
+
+
+def test_sqlite_lease_is_exclusive_until_it_expires(sqlite_path):
+    async def main():
+        first, second = SQLiteBackend(sqlite_path), SQLiteBackend(sqlite_path)
+        try:
+            acquired = await first.add("lock", "a", 0.1)
+            blocked = await second.add("lock", "b", 0.1)
+            await asyncio.sleep(0.15)
+            # lease가 지나면 다른 워커가 잠금을 얻음
+            taken_over = await second.add("lock", "b", 10)
+            return acquired, blocked, taken_over, await first.get("lock")
+        finally:
+            await first.close()
+            await second.close()
+
+    assert asyncio.run(main()) == (True, False, True, "b")
+
+
+@pytest.mark.parametrize("make_backend", [MemoryBackend, SQLiteBackend], ids=["memory", "sqlite"])
+def test_delete_if_keeps_a_lock_taken_by_someone_else(make_backend, sqlite_path):
+    async def main():
+        backend = MemoryBackend() if make_backend is MemoryBackend else SQLiteBackend(sqlite_path)
+        try:
+            await backend.set("lock", "other", 10)
+            kept = await backend.delete_if("lock", "mine")
+            value = await backend.get("lock")
+            removed = await backend.delete_if("lock", "other")
+            return kept, value, removed, await backend.get("lock")
+        finally:
+            await backend.close()
+
+    assert asyncio.run(main()) == (False, "other", True, None)
+
+
+def test_mini_redis_compare_and_delete():
+    store = MiniRedis()
+    store.execute([b"SET", b"lock", b'"a"'])
+    script = COMPARE_AND_DELETE_SCRIPT.encode("utf-8")
+    assert store.execute([b"EVAL", script, b"1", b"lock", b'"b"']) == 0
+    assert store.execute([b"GET", b"lock"]) == b'"a"'
+    assert store.execute([b"EVAL", script, b"1", b"lock", b'"a"']) == 1
+    assert store.execute([b"GET", b"lock"]) is None
+    with pytest.raises(RespError):
+        store.execute([b"EVAL", b"return 1", b"0"])
+
+
+def test_singleflight_across_workers_computes_once(sqlite_path):
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return {"items": [1, 2]}
+
+    async def main():
+        # 같은 파일을 쓰는 두 SingleFlight = 서로 다른 두 워커
+        backends = [SQLiteBackend(sqlite_path), SQLiteBackend(sqlite_path)]
+        flights = [SingleFlight(backend=backend, poll_interval=0.01) for backend in backends]
+        try:
+            results = await asyncio.gather(flights[0].do("k", work), flights[1].do("k", work))
+            # 어느 쪽이 잠금을 얻을지는 정해져 있지 않음
+            return results, sum(flight.stats()["remote_followers"] for flight in flights)
+        finally:
+            for backend in backends:
+                await backend.close()
+
+    results, remote_followers = asyncio.run(main())
+    assert results == [{"items": [1, 2]}] * 2
+    assert calls == 1
+    assert remote_followers == 1
+
+
+def test_singleflight_does_not_publish_unpublishable_results(sqlite_path):
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return [{"status": "timed_out"}]
+
+    async def main():
+        backends = [SQLiteBackend(sqlite_path), SQLiteBackend(sqlite_path)]
+        flights = [
+            SingleFlight(
+                backend=backend,
+                poll_interval=0.01,
+                publishable=lambda value: all(item["status"] == "ok" for item in value),
+            )
+            for backend in backends
+        ]
+        try:
+            await asyncio.gather(flights[0].do("k", work), flights[1].do("k", work))
+            return await backends[0].get("sf:result:k"), await backends[0].get("sf:lock:k")
+        finally:
+            for backend in backends:
+                await backend.close()
+
+    # 부분 결과는 공유하지 않으므로 기다리던 워커가 직접 다시 계산
+    assert asyncio.run(main()) == (None, None)
+    assert calls == 2
+
+
+def test_expired_lease_is_not_released_by_the_old_owner(sqlite_path):
+    async def slow():
+        await asyncio.sleep(0.2)
+        return "old"
+
+    async def main():
+        backend = SQLiteBackend(sqlite_path)
+        flight = SingleFlight(backend=backend, lease=0.05)
+        try:
+            task = asyncio.ensure_future(flight.do("k", slow))
+            await asyncio.sleep(0.1)
+            # lease가 지나 다른 워커가 잠금을 얻음
+            assert await backend.add("sf:lock:k", "other", 10)
+            await task
+            return await backend.get("sf:lock:k")
+        finally:
+            await backend.close()
+
+    assert asyncio.run(main()) == "other"
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from batching import BatchSummarizer
+from mapreduce import estimate_tokens
+
+
+def test_parse_accepts_code_fences_and_surrounding_text():
+    batcher = BatchSummarizer()
+    payload = json.dumps({"summaries": [{"id": 0, "summary": "첫 요약"}, {"id": 1, "summary": "둘째 요약"}]}, ensure_ascii=False)
+
+    assert batcher.parse(f"```json\n{payload}\n```", 2) == ["첫 요약", "둘째 요약"]
+    assert batcher.parse(f"요약 결과입니다.\n{payload}\n이상입니다.", 2) == ["첫 요약", "둘째 요약"]
+
+
+def test_parse_matches_results_by_id():
+    batcher = BatchSummarizer()
+    output = json.dumps({"summaries": [
+        {"id": "2", "summary": " 셋째 요약 "},  # 문자열 id와 앞뒤 공백
+        {"id": 0, "summary": "첫 요약"},
+        {"id": 7, "summary": "범위 밖"},
+        {"id": -1, "summary": "범위 밖"},
+        {"id": "x", "summary": "숫자가 아닌 id"},
+        {"id": 1, "summary": 42},  # 문자열이 아닌 요약
+        {"id": 3, "summary": "   "},
+    ]}, ensure_ascii=False)
+
+    assert batcher.parse(output, 4) == ["첫 요약", None, "셋째 요약", None]
+    assert batcher.stats() == {"batches": 1, "batched_items": 2, "fallback_items": 2, "parse_failures": 0}
+
+
+def test_parse_uses_position_when_id_is_missing():
+    batcher = BatchSummarizer()
+
+    assert batcher.parse(json.dumps([{"summary": "a"}, "b", {"summary": None}]), 3) == ["a", "b", None]
+
+
+@pytest.mark.parametrize("output", [
+    "요약할 수 없습니다.",
+    json.dumps({"result": []}),
+    json.dumps({"summaries": []}),
+    json.dumps({"summaries": [{"id": 5, "summary": "범위 밖"}, {"id": 0, "summary": ""}]}),
+], ids=["not-json", "no-summaries", "empty", "nothing-usable"])
+def test_parse_raises_when_nothing_is_usable(output):
+    batcher = BatchSummarizer()
+
+    with pytest.raises(ValueError):
+        batcher.parse(output, 2)
+    # 글마다 다시 요약하도록 모두 fallback으로 집계
+    assert batcher.stats() == {"batches": 0, "batched_items": 0, "fallback_items": 2, "parse_failures": 1}
+
+
+def test_should_batch_limits():
+    texts = ["짧은 기사 본문"] * 3
+    tokens = sum(estimate_tokens(text) for text in texts)
+
+    assert BatchSummarizer(max_input_tokens=tokens).should_batch(texts)
+    assert not BatchSummarizer(max_input_tokens=tokens - 1).should_batch(texts)
+    # 한 건뿐이거나 기능이 꺼져 있으면 묶지 않음
+    assert not BatchSummarizer().should_batch(texts[:1])
+    assert not BatchSummarizer(max_input_tokens=0).should_batch(texts)
+    # 출력 토큰 합계가 한 번의 호출을 넘는 경우
+    assert not BatchSummarizer(output_tokens_per_item=500, max_output_tokens=1000).should_batch(texts)
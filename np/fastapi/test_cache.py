@@ -0,0 +1,31 @@
+import asyncio
+
+import pytest
+
+from backends import SQLiteBackend
+from cache import SummaryCache
+
+
+@pytest.mark.parametrize("layer", ["shared", "disk"])
+def test_summary_keeps_its_expiry_when_loaded_by_another_worker(layer, tmp_path):
+    async def main():
+        def make():
+            if layer == "shared":
+                return SummaryCache(ttl=100, backend=SQLiteBackend(str(tmp_path / "state.db")))
+            return SummaryCache(ttl=100, disk_path=str(tmp_path / "llm.db"))
+
+        writer, reader = make(), make()
+        await writer.set("k", "요약", ttl=10)
+        try:
+            # 다른 워커가 가져와도 TTL이 처음부터 다시 시작하지 않음
+            return await reader.get("k"), await reader.expires_in("k"), await reader.expires_in("missing")
+        finally:
+            for cache in (writer, reader):
+                cache.close()
+                if cache.backend is not None:
+                    await cache.backend.close()
+
+    value, remaining, missing = asyncio.run(main())
+    assert value == "요약"
+    assert 9 < remaining <= 10
+    assert missing is None
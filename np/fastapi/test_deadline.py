@@ -0,0 +1,95 @@
+import time
+import asyncio
+
+import pytest
+
+import deadline
+from deadline import TIMED_OUT, DeadlineExceeded, DeadlineMiddleware
+
+
+def within(seconds, aw):
+    return deadline.run_until(time.monotonic() + seconds, aw)
+
+
+def test_remaining_is_none_without_deadline():
+    assert deadline.remaining() is None
+    assert deadline.expired() is False
+    assert deadline.cap_timeout(30) == 30
+
+
+def test_cap_timeout_uses_remaining_budget():
+    async def read():
+        return deadline.cap_timeout(30), deadline.cap_timeout(None)
+
+    capped, uncapped = asyncio.run(within(1, read()))
+    assert 0 < capped <= 1
+    assert 0 < uncapped <= 1
+
+
+def test_run_raises_and_cancels_when_deadline_passes():
+    async def main():
+        state = {}
+
+        async def slow():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                state["cancelled"] = True
+                raise
+
+        with pytest.raises(DeadlineExceeded):
+            await within(0.05, deadline.run(slow()))
+        return state
+
+    assert asyncio.run(main()) == {"cancelled": True}
+
+
+def test_run_without_deadline_just_awaits():
+    assert asyncio.run(deadline.run(asyncio.sleep(0.01, result="value"))) == "value"
+
+
+def test_gather_keeps_order_and_marks_unfinished_items():
+    async def item(delay, value):
+        await asyncio.sleep(delay)
+        return value
+
+    async def main():
+        return await within(0.1, deadline.gather([item(0.05, "a"), item(1, "b"), item(0, "c")]))
+
+    started = time.monotonic()
+    assert asyncio.run(main()) == ["a", TIMED_OUT, "c"]
+    assert time.monotonic() - started < 0.5
+
+
+def test_gather_without_deadline_waits_for_everything():
+    async def main():
+        return await deadline.gather([asyncio.sleep(0.02, result=1), asyncio.sleep(0, result=2)])
+
+    assert asyncio.run(main()) == [1, 2]
+    assert asyncio.run(deadline.gather([])) == []
+
+
+def remaining_inside_request(query_string=b"", headers=()):
+    """DeadlineMiddleware(default=10초, maximum=20초)를 거친 요청 안에서 본 남은 시간"""
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen["remaining"] = deadline.remaining()
+
+    middleware = DeadlineMiddleware(app, default=10, maximum=20)
+    scope = {"type": "http", "query_string": query_string, "headers": list(headers)}
+    asyncio.run(middleware(scope, None, None))
+    return seen["remaining"]
+
+
+@pytest.mark.parametrize("query_string,headers,expected", [
+    (b"", (), 10),
+    (b"deadline_ms=2000", (), 2),
+    (b"", ((b"x-request-deadline-ms", b"3000"),), 3),
+    (b"deadline_ms=999999", (), 20),
+    (b"deadline_ms=many", (), 10),
+    (b"deadline_ms=-5", (), 10),
+])
+def test_middleware_budget(query_string, headers, expected):
+    remaining = remaining_inside_request(query_string, headers)
+    assert expected - 0.5 < remaining <= expected
@@ -0,0 +1,60 @@
+from dedup import NearDuplicateDetector, hamming_distance, simhash
+
+# 같은 통신사 기사를 매체마다 말머리/따옴표/문장부호만 바꿔 실은 경우 (제목 + 설명, find_duplicates와 같은 형태)
+RATE_FREEZE = (
+    "한국은행, 기준금리 연 3.50%로 동결…8회 연속 "
+    "한국은행 금융통화위원회가 11일 기준금리를 현재 연 3.50%로 유지하기로 결정했다. "
+    "물가 상승세가 둔화하고 있지만 가계부채 증가세가 여전히 높다는 판단이다."
+)
+RATE_FREEZE_BREAKING = (
+    "[속보] 한국은행, 기준금리 연 3.50% 동결…8회 연속 "
+    "한국은행 금융통화위원회가 11일 기준금리를 현재 연 3.50%로 유지하기로 결정했다. "
+    "물가 상승세가 둔화하고 있지만 가계부채 증가세가 여전히 높다는 판단이다"
+)
+RATE_FREEZE_QUOTED = (
+    "\"한국은행 기준금리 연 3.50%로 동결 ... 8회 연속\" "
+    "한국은행 금융통화위원회가 11일 기준금리를 현재 연 3.50%로 유지하기로 결정했다. "
+    "물가 상승세가 둔화하고 있지만 가계부채 증가세가 여전히 높다는 판단이다."
+)
+# 같은 주제지만 다른 기사
+RATE_CUT = (
+    "한국은행, 기준금리 연 3.25%로 인하…3년 2개월 만 "
+    "한국은행 금융통화위원회가 기준금리를 0.25%포인트 내렸다. 물가 안정과 내수 부진을 고려한 결정이다."
+)
+EARNINGS = (
+    "삼성전자, 3분기 영업이익 9조1천억원…전년 대비 274% 증가 "
+    "삼성전자는 3분기 연결 기준 영업이익이 9조1천억원으로 잠정 집계됐다고 8일 공시했다. "
+    "반도체 부문의 실적 개선이 이끌었다."
+)
+
+
+def test_default_threshold_allows_ten_differing_bits():
+    assert NearDuplicateDetector(0.85).max_distance == 10
+
+
+def test_syndicated_copies_share_a_representative():
+    detector = NearDuplicateDetector(0.85)
+    texts = [RATE_FREEZE, EARNINGS, RATE_FREEZE_BREAKING, RATE_CUT, RATE_FREEZE_QUOTED]
+
+    assert detector.representatives(texts) == [0, 1, 0, 3, 0]
+    assert detector.stats() == {"checked": 5, "duplicates": 2, "duplicate_ratio": 0.4}
+
+
+def test_unrelated_articles_are_far_apart():
+    # 주제가 겹치는 기사도 기준(10비트)보다 충분히 멀어야 함
+    assert hamming_distance(simhash(RATE_FREEZE), simhash(RATE_CUT)) > 20
+    assert hamming_distance(simhash(RATE_FREEZE), simhash(EARNINGS)) > 20
+
+
+def test_empty_and_whitespace_texts_are_never_grouped():
+    detector = NearDuplicateDetector(0.85)
+
+    # 비교할 글자가 없는 글은 서로 같은 해시(0)가 나오더라도 각자 대표로 남음
+    assert detector.representatives(["", "   ", " \n\t", RATE_FREEZE, RATE_FREEZE_BREAKING]) == [0, 1, 2, 3, 3]
+    assert detector.representatives([]) == []
+
+
+def test_zero_threshold_disables_grouping():
+    detector = NearDuplicateDetector(0)
+
+    assert detector.representatives([RATE_FREEZE, RATE_FREEZE]) == [0, 1]
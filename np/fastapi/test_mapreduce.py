@@ -0,0 +1,78 @@
+import asyncio
+
+from mapreduce import MapReduceSummarizer, estimate_tokens, split_into_chunks
+
+
+def words(count, prefix="word"):
+    return " ".join(f"{prefix}{i}." for i in range(count))
+
+
+def test_split_keeps_paragraphs_and_stays_within_budget():
+    paragraphs = [words(30, "a"), words(30, "b"), words(400, "c")]
+    budget = max(estimate_tokens(paragraph) for paragraph in paragraphs[:2]) + 5
+
+    chunks = split_into_chunks("\n\n".join(paragraphs), budget)
+
+    assert all(estimate_tokens(chunk) <= budget for chunk in chunks)
+    # 예산에 들어가는 문단은 자르지 않음
+    assert paragraphs[0] in chunks[0]
+    assert any(paragraphs[1] in chunk for chunk in chunks)
+    # 내용은 빠짐없이 순서대로 남음
+    assert "".join(chunks).replace("\n", "").replace(" ", "") == "".join(paragraphs).replace(" ", "")
+
+
+def test_split_cuts_a_sentence_longer_than_the_budget():
+    sentence = "가" * 300
+    budget = estimate_tokens(sentence) // 3
+
+    chunks = split_into_chunks(sentence, budget)
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == sentence
+
+
+def test_condense_returns_short_text_without_calls():
+    calls = []
+
+    async def summarize(chunk):
+        calls.append(chunk)
+        return chunk
+
+    summarizer = MapReduceSummarizer(chunk_tokens=1000)
+    assert asyncio.run(summarizer.condense("짧은 글", summarize)) == "짧은 글"
+    assert calls == []
+    assert summarizer.stats() == {"split_inputs": 0, "over_budget": 0}
+
+
+def test_condense_joins_chunk_summaries_in_order():
+    text = "\n\n".join(words(40, f"p{i}_") for i in range(4))
+    budget = estimate_tokens(words(40, "p0_")) + 5
+
+    async def summarize(chunk):
+        # 청크의 첫 단어만 남기는 요약
+        await asyncio.sleep(0.01 if chunk.startswith("p0") else 0)
+        return chunk.split()[0]
+
+    summarizer = MapReduceSummarizer(chunk_tokens=budget, max_concurrency=2)
+    condensed = asyncio.run(summarizer.condense(text, summarize))
+
+    assert condensed.split("\n\n") == ["p0_0.", "p1_0.", "p2_0.", "p3_0."]
+    assert summarizer.stats() == {"split_inputs": 1, "over_budget": 0}
+
+
+def test_condense_reports_text_still_over_budget(capsys):
+    calls = []
+
+    async def summarize(chunk):
+        # 줄지 않는 요약 (모델이 원문을 그대로 돌려준 경우)
+        calls.append(chunk)
+        return chunk
+
+    text = words(200)
+    summarizer = MapReduceSummarizer(chunk_tokens=estimate_tokens(text) // 4, max_rounds=2)
+    condensed = asyncio.run(summarizer.condense(text, summarize))
+
+    assert summarizer.needs_split(condensed)
+    assert summarizer.stats() == {"split_inputs": 1, "over_budget": 1}
+    assert len(calls) == 2 * len(split_into_chunks(text, summarizer.chunk_tokens))
+    assert "[WARNING]" in capsys.readouterr().out
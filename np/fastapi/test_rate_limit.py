@@ -0,0 +1,90 @@
+import time
+import asyncio
+
+import pytest
+
+from rate_limit import ProviderLimiter, Throttled, parse_retry_after
+
+
+def make_limiter(**overrides):
+    options = dict(rps=1000, burst=1000, concurrency=8, max_retries=3, base_delay=0.01, max_delay=1)
+    options.update(overrides)
+    return ProviderLimiter("test", **options)
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({"retry-after": "2"}, 2.0),
+    ({"Retry-After": "-1"}, 0.0),
+    ({"retry-after": "soon"}, None),
+    ({}, None),
+    (None, None),
+])
+def test_parse_retry_after_seconds(headers, expected):
+    assert parse_retry_after(headers) == expected
+
+
+def test_parse_retry_after_http_date():
+    date = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 30))
+    assert 28 < parse_retry_after({"retry-after": date}) <= 30
+
+
+def test_throttle_halves_the_limit_once_per_second():
+    limiter = make_limiter()
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.limit == 4
+    assert limiter.throttled == 2
+
+
+def test_success_increases_the_limit_additively():
+    async def main():
+        limiter = make_limiter()
+        limiter.limit = 2.0
+        for _ in range(2):
+            async with limiter.slot():
+                pass
+        return limiter.limit
+
+    # 성공할 때마다 1/한도씩 늘어 한도(2)만큼 성공하면 약 1 증가
+    assert asyncio.run(main()) == pytest.approx(2 + 1 / 2 + 1 / 2.5)
+
+
+def test_retry_after_pauses_every_request():
+    async def main():
+        limiter = make_limiter()
+        limiter.on_throttle(0.2)
+        started = time.monotonic()
+        await limiter.acquire()
+        await limiter.release()
+        return time.monotonic() - started
+
+    assert asyncio.run(main()) >= 0.19
+
+
+def test_call_retries_throttled_attempts():
+    attempts = 0
+
+    async def flaky():
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise Throttled()
+        return "ok"
+
+    limiter = make_limiter()
+    assert asyncio.run(limiter.call(flaky)) == "ok"
+    assert limiter.retries == 2
+    assert limiter.stats()["inflight"] == 0
+
+
+def test_call_returns_the_original_error_after_the_last_retry():
+    class RateLimitError(Exception):
+        pass
+
+    async def always_throttled():
+        raise Throttled(error=RateLimitError("429"))
+
+    limiter = make_limiter(max_retries=1)
+    with pytest.raises(RateLimitError):
+        asyncio.run(limiter.call(always_throttled))
+    assert limiter.retries == 1
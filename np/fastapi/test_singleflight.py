@@ -0,0 +1,112 @@
+import asyncio
+
+import deadline
+from deadline import DeadlineExceeded
+from singleflight import SingleFlight
+
+
+def within(seconds, aw):
+    """seconds초 뒤를 마감으로 하는 요청 안에서 실행"""
+    return deadline.run_within(seconds, aw)
+
+
+def test_coalesces_concurrent_calls():
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def main():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+        return flight, results
+
+    flight, results = asyncio.run(main())
+    assert results == ["value"] * 5
+    assert calls == 1
+    assert flight.stats()["leaders"] == 1
+    assert flight.stats()["followers"] == 4
+    assert flight.stats()["inflight"] == 0
+
+
+def test_failure_reaches_every_caller_and_releases_key():
+    calls = 0
+
+    async def fail():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def main():
+        flight = SingleFlight()
+        results = await asyncio.gather(flight.do("k", fail), flight.do("k", fail), return_exceptions=True)
+        again = await asyncio.gather(flight.do("k", fail), return_exceptions=True)
+        return results + again
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    # 끝난 작업의 키는 지워지므로 다음 호출은 새로 계산
+    assert calls == 2
+
+
+def test_cancelled_leader_does_not_cancel_shared_work():
+    async def work():
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def main():
+        flight = SingleFlight()
+        leader = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(main()) == "value"
+
+
+def test_callers_with_different_deadlines_get_their_own_outcome():
+    """마감이 짧은 요청이 먼저 들어와도 마감이 긴 요청은 전체 결과를 받음"""
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.2)
+        return "value"
+
+    async def main():
+        flight = SingleFlight()
+        short = asyncio.ensure_future(within(0.05, flight.do("k", work)))
+        await asyncio.sleep(0)
+        long = asyncio.ensure_future(within(5, flight.do("k", work)))
+        return await asyncio.gather(short, long, return_exceptions=True)
+
+    short, long = asyncio.run(main())
+    assert isinstance(short, DeadlineExceeded)
+    assert long == "value"
+    assert calls == 1
+
+
+def test_shared_work_runs_without_caller_deadline():
+    seen = []
+
+    async def work():
+        seen.append(deadline.remaining())
+        return "value"
+
+    async def main():
+        flight = SingleFlight()
+        result = await within(5, flight.do("k", work))
+        # 호출 측의 마감 시간은 그대로 유지
+        return result, deadline.remaining()
+
+    assert asyncio.run(main()) == ("value", None)
+    assert seen == [None]
+
+
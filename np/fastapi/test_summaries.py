@@ -0,0 +1,79 @@
+import os
+import time
+import asyncio
+
+from summaries import SummaryStore
+
+
+def test_get_right_after_put_reads_the_pending_queue(tmp_path):
+    async def main():
+        # 주기가 길어 기록 작업이 돌기 전에 조회
+        store = SummaryStore(str(tmp_path / "summaries.db"), flush_interval=60)
+        try:
+            file_id = store.put("요약", keyword="경제", url="https://example.com/a", title="제목")
+            pending = await store.get(file_id), store.stats()["pending"]
+            await store.flush()
+            return pending, await store.get(file_id), store.stats()
+        finally:
+            await store.close()
+
+    (before, pending), after, stats = asyncio.run(main())
+    assert before["summary"] == "요약" and before["keyword"] == "경제" and before["title"] == "제목"
+    assert pending == 1
+    # 기록 뒤에는 SQLite에서 같은 값을 읽음
+    assert after == before
+    assert stats["writes"] == 1 and stats["pending"] == 0
+
+
+def test_evict_removes_old_and_excess_rows(tmp_path):
+    store = SummaryStore(str(tmp_path / "summaries.db"), retention=3600, max_entries=2)
+    now = time.time()
+    store._write_rows([
+        ("old", "오래된 요약", None, None, None, now - 7200),
+        ("a", "요약 a", None, None, None, now - 30),
+        ("b", "요약 b", None, None, None, now - 20),
+        ("c", "요약 c", None, None, None, now - 10),
+    ])
+
+    # 보관 기간이 지난 1건 + max_entries(2)를 넘는 가장 오래된 1건
+    assert store._evict() == 2
+    assert store._read_row("old") is None
+    assert store._read_row("a") is None
+    assert [store._read_row(file_id)[1] for file_id in ("b", "c")] == ["요약 b", "요약 c"]
+    asyncio.run(store.close())
+
+
+def test_evict_removes_expired_legacy_files(tmp_path):
+    legacy_dir = tmp_path / "summaries"
+    legacy_dir.mkdir()
+    expired, fresh, other = legacy_dir / "expired.txt", legacy_dir / "fresh.txt", legacy_dir / "notes.md"
+    for path in (expired, fresh, other):
+        path.write_text("요약", encoding="utf-8")
+    old = time.time() - 7200
+    os.utime(expired, (old, old))
+    os.utime(other, (old, old))
+    store = SummaryStore(str(tmp_path / "summaries.db"), legacy_dir=legacy_dir, retention=3600)
+
+    assert store._evict() == 1
+    asyncio.run(store.close())
+    # .txt가 아닌 파일은 건드리지 않음
+    assert not expired.exists() and fresh.exists() and other.exists()
+
+
+def test_get_reads_legacy_files_inside_the_directory_only(tmp_path):
+    legacy_dir = tmp_path / "summaries"
+    legacy_dir.mkdir()
+    (legacy_dir / "kept.txt").write_text("예전 요약", encoding="utf-8")
+    (tmp_path / "x.txt").write_text("디렉터리 밖", encoding="utf-8")
+
+    async def main():
+        store = SummaryStore(str(tmp_path / "summaries.db"), legacy_dir=legacy_dir)
+        try:
+            return await store.get("kept.txt"), await store.get("../x.txt"), store.stats()
+        finally:
+            await store.close()
+
+    kept, outside, stats = asyncio.run(main())
+    assert kept["summary"] == "예전 요약"
+    assert outside is None
+    assert stats["legacy_hits"] == 1 and stats["misses"] == 1
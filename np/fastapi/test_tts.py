@@ -0,0 +1,127 @@
+import os
+import time
+import asyncio
+
+import httpx
+import pytest
+
+from backends import SQLiteBackend
+from tts import AudioCache
+
+
+def chunk_source(chunks, calls, delay=0.02):
+    def source():
+        async def generate():
+            calls.append(1)
+            for chunk in chunks:
+                await asyncio.sleep(delay)
+                yield chunk
+        return generate()
+    return source
+
+
+async def collect(stream):
+    return b"".join([chunk async for chunk in stream])
+
+
+def test_stream_on_two_workers_synthesizes_once(tmp_path):
+    calls = []
+    chunks = [b"a" * 10, b"b" * 10, b"c" * 10]
+
+    async def main():
+        # 같은 디렉토리와 같은 공유 백엔드를 쓰는 두 AudioCache = 같은 호스트의 두 워커
+        backends = [SQLiteBackend(str(tmp_path / "state.db")) for _ in range(2)]
+        caches = [AudioCache(tmp_path, backend=backend, poll_interval=0.01) for backend in backends]
+        try:
+            results = await asyncio.gather(
+                *(collect(cache.stream("k", chunk_source(chunks, calls))) for cache in caches)
+            )
+            return results, caches
+        finally:
+            for backend in backends:
+                await backend.close()
+
+    results, caches = asyncio.run(main())
+    assert results == [b"".join(chunks)] * 2
+    assert len(calls) == 1
+    assert sum(cache.stats()["remote_coalesced"] for cache in caches) == 1
+    # 따라 읽은 워커의 임시 파일도 남지 않음
+    assert sorted(name for name in os.listdir(tmp_path) if name.startswith("tts_")) == ["tts_k.mp3"]
+
+
+def test_failed_synthesis_reaches_the_following_worker(tmp_path):
+    async def broken():
+        await asyncio.sleep(0.05)
+        yield b"partial"
+        raise RuntimeError("upstream error")
+
+    async def main():
+        backends = [SQLiteBackend(str(tmp_path / "state.db")) for _ in range(2)]
+        caches = [AudioCache(tmp_path, backend=backend, poll_interval=0.01) for backend in backends]
+        try:
+            return await asyncio.gather(
+                *(cache.get_or_create("k", broken) for cache in caches), return_exceptions=True
+            )
+        finally:
+            for backend in backends:
+                await backend.close()
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert not (tmp_path / "tts_k.mp3").exists()
+
+
+def test_stream_raises_the_upstream_error(tmp_path):
+    request = httpx.Request("POST", "https://api.elevenlabs.io/v1/text-to-speech/v/stream")
+    response = httpx.Response(429, request=request)
+
+    async def rejected():
+        await asyncio.sleep(0.02)
+        raise httpx.HTTPStatusError("429 Too Many Requests", request=request, response=response)
+        yield b""
+
+    async def main():
+        cache = AudioCache(tmp_path)
+        # 합성을 시작한 요청과 따라 읽던 요청 모두 원래 오류를 받아 상태 코드로 바꿀 수 있어야 함
+        return await asyncio.gather(
+            *(collect(cache.stream("k", rejected)) for _ in range(2)), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, httpx.HTTPStatusError) for result in results)
+    assert all(result.response.status_code == 429 for result in results)
+
+
+def test_budget_counts_files_from_every_worker(tmp_path):
+    async def main():
+        caches = [AudioCache(tmp_path, max_bytes=25) for _ in range(2)]
+        for index in range(4):
+            # 워커를 번갈아 가며 10바이트 파일 생성
+            await caches[index % 2].get_or_create(f"k{index}", chunk_source([b"x" * 10], [], delay=0))
+            await asyncio.sleep(0.01)
+        return caches
+
+    caches = asyncio.run(main())
+    assert sorted(os.listdir(tmp_path)) == ["tts_k2.mp3", "tts_k3.mp3"]
+    assert caches[1].stats()["bytes"] == 20
+
+
+def test_lookup_refreshes_only_stale_access_times(tmp_path):
+    fresh, stale = tmp_path / "tts_fresh.mp3", tmp_path / "tts_stale.mp3"
+    for path in (fresh, stale):
+        path.write_bytes(b"x")
+    recent, old, mtime = time.time() - 5, time.time() - 3600, time.time() - 7200
+    os.utime(fresh, (recent, mtime))
+    os.utime(stale, (old, mtime))
+    (tmp_path / "tts_dir.mp3").mkdir()
+
+    async def main():
+        cache = AudioCache(tmp_path)
+        return [await cache.lookup(name) for name in ("tts_fresh.mp3", "tts_stale.mp3", "tts_dir.mp3", "../x.mp3", "a.txt")]
+
+    found = asyncio.run(main())
+    assert found == [fresh, stale, None, None, None]
+    assert fresh.stat().st_atime == pytest.approx(recent)
+    assert stale.stat().st_atime > old + 3000
+    # mtime(Last-Modified)은 그대로
+    assert stale.stat().st_mtime == pytest.approx(mtime)
@@ -0,0 +1,34 @@
+import asyncio
+
+from warmer import CacheWarmer
+
+
+def test_prepare_runs_once_per_cycle_before_the_jobs():
+    calls = []
+
+    async def prepare(keywords):
+        calls.append(("prepare", list(keywords)))
+
+    async def job(keyword):
+        calls.append(("job", keyword))
+
+    warmer = CacheWarmer(["a", "b"], gap=0)
+    warmer.register("news", job, prepare=prepare)
+    asyncio.run(warmer.run_once())
+    assert calls == [("prepare", ["a", "b"]), ("job", "a"), ("job", "b")]
+
+
+def test_failed_prepare_does_not_stop_the_jobs():
+    warmed = []
+
+    async def prepare(keywords):
+        raise RuntimeError("okt")
+
+    async def job(keyword):
+        warmed.append(keyword)
+
+    warmer = CacheWarmer(["a"], gap=0)
+    warmer.register("news", job, prepare=prepare)
+    asyncio.run(warmer.run_once())
+    assert warmed == ["a"]
+    assert warmer.stats()["warmed"] == 1
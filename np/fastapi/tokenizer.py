@@ -0,0 +1,82 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import metrics
+from cache import LRUCache
+
+
+class NounExtractor:
+    """
+    konlpy Okt 명사 추출기.
+    Okt는 JVM 호출이라 이벤트 루프를 막기 때문에 전용 스레드 하나에서만 실행하고,
+    같은 검색어는 LRU 메모로 바로 반환합니다.
+    """
+
+    def __init__(self, memo_size: int = 2048, min_length: int = 2):
+        self.min_length = min_length
+        self._okt = None
+        # Okt 생성과 호출을 항상 같은 스레드에서 하도록 워커 1개로 고정
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="okt")
+        self._memo = LRUCache(max_entries=memo_size, ttl=float("inf"))
+
+    @property
+    def ready(self) -> bool:
+        return self._okt is not None
+
+    def _get_okt(self):
+        if self._okt is None:
+            from konlpy.tag import Okt  # JVM 기동 비용이 커서 필요할 때 로드
+            self._okt = Okt()
+        return self._okt
+
+    def _extract(self, query: str) -> str:
+        try:
+            nouns = self._get_okt().nouns(query)
+            # 정렬해서 반환해야 같은 명사 집합이 항상 같은 검색어(캐시 키)가 됨
+            filtered = sorted({noun for noun in nouns if len(noun) >= self.min_length})
+            return ' '.join(filtered) if filtered else query
+        except Exception as e:
+            print(f"[ERROR] 명사 추출 오류: {e}")
+            return query
+
+    def _extract_batch(self, queries: List[str]) -> List[str]:
+        return [self._extract(query) for query in queries]
+
+    async def extract(self, query: str) -> str:
+        cached = self._memo.get(query)
+        if cached is not None:
+            return cached
+        loop = asyncio.get_running_loop()
+        with metrics.stage("okt"):
+            result = await loop.run_in_executor(self._executor, self._extract, query)
+        self._memo.set(query, result)
+        return result
+
+    async def extract_many(self, queries: List[str]) -> List[str]:
+        """여러 문자열을 한 번의 스레드 작업으로 처리합니다 (메모에 있는 값은 제외)."""
+        results: List[Optional[str]] = [self._memo.get(q) for q in queries]
+        missing = [q for q, r in zip(queries, results) if r is None]
+        if missing:
+            loop = asyncio.get_running_loop()
+            with metrics.stage("okt"):
+                extracted = await loop.run_in_executor(self._executor, self._extract_batch, missing)
+            found = dict(zip(missing, extracted))
+            for query, value in found.items():
+                self._memo.set(query, value)
+            results = [r if r is not None else found[q] for q, r in zip(queries, results)]
+        return results
+
+    def _warmup(self) -> None:
+        # JVM 기동 + Okt 사전 로딩 + 첫 호출 JIT 비용을 미리 치름
+        self._get_okt().nouns("최신 뉴스 요약 서비스를 준비하고 있습니다")
+
+    async def warmup(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._warmup)
+
+    def stats(self) -> dict:
+        return {"memo_hits": self._memo.hits, "memo_misses": self._memo.misses, "ready": self.ready}
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,99 @@
+import time
+import asyncio
+import sqlite3
+import threading
+import zlib
+from typing import Optional, Tuple
+
+import metrics
+
+
+class TranscriptStore:
+    """
+    유튜브 video_id별 자막을 SQLite에 저장합니다.
+    자막은 변하지 않으므로 성공 결과는 길게, "자막 없음" 같은 부정 결과는 짧게 보관합니다.
+    본문은 zlib으로 압축해 저장합니다.
+    """
+
+    def __init__(self, path: str, ttl: float = 30 * 24 * 3600, negative_ttl: float = 6 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS transcripts ("
+                "video_id TEXT PRIMARY KEY, "
+                "content BLOB, "
+                "found INTEGER NOT NULL, "
+                "fetched_at REAL NOT NULL, "
+                "expires_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def lookup(self, video_id: str) -> Optional[Tuple[bool, str]]:
+        """동기 조회. (자막 존재 여부, 자막) 반환, 저장된 값이 없거나 만료되었으면 None"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT content, found, expires_at FROM transcripts WHERE video_id = ?",
+                (video_id,),
+            ).fetchone()
+        if row is None or row[2] < time.time():
+            return None
+        content = zlib.decompress(row[0]).decode("utf-8") if row[0] else ""
+        return bool(row[1]), content
+
+    def save(self, video_id: str, content: str) -> None:
+        """동기 저장. 빈 자막은 부정 결과로 짧은 TTL을 적용합니다."""
+        found = bool(content.strip())
+        now = time.time()
+        expires_at = now + (self.ttl if found else self.negative_ttl)
+        blob = zlib.compress(content.encode("utf-8")) if content else None
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO transcripts (video_id, content, found, fetched_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (video_id, blob, int(found), now, expires_at),
+            )
+            conn.commit()
+
+    async def get(self, video_id: str) -> Optional[Tuple[bool, str]]:
+        try:
+            result = await asyncio.to_thread(self.lookup, video_id)
+        except sqlite3.Error as e:
+            print(f"[ERROR] 자막 저장소 조회 오류 ({video_id}): {e}")
+            result = None
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    async def put(self, video_id: str, content: str) -> None:
+        try:
+            with metrics.stage("transcript_store_write"):
+                await asyncio.to_thread(self.save, video_id, content)
+        except sqlite3.Error as e:
+            print(f"[ERROR] 자막 저장소 저장 오류 ({video_id}): {e}")
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
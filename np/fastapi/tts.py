@@ -0,0 +1,387 @@
+import os
+import time
+import uuid
+import socket
+import asyncio
+from collections import OrderedDict
+from pathlib import Path
+from stat import S_ISREG
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import metrics
+from cache import make_cache_key
+
+# 파일/스트림을 읽어 클라이언트로 보낼 때의 청크 크기
+CHUNK_SIZE = 64 * 1024
+# 사용 시각(atime)을 다시 기록하는 최소 간격(초). 자주 재생되는 파일마다 매번 utime을 호출하지 않도록 함
+TOUCH_INTERVAL = 60.0
+
+ChunkSource = Callable[[], AsyncIterator[bytes]]
+
+
+def _write_chunk(f, chunk: bytes) -> None:
+    f.write(chunk)
+    f.flush() # 따라 읽는 요청이 바로 볼 수 있도록
+
+
+class _Synthesis:
+    """진행 중인 합성 한 건. 임시 파일에 청크를 쓰면서 기다리는 요청들에게 진행 상황을 알립니다."""
+
+    def __init__(self, tmp_path: Path):
+        self.tmp_path = tmp_path
+        self.size = 0
+        self.done = False
+        self.failed = False
+        self.error: Optional[BaseException] = None
+        self.cond = asyncio.Condition()
+        self.task: Optional[asyncio.Task] = None
+
+    def failure(self) -> Exception:
+        """따라 읽던 요청에 올릴 예외. 합성 중 난 오류(업스트림 HTTP 오류 등)를 그대로 전달하고, 취소 등은 RuntimeError로 바꿉니다."""
+        if isinstance(self.error, Exception):
+            return self.error
+        return RuntimeError("음성 합성에 실패했습니다.")
+
+
+class AudioCache:
+    """
+    ElevenLabs 음성 합성 결과를 (텍스트, voice_id, 모델, 음성 설정) 해시 이름의 MP3로 저장합니다.
+    같은 입력은 저장된 파일을 바로 반환하고, 동시에 들어온 같은 요청은 합성을 한 번만 수행합니다.
+    합성은 청크 단위로 임시 파일에 기록되므로, stream()을 쓰면 첫 청크부터 바로 클라이언트에 보낼 수 있습니다.
+
+    워커 간 공유 백엔드(backend.shared)를 주면 같은 디렉토리를 쓰는 워커끼리 입력별 합성 잠금(lease)을 나눕니다.
+    다른 워커가 합성 중인 입력은 ElevenLabs를 다시 호출하지 않고 그 워커의 임시 파일을 따라 읽습니다.
+
+    max_bytes를 지정하면 디렉토리 전체 크기가 이를 넘지 않도록 가장 오래 사용되지 않은 파일부터 삭제합니다.
+    새 파일을 저장할 때마다 디렉토리를 다시 읽어 다른 워커가 만든 파일까지 합산하므로, 워커 수와 관계없이 디렉토리 전체의 한도입니다.
+    마지막 사용 시각은 파일의 atime에 직접 기록하므로 재시작 후에도, 워커 사이에서도 순서가 유지됩니다.
+    (TOUCH_INTERVAL초 안에 다시 사용되면 기록을 생략하고, 파일 시스템 호출은 스레드에서 실행)
+    """
+
+    def __init__(
+        self,
+        audio_dir: Path,
+        max_bytes: int = 0,
+        backend=None,
+        lease: float = 120,
+        poll_interval: float = 0.05,
+    ):
+        self.audio_dir = audio_dir
+        self.max_bytes = max_bytes
+        self.backend = backend if backend is not None and backend.shared else None
+        self.lease = lease
+        self.poll_interval = poll_interval
+        # 같은 디렉토리를 쓰는 워커(같은 호스트)끼리만 잠금을 나눔
+        self._lock_prefix = f"tts:{socket.gethostname()}:{audio_dir.resolve()}:"
+        self._inflight: Dict[str, _Synthesis] = {}
+        # 파일명 → 크기, 오래 전에 사용된 파일이 앞에 오도록 유지
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.remote_coalesced = 0
+        self.evicted = 0
+
+    @staticmethod
+    def make_key(text: str, voice_id: str, model_id: str, **voice_settings) -> str:
+        """voice_settings에는 stability, clarity, output_format 등 결과에 영향을 주는 값을 모두 넘깁니다."""
+        return make_cache_key(
+            text=text, voice_id=voice_id, model_id=model_id, settings=voice_settings,
+        )
+
+    def path_for(self, key: str) -> Path:
+        return self.audio_dir / f"tts_{key}.mp3"
+
+    def _scan(self) -> List[Tuple[float, str, int]]:
+        """디렉토리의 MP3를 (마지막 사용 시각, 파일명, 크기) 목록으로 오래된 순서대로 반환합니다. (동기)"""
+        files = []
+        if self.audio_dir.is_dir():
+            with os.scandir(self.audio_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith(".mp3"):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            # 다른 워커가 방금 삭제한 파일
+                            continue
+                        files.append((stat.st_atime, entry.name, stat.st_size))
+        return sorted(files)
+
+    def _rebuild(self, files: List[Tuple[float, str, int]]) -> List[Path]:
+        """색인을 다시 만들고, 예산을 넘으면 삭제할 파일 목록을 반환합니다. (가장 최근 파일은 남겨 둠)"""
+        self._index.clear()
+        for _, name, size in files:
+            self._index[name] = size
+        self._total_bytes = sum(self._index.values())
+        self._loaded = True
+        victims = []
+        while self.max_bytes and self._total_bytes > self.max_bytes and len(self._index) > 1:
+            name, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            victims.append(self.audio_dir / name)
+        return victims
+
+    def load(self) -> None:
+        """
+        디렉토리의 기존 MP3를 마지막 사용 순서대로 색인하고, 예산을 넘은 만큼 오래된 파일을 삭제합니다.
+        (동기, 시작 시 스레드에서 호출)
+        """
+        victims = self._rebuild(self._scan())
+        self._remove(victims)
+        self.evicted += len(victims)
+
+    async def _enforce_budget(self) -> None:
+        """디렉토리를 다시 읽어 다른 워커가 만든 파일까지 합산하고, 예산을 넘은 만큼 오래된 파일을 삭제합니다."""
+        victims = self._rebuild(await asyncio.to_thread(self._scan))
+        if victims:
+            await asyncio.to_thread(self._remove, victims)
+            self.evicted += len(victims)
+
+    @staticmethod
+    def _touch_file(path: Path) -> Optional[int]:
+        """
+        파일이 있으면 사용 시각을 갱신하고 크기를 반환합니다. 없으면 None (동기)
+        mtime은 그대로 두어 Last-Modified가 바뀌지 않도록 합니다.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not S_ISREG(stat.st_mode):
+            return None
+        now = time.time()
+        if now - stat.st_atime >= TOUCH_INTERVAL:
+            try:
+                os.utime(path, (now, stat.st_mtime))
+            except OSError:
+                pass
+        return stat.st_size
+
+    async def _touch(self, path: Path) -> bool:
+        """저장된 파일이면 사용 시각을 갱신하고 True를 반환합니다."""
+        size = await asyncio.to_thread(self._touch_file, path)
+        if size is None:
+            return False
+        if not self._loaded:
+            await self._enforce_budget()
+        name = path.name
+        if name in self._index:
+            self._index.move_to_end(name)
+        else:
+            # 다른 워커 프로세스가 만든 파일
+            self._index[name] = size
+            self._total_bytes += size
+        return True
+
+    @staticmethod
+    def _remove(paths: List[Path]) -> None:
+        for path in paths:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    async def lookup(self, filename: str) -> Optional[Path]:
+        """/audio/{filename} 요청용. 저장된 파일이면 사용 시각을 갱신하고 경로를 반환합니다."""
+        if Path(filename).name != filename or not filename.endswith(".mp3"):
+            return None
+        path = self.audio_dir / filename
+        return path if await self._touch(path) else None
+
+    async def _claim(self, lock_key: str, tmp_name: str) -> Optional[str]:
+        """워커 간 합성 잠금을 얻으면 None, 다른 워커가 합성 중이면 그 워커의 임시 파일 이름을 반환합니다."""
+        while True:
+            if await self.backend.add(lock_key, tmp_name, self.lease):
+                return None
+            holder = await self.backend.get(lock_key)
+            if holder is not None:
+                return holder
+
+    @staticmethod
+    def _open_first(*paths: Path):
+        for path in paths:
+            try:
+                return open(path, "rb")
+            except OSError:
+                continue
+        return None
+
+    @staticmethod
+    def _is_same_file(f, path: Path) -> bool:
+        try:
+            return os.path.samestat(os.fstat(f.fileno()), path.stat())
+        except OSError:
+            return False
+
+    async def _follow(self, lock_key: str, holder: str, f, path: Path) -> AsyncIterator[bytes]:
+        """
+        다른 워커가 쓰고 있는 임시 파일 f를 따라 읽습니다.
+        f가 path로 rename되면 끝난 것이고, 그 전에 잠금이 풀리면 그 워커의 합성이 실패한 것입니다.
+        """
+        try:
+            while True:
+                data = await asyncio.to_thread(f.read, CHUNK_SIZE)
+                if data:
+                    yield data
+                    continue
+                # 마지막 청크를 읽은 뒤 rename된 경우를 위해, 끝났으면 남은 부분까지 읽고 종료
+                if await asyncio.to_thread(self._is_same_file, f, path):
+                    async for data in self._read_file(f):
+                        yield data
+                    return
+                if await self.backend.get(lock_key) != holder:
+                    # rename 직후 잠금이 풀린 경우
+                    if await asyncio.to_thread(self._is_same_file, f, path):
+                        continue
+                    raise RuntimeError("다른 워커의 음성 합성이 실패했습니다.")
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            f.close()
+
+    async def _produce(self, key: str, synthesis: _Synthesis, chunks: ChunkSource) -> Path:
+        path = self.path_for(key)
+        lock_key = self._lock_prefix + key
+        source, owns_lock = chunks, False
+        if self.backend is not None:
+            try:
+                holder = await self._claim(lock_key, synthesis.tmp_path.name)
+            except Exception as e:
+                print(f"[WARNING] 공유 백엔드 조회 실패, 이 워커에서 합성합니다: {e}")
+            else:
+                owns_lock = holder is None
+                # 다른 워커가 합성 중이면 그 임시 파일(이미 끝났으면 완성된 파일)을 따라 읽음
+                followed = None if owns_lock else await asyncio.to_thread(
+                    self._open_first, self.audio_dir / holder, path
+                )
+                if followed is not None:
+                    self.remote_coalesced += 1
+                    source = lambda: self._follow(lock_key, holder, followed, path)
+        error: Optional[BaseException] = None
+        try:
+            with open(synthesis.tmp_path, "wb") as f:
+                async for chunk in source():
+                    with metrics.stage("audio_write"):
+                        await asyncio.to_thread(_write_chunk, f, chunk)
+                    async with synthesis.cond:
+                        synthesis.size += len(chunk)
+                        synthesis.cond.notify_all()
+        except BaseException as e:
+            error = e
+        async with synthesis.cond:
+            if error is None and source is chunks:
+                # 다 쓴 뒤 rename 해서 다른 요청이 덜 쓰인 파일을 캐시로 읽지 않도록 함
+                os.replace(synthesis.tmp_path, path)
+            else:
+                # 다른 워커를 따라 읽은 경우 완성된 파일은 그 워커가 이미 만들었으므로 복사본은 버림
+                synthesis.failed = error is not None
+                synthesis.error = error
+                if synthesis.tmp_path.exists():
+                    synthesis.tmp_path.unlink()
+            synthesis.done = True
+            synthesis.cond.notify_all()
+        if owns_lock:
+            # rename 뒤에 풀어야 따라 읽던 워커가 실패로 오해하지 않음
+            try:
+                await self.backend.delete_if(lock_key, synthesis.tmp_path.name)
+            except Exception as e:
+                print(f"[WARNING] 공유 백엔드 기록 실패: {e}")
+        if error is not None:
+            raise error
+        await self._enforce_budget()
+        return path
+
+    def _join_or_start(self, key: str, chunks: ChunkSource) -> _Synthesis:
+        synthesis = self._inflight.get(key)
+        if synthesis is not None:
+            self.coalesced += 1
+            return synthesis
+        self.misses += 1
+        path = self.path_for(key)
+        synthesis = _Synthesis(path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp"))
+        # 뒤따라 온 요청이 바로 열 수 있도록 임시 파일을 먼저 만들어 둠
+        synthesis.tmp_path.touch()
+        synthesis.task = asyncio.create_task(self._produce(key, synthesis, chunks))
+        self._inflight[key] = synthesis
+        synthesis.task.add_done_callback(lambda task: self._on_done(key, task))
+        return synthesis
+
+    def _on_done(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        # 스트리밍 대기자만 있고 task를 await한 곳이 없을 때도 예외가 로그로 남도록 회수
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[ERROR] 음성 합성 실패 ({key[:12]}): {task.exception()}")
+
+    async def get_or_create(self, key: str, chunks: ChunkSource) -> Path:
+        """
+        캐시된 파일 경로를 반환합니다. 없으면 chunks()로 받은 오디오를 파일로 저장한 뒤 반환합니다.
+        """
+        path = self.path_for(key)
+        if await self._touch(path):
+            self.hits += 1
+            return path
+        synthesis = self._join_or_start(key, chunks)
+        # 요청 하나가 취소되어도 다른 대기자를 위한 합성은 계속 진행
+        return await asyncio.shield(synthesis.task)
+
+    async def _read_file(self, f) -> AsyncIterator[bytes]:
+        while True:
+            data = await asyncio.to_thread(f.read, CHUNK_SIZE)
+            if not data:
+                return
+            yield data
+
+    async def stream(self, key: str, chunks: ChunkSource) -> AsyncIterator[bytes]:
+        """
+        오디오를 청크 단위로 반환합니다.
+        캐시된 파일이 있으면 파일을, 없으면 합성 중인 임시 파일을 따라 읽으며 생성되는 대로 내보냅니다.
+        """
+        path = self.path_for(key)
+        if await self._touch(path):
+            self.hits += 1
+            with open(path, "rb") as f:
+                async for data in self._read_file(f):
+                    yield data
+            return
+
+        synthesis = self._join_or_start(key, chunks)
+        async with synthesis.cond:
+            if synthesis.failed:
+                raise synthesis.failure()
+            # rename 전후 어느 쪽이든 같은 파일을 가리키도록 조건 락 안에서 연다
+            f = open(path if synthesis.done else synthesis.tmp_path, "rb")
+        try:
+            offset = 0
+            while True:
+                async with synthesis.cond:
+                    await synthesis.cond.wait_for(lambda: synthesis.size > offset or synthesis.done)
+                    available, done, failed = synthesis.size, synthesis.done, synthesis.failed
+                if failed:
+                    raise synthesis.failure()
+                while offset < available:
+                    data = await asyncio.to_thread(f.read, min(CHUNK_SIZE, available - offset))
+                    if not data:
+                        break
+                    offset += len(data)
+                    yield data
+                if done:
+                    async for data in self._read_file(f):
+                        yield data
+                    return
+        finally:
+            f.close()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "remote_coalesced": self.remote_coalesced,
+            "hit_ratio": round((self.hits + self.coalesced) / total, 4) if total else 0.0,
+            "files": len(self._index),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "evicted": self.evicted,
+        }
@@ -0,0 +1,145 @@
+import os
+import time
+import asyncio
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List, Optional
+
+WarmJob = Callable[[str], Awaitable[None]]
+PrepareJob = Callable[[List[str]], Awaitable[None]]
+
+
+class CacheWarmer:
+    """
+    설정된 검색어와 최근 많이 요청된 검색어의 결과를 주기적으로 미리 계산해 캐시를 채웁니다.
+
+    - 작업은 한 번에 하나씩만 실행하고, 상류 limiter가 바쁘면(사용자 요청 처리 중) 기다렸다가 실행합니다.
+    - prepare를 함께 등록하면 주기마다 그 종류의 검색어 전체로 한 번 먼저 호출합니다. (명사 추출 등을 한 번에 처리)
+    - 캐시가 아직 충분히 신선한지는 각 작업 함수가 판단합니다. (만료 전에만 갱신)
+    - 인기 검색어 집계는 half_life초마다 절반으로 줄여 최근 요청이 우선되도록 합니다.
+    - 워커 간 공유 백엔드가 있으면 주기마다 한 워커만 실행합니다. (인기 검색어 집계는 워커별)
+    """
+
+    def __init__(
+        self,
+        keywords: List[str],
+        top_n: int = 10,
+        min_count: float = 2,
+        interval: float = 60,
+        gap: float = 1.0,
+        half_life: float = 3600,
+        is_ready: Optional[Callable[[], bool]] = None,
+        is_busy: Optional[Callable[[], bool]] = None,
+        backend=None,
+    ):
+        self.keywords = [k for k in keywords if k]
+        self.top_n = top_n
+        self.min_count = min_count
+        self.interval = interval
+        self.gap = gap
+        self.half_life = half_life
+        self.is_ready = is_ready or (lambda: True)
+        self.is_busy = is_busy or (lambda: False)
+        self.backend = backend if backend is not None and backend.shared else None
+        self.owner = f"{os.getpid()}-{id(self):x}"
+        self._jobs: Dict[str, WarmJob] = {}
+        self._prepares: Dict[str, PrepareJob] = {}
+        self._counts: Dict[str, Counter] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._decayed_at = time.monotonic()
+        self.runs = 0
+        self.warmed = 0
+        self.failed = 0
+
+    def register(self, kind: str, job: WarmJob, prepare: Optional[PrepareJob] = None) -> None:
+        self._jobs[kind] = job
+        if prepare is not None:
+            self._prepares[kind] = prepare
+        self._counts.setdefault(kind, Counter())
+
+    def observe(self, kind: str, keyword: str) -> None:
+        """사용자 요청 검색어 기록 (인기 검색어 집계)"""
+        counts = self._counts.get(kind)
+        if counts is not None and keyword:
+            counts[keyword] += 1
+
+    def keywords_for(self, kind: str) -> List[str]:
+        popular = [
+            keyword for keyword, count in self._counts.get(kind, Counter()).most_common(self.top_n)
+            if count >= self.min_count
+        ]
+        return list(dict.fromkeys(self.keywords + popular))
+
+    def _decay(self) -> None:
+        now = time.monotonic()
+        factor = 0.5 ** ((now - self._decayed_at) / self.half_life) if self.half_life > 0 else 1.0
+        self._decayed_at = now
+        for kind, counts in self._counts.items():
+            # 거의 요청되지 않는 검색어는 집계에서 제거
+            self._counts[kind] = Counter({k: v * factor for k, v in counts.items() if v * factor >= 0.5})
+
+    async def _wait_idle(self) -> None:
+        while not self.is_ready() or self.is_busy():
+            await asyncio.sleep(self.gap)
+
+    async def run_once(self) -> None:
+        for kind, job in self._jobs.items():
+            keywords = self.keywords_for(kind)
+            prepare = self._prepares.get(kind)
+            if prepare is not None and keywords:
+                await self._wait_idle()
+                try:
+                    await prepare(keywords)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # 준비가 실패해도 각 작업이 직접 처리하므로 계속 진행
+                    print(f"[WARNING] 캐시 워밍 준비 실패 ({kind}): {e}")
+            for keyword in keywords:
+                await self._wait_idle()
+                try:
+                    await job(keyword)
+                    self.warmed += 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.failed += 1
+                    print(f"[WARNING] 캐시 워밍 실패 ({kind}, {keyword}): {e}")
+                await asyncio.sleep(self.gap)
+        self.runs += 1
+        self._decay()
+
+    async def _my_turn(self) -> bool:
+        if self.backend is None:
+            return True
+        try:
+            return await self.backend.add("warmer:turn", self.owner, self.interval)
+        except Exception as e:
+            print(f"[WARNING] 캐시 워밍 차례 확인 실패: {e}")
+            return True
+
+    async def _loop(self) -> None:
+        while True:
+            if await self._my_turn():
+                await self.run_once()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None and self._jobs:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "warmed": self.warmed,
+            "failed": self.failed,
+            "keywords": {kind: self.keywords_for(kind) for kind in self._jobs},
+        }
@@ -4,6 +4,7 @@ import os
 import requests
 from dotenv import load_dotenv
 import openai
+from transcripts import TranscriptStore
 
 # 환경변수 로드
 load_dotenv()
@@ -12,6 +13,12 @@ YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY", "YOUR_YOUTUBE_API_KEY")
 SUPADATA_API_KEY = os.getenv("SUPADATA_API_KEY", "YOUR_SUPADATA_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "YOUR_OPENAI_API_KEY")
 
+transcript_store = TranscriptStore(
+    os.getenv("TRANSCRIPT_DB_PATH", "transcripts.db"),
+    ttl=float(os.getenv("TRANSCRIPT_TTL", str(30 * 24 * 3600))),
+    negative_ttl=float(os.getenv("TRANSCRIPT_NEGATIVE_TTL", str(6 * 3600))),
+)
+
 app = FastAPI(
     title="YouTube 영상 요약 API",
     description="키워드로 유튜브 상위 영상 검색 후 자막 요약",
@@ -54,7 +61,10 @@ def search_youtube_videos(keyword: str) -> list:
         )
 
 def get_auto_captions(video_id: str) -> str:
-    """자막 추출"""
+    """자막 추출 (저장소에 있으면 SupaData 호출 생략)"""
+    stored = transcript_store.lookup(video_id)
+    if stored is not None:
+        return stored[1]
     url = "https://api.supadata.ai/v1/youtube/transcript"
     params = {"videoId": video_id}
     headers = {"x-api-key": SUPADATA_API_KEY}
@@ -64,10 +74,13 @@ def get_auto_captions(video_id: str) -> str:
         data = response.json()
         content = data.get("content", "")
         if isinstance(content, list):
-            return " ".join([item.get('text', '') for item in content])
+            transcript = " ".join([item.get('text', '') for item in content])
         elif isinstance(content, str):
-            return content
-        return ""
+            transcript = content
+        else:
+            transcript = ""
+        transcript_store.save(video_id, transcript)
+        return transcript
     except Exception as e:
         raise HTTPException(
             status_code=500,
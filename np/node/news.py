@@ -1,10 +1,26 @@
-import urllib.request
-import urllib.parse
-import json
+"""
+네이버 뉴스 검색 + Kagi 요약 스크립트
+
+    python news.py                                   # 기본 검색어 하나를 검색해 요약 출력
+    python news.py --query 미국증시 --display 5
+    python news.py --batch queries.jsonl --output digest.jsonl --workers 8
+
+배치 모드는 JSONL 파일의 각 줄({"query": "..."} 또는 {"keyword": "..."}, 선택적으로 "id", "display")을
+동시에 처리하고, 요약이 끝나는 대로 결과를 출력 JSONL에 한 줄씩 기록합니다.
+끝난 기사는 체크포인트 파일에 기록되므로 중단 후 같은 명령을 다시 실행하면 남은 것만 처리합니다.
+"""
+import argparse
 import html
-import requests
+import json
 import os
+import random
+import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
 
 # 네이버 API 키
 client_id = "bCovPC7wNjEApG0cQfSl"
@@ -12,47 +28,282 @@ client_secret = "4rVLgMBI4Z"
 
 # Kagi API 키 (환경 변수에서 불러오기)
 KAGI_API_KEY = os.environ.get("KAGI_API_KEY")
-if not KAGI_API_KEY:
-    raise ValueError("KAGI_API_KEY 환경 변수 설정 필요")
 
-# 검색어와 네이버 뉴스 호출
-query = "미국증시"
-enc_query = urllib.parse.quote(query)
-display = 5  # 너무 많으면 Kagi에 부담 → 테스트는 적게
+NAVER_URL = "https://openapi.naver.com/v1/search/news.json"
+KAGI_URL = "https://kagi.com/api/v0/summarize"
+
+# 호출 간격(초)과 429 재시도 설정
+NAVER_MIN_INTERVAL = float(os.environ.get("NAVER_MIN_INTERVAL", "0.1"))
+KAGI_MIN_INTERVAL = float(os.environ.get("KAGI_MIN_INTERVAL", "1.5"))
+MAX_RETRIES = int(os.environ.get("KAGI_MAX_RETRIES", "3"))
+
+DEFAULT_QUERY = "미국증시"
+DEFAULT_DISPLAY = 5  # 너무 많으면 Kagi에 부담 → 테스트는 적게
+MAX_DISPLAY = 100  # 네이버 뉴스 검색 display 최대값
+
+
+class RateLimiter:
+    """
+    여러 스레드가 공유하는 호출 간격 제한. 429를 받으면 간격을 늘리고(성공하면 다시 조금씩 줄임),
+    Retry-After가 있으면 그만큼, 없으면 지터를 섞은 지수 백오프로 기다립니다.
+    """
+
+    def __init__(self, name, min_interval):
+        self.name = name
+        self.min_interval = min_interval
+        self.interval = min_interval
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait_turn(self):
+        # 다음 호출 시각을 잠금 안에서 예약하고, 대기는 잠금 밖에서 함
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def on_success(self):
+        with self.lock:
+            self.interval = max(self.min_interval, self.interval * 0.9)
+
+    def on_throttle(self, attempt, retry_after):
+        with self.lock:
+            self.interval = min(max(self.interval, 0.1) * 2, 30)
+        if retry_after and retry_after.isdigit():
+            delay = int(retry_after) + random.uniform(0, 0.5)
+        else:
+            delay = random.uniform(0, min(30, max(self.min_interval, 0.5) * 2 ** (attempt + 1)))
+        print(f"⏳ {self.name} 속도 제한(429). {delay:.1f}초 후 재시도...", file=sys.stderr)
+        time.sleep(delay)
+
+
+naver_limiter = RateLimiter("네이버", NAVER_MIN_INTERVAL)
+kagi_limiter = RateLimiter("Kagi", KAGI_MIN_INTERVAL)
+session = requests.Session()
+
+
+def request_with_limit(limiter, url, **kwargs):
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.wait_turn()
+        response = session.get(url, timeout=60, **kwargs)
+        if response.status_code == 429 and attempt < MAX_RETRIES:
+            limiter.on_throttle(attempt, response.headers.get("Retry-After"))
+            continue
+        response.raise_for_status()
+        limiter.on_success()
+        return response
+
+
+def search_news(query, display):
+    response = request_with_limit(
+        naver_limiter,
+        NAVER_URL,
+        headers={"X-Naver-Client-Id": client_id, "X-Naver-Client-Secret": client_secret},
+        params={"query": query, "display": display},
+    )
+    return [
+        {
+            "title": html.unescape(item["title"]),
+            "link": item.get("originallink") or item.get("link"),
+        }
+        for item in response.json()["items"]
+    ]
+
 
-naver_url = f"https://openapi.naver.com/v1/search/news.json?query={enc_query}&display={display}"
-request = urllib.request.Request(naver_url)
-request.add_header("X-Naver-Client-Id", client_id)
-request.add_header("X-Naver-Client-Secret", client_secret)
+def kagi_summarize(url):
+    response = request_with_limit(
+        kagi_limiter,
+        KAGI_URL,
+        headers={"Authorization": "Bot " + KAGI_API_KEY},
+        params={"url": url, "target_language": "KO"},
+    )
+    return response.json()["data"]["output"]
 
-try:
-    response = urllib.request.urlopen(request)
-    response_body = response.read().decode('utf-8')
-    result = json.loads(response_body)
 
-    for idx, item in enumerate(result['items']):
-        title = html.unescape(item['title'])
-        originallink = item.get('originallink', item.get('link'))
+def run_single(query, display):
+    try:
+        items = search_news(query, display)
+    except requests.HTTPError as e:
+        print(f"❌ HTTPError: {e.response.status_code} - {e.response.reason}")
+        print(e.response.text)
+        return
 
-        print(f"\n[{idx+1}] 📌 제목: {title}")
-        print(f"🔗 기사 링크: {originallink}")
+    for idx, item in enumerate(items):
+        print(f"\n[{idx+1}] 📌 제목: {item['title']}")
+        print(f"🔗 기사 링크: {item['link']}")
 
         # Kagi Summarizer API 호출
         try:
-            kagi_response = requests.get(
-                "https://kagi.com/api/v0/summarize",
-                headers={"Authorization": "Bot " + KAGI_API_KEY},
-                params={"url": originallink, "target_language": "KO"}
-            )
-            kagi_response.raise_for_status()
-            summary = kagi_response.json()['data']['output']
+            summary = kagi_summarize(item["link"])
             print(f"📝 요약 내용:\n{summary}")
         except Exception as ke:
             print(f"❗ Kagi 요약 실패: {ke}")
 
         print("-" * 100)
-        time.sleep(1.5)  # 너무 빠른 요청 방지 (Kagi API 정책 고려)
 
-except urllib.error.HTTPError as e:
-    print(f"❌ HTTPError: {e.code} - {e.reason}")
-    print(e.read().decode())
\ No newline at end of file
+
+def parse_display(value, default_display, line_no):
+    """display 값을 1~MAX_DISPLAY 정수로 바꿉니다. 숫자가 아니면 경고 후 기본값을 사용합니다."""
+    try:
+        display = int(value)
+    except (TypeError, ValueError):
+        print(f"⚠️ {line_no}번째 줄: display 값이 올바르지 않아 기본값을 사용합니다 ({value!r} → {default_display})", file=sys.stderr)
+        display = default_display
+    return min(max(display, 1), MAX_DISPLAY)
+
+
+def read_jobs(path, default_display):
+    """입력 JSONL을 읽어 작업 목록을 만듭니다. JSON이 아닌 줄은 그 자체를 검색어로 사용합니다."""
+    jobs = []
+    seen = set()
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = line
+            if not isinstance(record, dict):
+                record = {"query": str(record)}
+            query = record.get("query") or record.get("keyword") or record.get("q")
+            if not query:
+                continue
+            job_id = str(record.get("id") or record.get("request_id") or query)
+            if job_id in seen:
+                continue
+            seen.add(job_id)
+            display = parse_display(record.get("display", default_display), default_display, line_no)
+            jobs.append({"id": job_id, "query": query, "display": display})
+    return jobs
+
+
+def load_checkpoint(path):
+    """(끝난 검색어 id 집합, 끝난 (id, 기사 링크) 집합)"""
+    done_jobs, done_articles = set(), set()
+    if not os.path.exists(path):
+        return done_jobs, done_articles
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # 중단 시점에 덜 쓰인 마지막 줄
+            if record.get("done"):
+                done_jobs.add(record["id"])
+            elif record.get("link"):
+                done_articles.add((record["id"], record["link"]))
+    return done_jobs, done_articles
+
+
+def run_batch(input_path, output_path, checkpoint_path, workers, display):
+    jobs = read_jobs(input_path, display)
+    done_jobs, done_articles = load_checkpoint(checkpoint_path)
+    todo_jobs = [job for job in jobs if job["id"] not in done_jobs]
+    print(f"🗂 검색어 {len(jobs)}개 중 {len(jobs) - len(todo_jobs)}개는 이미 완료, {len(todo_jobs)}개 처리", file=sys.stderr)
+
+    # 워커 수만큼 커넥션을 재사용
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=workers)
+    session.mount("https://", adapter)
+
+    started = time.monotonic()
+    written = failed = 0
+    remaining = {}  # 검색어 id → 아직 끝나지 않은 기사 수
+    has_failure = set()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool, \
+            open(output_path, "a", encoding="utf-8") as out, \
+            open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+
+        def mark(record):
+            checkpoint.write(json.dumps(record, ensure_ascii=False) + "\n")
+            checkpoint.flush()
+
+        def finish_job(job):
+            # 실패한 기사가 있으면 완료로 기록하지 않아 다음 실행에서 다시 시도
+            if job["id"] in has_failure:
+                print(f"⚠️ [{job['id']}] {job['query']} 일부 실패 (다음 실행에서 재시도)", file=sys.stderr)
+                return
+            mark({"id": job["id"], "done": True})
+            print(f"✅ [{job['id']}] {job['query']} 완료", file=sys.stderr)
+
+        pending = {pool.submit(search_news, job["query"], job["display"]): ("search", job, None, None) for job in todo_jobs}
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                kind, job, rank, item = pending.pop(future)
+                if kind == "search":
+                    try:
+                        items = future.result()
+                    except Exception as e:
+                        print(f"❗ [{job['id']}] 네이버 검색 실패: {e}", file=sys.stderr)
+                        failed += 1
+                        continue
+                    todo = [
+                        (rank, item) for rank, item in enumerate(items, 1)
+                        if (job["id"], item["link"]) not in done_articles
+                    ]
+                    remaining[job["id"]] = len(todo)
+                    if not todo:
+                        finish_job(job)
+                    for rank, item in todo:
+                        pending[pool.submit(kagi_summarize, item["link"])] = ("summary", job, rank, item)
+                    continue
+
+                try:
+                    summary = future.result()
+                    record = {
+                        "id": job["id"],
+                        "query": job["query"],
+                        "rank": rank,
+                        "title": item["title"],
+                        "link": item["link"],
+                        "summary": summary,
+                    }
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+                    # 결과를 쓴 뒤에 체크포인트를 남겨, 중단되더라도 결과 누락 없이 재개
+                    mark({"id": job["id"], "link": item["link"]})
+                    written += 1
+                except Exception as e:
+                    print(f"❗ [{job['id']}] Kagi 요약 실패 ({item['link']}): {e}", file=sys.stderr)
+                    has_failure.add(job["id"])
+                    failed += 1
+                remaining[job["id"]] -= 1
+                if remaining[job["id"]] == 0:
+                    finish_job(job)
+
+    elapsed = time.monotonic() - started
+    print(f"🏁 요약 {written}건 기록, 실패 {failed}건, {elapsed:.1f}초", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="네이버 뉴스 검색 + Kagi 요약")
+    parser.add_argument("--query", default=DEFAULT_QUERY, help="단일 실행 시 검색어")
+    parser.add_argument("--display", type=int, default=DEFAULT_DISPLAY, help="검색어당 기사 수")
+    parser.add_argument("--batch", help="검색어 목록 JSONL 파일 (배치 모드)")
+    parser.add_argument("--output", default="digest.jsonl", help="배치 결과 JSONL 파일")
+    parser.add_argument("--checkpoint", help="체크포인트 파일 (기본: <output>.ckpt)")
+    parser.add_argument("--workers", type=int, default=8, help="동시 요청 수")
+    args = parser.parse_args()
+
+    if not KAGI_API_KEY:
+        raise ValueError("KAGI_API_KEY 환경 변수 설정 필요")
+
+    if args.batch:
+        run_batch(
+            args.batch,
+            args.output,
+            args.checkpoint or args.output + ".ckpt",
+            max(1, args.workers),
+            args.display,
+        )
+    else:
+        run_single(args.query, args.display)
+
+
+if __name__ == "__main__":
+    main()
@@ -86,27 +86,66 @@ document.addEventListener('DOMContentLoaded', () => {
         window.scrollTo({ top: 0, behavior: 'smooth' }); // 스크롤 맨 위로
     }
 
-    // 8. 뉴스 데이터 Fetch 및 표시 함수
+    // 8-1. NDJSON 스트리밍 응답을 한 줄(이벤트)씩 읽어 콜백으로 전달하는 함수
+    async function readNdjsonStream(response, onEvent) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop(); // 마지막 줄은 아직 덜 받았을 수 있음
+            lines.filter(line => line.trim()).forEach(line => onEvent(JSON.parse(line)));
+        }
+        if (buffer.trim()) {
+            onEvent(JSON.parse(buffer));
+        }
+    }
+
+    // 8-2. 스트리밍 결과 자리 표시용 카드 생성 (요약이 도착하면 순서에 맞게 교체)
+    function createPlaceholders(listElement, count) {
+        listElement.innerHTML = '';
+        const placeholders = [];
+        for (let i = 0; i < count; i++) {
+            const li = document.createElement('li');
+            li.className = 'loading';
+            li.textContent = '요약 중...';
+            listElement.appendChild(li);
+            placeholders.push(li);
+        }
+        return placeholders;
+    }
+
+    // 8. 뉴스 데이터 Fetch 및 표시 함수 (요약이 끝나는 기사부터 바로 표시)
     async function fetchNews(keyword, sort) {
         showLoading(newsList); // 뉴스 로딩 표시
         try {
-            const response = await fetch(`${BACKEND_BASE_URL}/news/summaries?q=${encodeURIComponent(keyword)}&sort=${sort}`);
-            const data = await response.json();
+            const response = await fetch(`${BACKEND_BASE_URL}/news/summaries/stream?q=${encodeURIComponent(keyword)}&sort=${sort}`);
 
             if (!response.ok) {
+                const data = await response.json();
                 const errorMessage = data.detail || data.error || '뉴스를 불러오지 못했습니다.';
                 newsList.innerHTML = `<li class="error-message">오류: ${errorMessage}</li>`;
                 console.error('뉴스 API 오류:', data);
                 return;
             }
 
-            if (!Array.isArray(data) || data.length === 0) {
-                newsList.innerHTML = `<li>검색 결과가 없습니다.</li>`;
-                return;
-            }
-
-            newsList.innerHTML = '';
-            data.forEach((item) => {
+            let placeholders = [];
+            await readNdjsonStream(response, (event) => {
+                if (event.type === 'meta') {
+                    if (event.count === 0) {
+                        newsList.innerHTML = `<li>검색 결과가 없습니다.</li>`;
+                        return;
+                    }
+                    placeholders = createPlaceholders(newsList, event.count);
+                    return;
+                }
+                if (event.type !== 'item') {
+                    return;
+                }
+                const item = event.data;
                 const li = document.createElement('li');
                 li.className = 'news-card';
                 li.dataset.original = item.description || "";
@@ -129,7 +168,8 @@ document.addEventListener('DOMContentLoaded', () => {
                 li.appendChild(checkbox);
                 li.appendChild(titleLink);
                 li.appendChild(summaryP);
-                newsList.appendChild(li);
+                newsList.replaceChild(li, placeholders[event.index]);
+                placeholders[event.index] = li;
             });
             previousNewsHtml = newsList.innerHTML; // 뉴스 결과 저장
 
@@ -139,27 +179,34 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
-    // 9. 유튜브 데이터 Fetch 및 표시 함수
+    // 9. 유튜브 데이터 Fetch 및 표시 함수 (요약이 끝나는 영상부터 바로 표시)
     async function fetchYoutube(keyword) {
         showLoading(ytList); // 유튜브 로딩 표시
         try {
-            const response = await fetch(`${BACKEND_BASE_URL}/youtube-summaries?keyword=${encodeURIComponent(keyword)}`);
-            const data = await response.json();
+            const response = await fetch(`${BACKEND_BASE_URL}/youtube-summaries/stream?keyword=${encodeURIComponent(keyword)}`);
 
             if (!response.ok) {
+                const data = await response.json();
                 const errorMessage = data.detail || data.error || '유튜브 요약을 불러오지 못했습니다.';
                 ytList.innerHTML = `<li class="error-message">오류: ${errorMessage}</li>`;
                 console.error('유튜브 API 오류:', data);
                 return;
             }
 
-            if (!Array.isArray(data) || data.length === 0) {
-                ytList.innerHTML = `<li>검색 결과가 없습니다.</li>`;
-                return;
-            }
-
-            ytList.innerHTML = '';
-            data.forEach((item) => {
+            let placeholders = [];
+            await readNdjsonStream(response, (event) => {
+                if (event.type === 'meta') {
+                    if (event.count === 0) {
+                        ytList.innerHTML = `<li>검색 결과가 없습니다.</li>`;
+                        return;
+                    }
+                    placeholders = createPlaceholders(ytList, event.count);
+                    return;
+                }
+                if (event.type !== 'item') {
+                    return;
+                }
+                const item = event.data;
                 const li = document.createElement('li');
                 li.className = 'yt-card';
                 li.dataset.original = item.transcript || "";
@@ -183,7 +230,8 @@ document.addEventListener('DOMContentLoaded', () => {
                 li.appendChild(checkbox);
                 li.appendChild(titleLink);
                 li.appendChild(summaryP);
-                ytList.appendChild(li);
+                ytList.replaceChild(li, placeholders[event.index]);
+                placeholders[event.index] = li;
             });
             previousYtHtml = ytList.innerHTML; // 유튜브 결과 저장
 
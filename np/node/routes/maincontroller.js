@@ -6,14 +6,35 @@ const https = require('https');
 
 const FASTAPI_URL = 'http://3.25.208.15:8080';
 
+// 게이트웨이 대기 시간과 백엔드에 넘길 처리 시간 한도
+// 백엔드는 한도가 지나면 남은 작업을 취소하고 끝난 결과만 반환하므로, 게이트웨이 timeout보다 조금 짧게 전달
+const REQUEST_TIMEOUT_MS = 60000;
+const BACKEND_DEADLINE_MS = REQUEST_TIMEOUT_MS - 5000;
+
 // Axios 인스턴스 생성 (Keep-Alive 설정)
 const apiClient = axios.create({
   baseURL: FASTAPI_URL,
-  timeout: 60000, // 30초로 조정 (150000 → 30000)
+  timeout: REQUEST_TIMEOUT_MS,
   httpAgent: new http.Agent({ keepAlive: true }),
   httpsAgent: new https.Agent({ keepAlive: true })
 });
 
+// 백엔드 요청 옵션: 처리 시간 한도 헤더 + 클라이언트 연결이 끊기면 백엔드 요청도 취소
+function backendOptions(req, res) {
+  const requested = parseInt(req.get('X-Request-Deadline-Ms'), 10);
+  const budget = Number.isFinite(requested) && requested > 0
+    ? Math.min(requested, BACKEND_DEADLINE_MS)
+    : BACKEND_DEADLINE_MS;
+  const controller = new AbortController();
+  res.on('close', () => {
+    if (!res.writableEnded) controller.abort();
+  });
+  return {
+    headers: { 'X-Request-Deadline-Ms': String(budget) },
+    signal: controller.signal
+  };
+}
+
 // 메인 페이지
 router.get('/', (req, res) => {
   res.render('index', { title: '통합 미디어 요약 서비스' });
@@ -33,7 +54,8 @@ router.get('/summaries', async (req, res) => {
     // const encodedQ = encodeURIComponent(q); // 제거
     
     const response = await apiClient.get('/news/summaries', {
-      params: { q, sort } // encodedQ → q로 변경
+      params: { q, sort }, // encodedQ → q로 변경
+      ...backendOptions(req, res)
     });
     
     res.json(response.data);
@@ -59,7 +81,8 @@ router.get('/youtube-summaries', async (req, res) => {
     
     // 엔드포인트 경로 오타 수정
     const response = await apiClient.get('/youtube-summaries', { // '/youtube/summarize' → '/youtube-summaries'
-      params: { keyword }
+      params: { keyword },
+      ...backendOptions(req, res)
     });
     
     res.json(response.data);
@@ -82,7 +105,7 @@ router.post('/summarize-originals', async (req, res) => {
       return res.status(400).json({ error: '최소 하나 이상의 본문이 필요합니다.' });
     }
     
-    const response = await apiClient.post('/summarize-originals', { originals });
+    const response = await apiClient.post('/summarize-originals', { originals }, backendOptions(req, res));
     res.json(response.data);
   } catch (error) {
     console.error('재요약 API 오류:', error.stack || error.message);